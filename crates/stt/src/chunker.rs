@@ -298,7 +298,7 @@ pub struct AudioChunks {
 }
 
 /// Initialize `FFmpeg` once per process.
-fn init_ffmpeg() -> Result<(), ChunkError> {
+pub(crate) fn init_ffmpeg() -> Result<(), ChunkError> {
     static INIT: OnceLock<Result<(), String>> = OnceLock::new();
 
     INIT.get_or_init(|| ffmpeg::init().map_err(|e| e.to_string()))
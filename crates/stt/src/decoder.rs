@@ -0,0 +1,189 @@
+//! Decode audio files to 16kHz mono f32 PCM.
+//!
+//! Uses `FFmpeg` (via `ffmpeg-next`) to decode and resample in one pass, yielding
+//! fixed-size sample buffers ready for VAD and Whisper.
+
+use std::path::{Path, PathBuf};
+
+extern crate ffmpeg_next as ffmpeg;
+
+use ffmpeg::format::context::Input;
+use ffmpeg::format::sample::{Sample, Type};
+use ffmpeg::software::resampling;
+use ffmpeg::util::channel_layout::ChannelLayout;
+use ffmpeg::util::error::EAGAIN;
+use ffmpeg::{codec, decoder, format, frame, media};
+
+use crate::chunker::{init_ffmpeg, ChunkError};
+
+/// Output sample rate expected by VAD and Whisper.
+pub const PCM_SAMPLE_RATE: u32 = 16_000;
+
+/// Iterator over fixed-size chunks of 16kHz mono f32 samples decoded from a file.
+///
+/// Every chunk holds `chunk_samples` samples except the last, which holds the remainder.
+pub struct PcmChunks {
+    path: PathBuf,
+    input: Input,
+    audio_stream_index: usize,
+    decoder: decoder::Audio,
+    resampler: resampling::Context,
+    channel_layout: ChannelLayout,
+    chunk_samples: usize,
+    pending: Vec<f32>,
+    eof: bool,
+}
+
+impl PcmChunks {
+    fn new(path: PathBuf, chunk_samples: usize) -> Result<Self, ChunkError> {
+        if !path.exists() {
+            return Err(ChunkError::FileNotFound(path));
+        }
+
+        init_ffmpeg()?;
+
+        let input = format::input(&path)?;
+        let audio_stream = input
+            .streams()
+            .best(media::Type::Audio)
+            .ok_or_else(|| ChunkError::FfmpegError("No audio stream found".to_string()))?;
+        let audio_stream_index = audio_stream.index();
+
+        let decoder = codec::Context::from_parameters(audio_stream.parameters())?
+            .decoder()
+            .audio()?;
+
+        // Some demuxers only report a channel count; fall back to its default layout
+        let channel_layout = if decoder.channel_layout().is_empty() {
+            ChannelLayout::default(i32::from(decoder.channels()))
+        } else {
+            decoder.channel_layout()
+        };
+
+        let resampler = resampling::Context::get(
+            decoder.format(),
+            channel_layout,
+            decoder.rate(),
+            Sample::F32(Type::Packed),
+            ChannelLayout::MONO,
+            PCM_SAMPLE_RATE,
+        )?;
+
+        let chunk_samples = chunk_samples.max(1);
+        Ok(Self {
+            path,
+            input,
+            audio_stream_index,
+            decoder,
+            resampler,
+            channel_layout,
+            chunk_samples,
+            pending: Vec::with_capacity(chunk_samples),
+            eof: false,
+        })
+    }
+
+    #[must_use]
+    pub fn path(&self) -> &PathBuf {
+        &self.path
+    }
+
+    #[must_use]
+    pub fn chunk_samples(&self) -> usize {
+        self.chunk_samples
+    }
+
+    /// Decode one more packet into `pending`. Returns false once the input is drained.
+    fn refill(&mut self) -> Result<bool, ChunkError> {
+        if self.eof {
+            return Ok(false);
+        }
+
+        loop {
+            let Some((stream, packet)) = self.input.packets().next() else {
+                // End of file - drain the decoder and the resampler's delay line
+                self.eof = true;
+                self.decoder.send_eof()?;
+                self.receive_frames()?;
+                let mut resampled = frame::Audio::empty();
+                self.resampler.flush(&mut resampled)?;
+                self.push_samples(&resampled);
+                return Ok(true);
+            };
+
+            // Skip non-audio streams
+            if stream.index() != self.audio_stream_index {
+                continue;
+            }
+
+            self.decoder.send_packet(&packet)?;
+            self.receive_frames()?;
+            return Ok(true);
+        }
+    }
+
+    /// Resample every frame the decoder has ready and append it to `pending`.
+    fn receive_frames(&mut self) -> Result<(), ChunkError> {
+        let mut decoded = frame::Audio::empty();
+        let mut resampled = frame::Audio::empty();
+        loop {
+            match self.decoder.receive_frame(&mut decoded) {
+                Ok(()) => {}
+                Err(ffmpeg::Error::Eof | ffmpeg::Error::Other { errno: EAGAIN }) => return Ok(()),
+                Err(e) => return Err(e.into()),
+            }
+            if decoded.channel_layout().is_empty() {
+                decoded.set_channel_layout(self.channel_layout);
+            }
+            self.resampler.run(&decoded, &mut resampled)?;
+            self.push_samples(&resampled);
+        }
+    }
+
+    fn push_samples(&mut self, resampled: &frame::Audio) {
+        if resampled.samples() > 0 {
+            self.pending.extend_from_slice(resampled.plane::<f32>(0));
+        }
+    }
+}
+
+impl Iterator for PcmChunks {
+    type Item = Result<Vec<f32>, ChunkError>;
+
+    fn next(&mut self) -> Option<Self::Item> {
+        while self.pending.len() < self.chunk_samples {
+            match self.refill() {
+                Ok(true) => {}
+                Ok(false) => break,
+                Err(e) => {
+                    self.eof = true;
+                    self.pending.clear();
+                    return Some(Err(e));
+                }
+            }
+        }
+
+        if self.pending.is_empty() {
+            return None;
+        }
+
+        let n = self.chunk_samples.min(self.pending.len());
+        let rest = self.pending.split_off(n);
+        Some(Ok(std::mem::replace(&mut self.pending, rest)))
+    }
+}
+
+/// Decode an audio file to 16kHz mono f32, in chunks of `chunk_samples` samples.
+///
+/// # Example
+/// ```ignore
+/// for samples in stt::decode_audio("audio.mp3", 480_000)? {
+///     whisper.transcribe(&samples?)?;
+/// }
+/// ```
+pub fn decode_audio(
+    path: impl AsRef<Path>,
+    chunk_samples: usize,
+) -> Result<PcmChunks, ChunkError> {
+    PcmChunks::new(path.as_ref().to_path_buf(), chunk_samples)
+}
@@ -1,7 +1,12 @@
 //! Speech-to-text module with audio processing utilities.
 
 pub mod chunker;
+pub mod decoder;
 pub mod whisper;
 
 pub use chunker::{chunk_audio, AudioChunks, ChunkError};
-pub use whisper::{Whisper, WhisperError};
+pub use decoder::{decode_audio, PcmChunks, PCM_SAMPLE_RATE};
+pub use whisper::{
+    plan_pieces, BatchItem, CancelToken, Segment, TranscribeOptions, Transcription,
+    Whisper, WhisperError, DEFAULT_MAX_CONCURRENCY, LONG_MAX_SAMPLES, LONG_MIN_SAMPLES,
+};
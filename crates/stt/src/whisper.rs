@@ -1,13 +1,41 @@
 //! Whisper speech-to-text bindings.
 
+use std::ops::{Deref, DerefMut, Range};
 use std::path::Path;
-use whisper_rs::{FullParams, SamplingStrategy, WhisperContext, WhisperContextParameters};
+use std::sync::atomic::{AtomicBool, AtomicUsize, Ordering};
+use std::sync::{Arc, Condvar, Mutex, MutexGuard, PoisonError};
+use std::thread;
+use whisper_rs::{
+    FullParams, SamplingStrategy, WhisperContext, WhisperContextParameters, WhisperState,
+};
+
+/// Default number of decoder states that may run at once per model.
+pub const DEFAULT_MAX_CONCURRENCY: usize = 2;
+
+/// Encoder positions for a full 30s window. Each position covers 20ms (320 samples).
+const MAX_AUDIO_CTX: usize = 1500;
+const SAMPLES_PER_AUDIO_CTX: usize = 320;
+/// Extra encoder positions kept past the real audio when shrinking the context.
+const AUDIO_CTX_MARGIN: usize = 64;
+/// whisper.cpp skips input shorter than 1s, so shorter input is zero-padded to this.
+const MIN_SAMPLES: usize = 16_800;
+
+/// Longest piece `transcribe_long` decodes at once: one full 30s window.
+pub const LONG_MAX_SAMPLES: usize = 480_000;
+/// Pieces are cut no earlier than this, so splitting searches the last 10s of a window.
+pub const LONG_MIN_SAMPLES: usize = 320_000;
+/// Samples per timestamp unit (10ms at 16kHz).
+const SAMPLES_PER_CENTISECOND: usize = 160;
+/// Energy is compared over 20ms frames, summed across 100ms when picking a cut.
+const SPLIT_FRAME: usize = 320;
+const SPLIT_SPAN: usize = 5;
 
 /// Error type for Whisper operations.
 #[derive(Debug)]
 pub enum WhisperError {
     ModelLoad(String),
     Transcription(String),
+    Aborted,
     Closed,
 }
 
@@ -16,6 +44,7 @@ impl std::fmt::Display for WhisperError {
         match self {
             WhisperError::ModelLoad(e) => write!(f, "Failed to load model: {e}"),
             WhisperError::Transcription(e) => write!(f, "Transcription failed: {e}"),
+            WhisperError::Aborted => write!(f, "Transcription aborted"),
             WhisperError::Closed => write!(f, "Context already closed"),
         }
     }
@@ -23,55 +52,620 @@ impl std::fmt::Display for WhisperError {
 
 impl std::error::Error for WhisperError {}
 
+/// Shared flag used to abort an in-progress transcription from another thread.
+#[derive(Clone, Debug, Default)]
+pub struct CancelToken(Arc<AtomicBool>);
+
+impl CancelToken {
+    #[must_use]
+    pub fn new() -> Self {
+        Self::default()
+    }
+
+    /// Request cancellation. whisper.cpp polls the flag between graph computations.
+    pub fn cancel(&self) {
+        self.0.store(true, Ordering::Relaxed);
+    }
+
+    #[must_use]
+    pub fn is_cancelled(&self) -> bool {
+        self.0.load(Ordering::Relaxed)
+    }
+}
+
+/// Options for a single decode.
+#[derive(Clone, Debug, Default)]
+pub struct TranscribeOptions {
+    /// Text fed to the decoder as preceding context, e.g. already committed output.
+    pub initial_prompt: Option<String>,
+    /// Emit one segment per word, with token-level timestamps.
+    pub word_timestamps: bool,
+    /// Compute per-token timestamps without splitting segments into words.
+    pub token_timestamps: bool,
+    /// Number of real (non-padding) samples. When set, the encoder only attends to that
+    /// much audio plus a margin instead of a full 30s, which is much faster for short input.
+    pub audio_len: Option<usize>,
+    /// Threads whisper.cpp uses for this decode. Defaults to `min(4, cores)`.
+    pub n_threads: Option<usize>,
+}
+
+/// One window of a `Whisper::transcribe_batch` call.
+#[derive(Clone, Debug, Default)]
+pub struct BatchItem<'a> {
+    /// 16kHz mono f32, up to 30s.
+    pub samples: &'a [f32],
+    /// Number of real (non-padding) samples, as in `TranscribeOptions`. Defaults to the
+    /// length of `samples`.
+    pub audio_len: Option<usize>,
+    /// Aborts this window only. The rest of the batch carries on.
+    pub cancel: CancelToken,
+}
+
+/// Encoder context covering `audio_len` samples plus a safety margin.
+fn fit_audio_ctx(audio_len: usize) -> usize {
+    (audio_len.div_ceil(SAMPLES_PER_AUDIO_CTX) + AUDIO_CTX_MARGIN).min(MAX_AUDIO_CTX)
+}
+
+/// Split `samples` into consecutive pieces of at most `LONG_MAX_SAMPLES`.
+///
+/// Each cut falls between `LONG_MIN_SAMPLES` and `LONG_MAX_SAMPLES` after the previous
+/// one. The last candidate from `split_points` in that range wins, e.g. pauses found by a
+/// VAD. Otherwise the cut is placed in the quietest 100ms of the range.
+#[must_use]
+pub fn plan_pieces(samples: &[f32], split_points: &[usize]) -> Vec<Range<usize>> {
+    let mut pieces = Vec::with_capacity(samples.len() / LONG_MIN_SAMPLES + 1);
+    let mut start = 0;
+    while samples.len() - start > LONG_MAX_SAMPLES {
+        let range = start + LONG_MIN_SAMPLES..start + LONG_MAX_SAMPLES;
+        let cut = split_points
+            .iter()
+            .copied()
+            .filter(|p| range.contains(p))
+            .max()
+            .unwrap_or_else(|| quietest_point(samples, range));
+        pieces.push(start..cut);
+        start = cut;
+    }
+    if start < samples.len() {
+        pieces.push(start..samples.len());
+    }
+    pieces
+}
+
+/// Centre of the lowest-energy `SPLIT_SPAN` frames within `range`.
+fn quietest_point(samples: &[f32], range: Range<usize>) -> usize {
+    let energy: Vec<f32> = samples[range.clone()]
+        .chunks(SPLIT_FRAME)
+        .map(|frame| frame.iter().map(|s| s * s).sum())
+        .collect();
+    let best = energy
+        .windows(SPLIT_SPAN.min(energy.len()))
+        .map(|w| w.iter().sum::<f32>())
+        .enumerate()
+        .min_by(|a, b| a.1.total_cmp(&b.1))
+        .map_or(0, |(i, _)| i);
+    range.start + (best + SPLIT_SPAN / 2) * SPLIT_FRAME
+}
+
+/// One decoded segment. Times are in centiseconds from the first sample.
+#[derive(Clone, Debug, PartialEq, Eq)]
+pub struct Segment {
+    pub t0: i64,
+    pub t1: i64,
+    pub text: String,
+}
+
+/// Everything one decode produced, as flat arrays rather than one object per token.
+///
+/// Segment `i` spans tokens `token_offsets[i]..token_offsets[i + 1]`. Only text tokens
+/// are kept: special and timestamp tokens are left out. All times are in centiseconds
+/// from the first sample.
+#[derive(Clone, Debug, Default, PartialEq)]
+pub struct Transcription {
+    pub segment_t0: Vec<i64>,
+    pub segment_t1: Vec<i64>,
+    pub segment_text: Vec<String>,
+    /// Probability that the segment holds no speech, as whisper.cpp estimates it from the
+    /// no-speech token.
+    pub no_speech_prob: Vec<f32>,
+    /// One more entry than there are segments, starting at 0.
+    pub token_offsets: Vec<usize>,
+    pub token_ids: Vec<i32>,
+    pub token_probs: Vec<f32>,
+    /// Token times, only meaningful when the decode computed token timestamps.
+    pub token_t0: Vec<i64>,
+    pub token_t1: Vec<i64>,
+}
+
+impl Transcription {
+    /// Concatenated, trimmed text of all segments, as `Whisper::transcribe` returns.
+    #[must_use]
+    pub fn text(&self) -> String {
+        self.segment_text.concat().trim().to_string()
+    }
+}
+
+// --- Decoder state pool ---
+
+struct PoolInner {
+    idle: Vec<WhisperState>,
+    created: usize,
+}
+
+/// Bounded pool of decoder states sharing one model context.
+///
+/// States (KV caches and compute buffers) are created lazily, up to `capacity`, and
+/// reused across calls. Callers block while all states are busy.
+struct StatePool {
+    inner: Mutex<PoolInner>,
+    available: Condvar,
+    capacity: usize,
+}
+
+impl StatePool {
+    fn new(capacity: usize) -> Self {
+        Self {
+            inner: Mutex::new(PoolInner {
+                idle: Vec::with_capacity(capacity),
+                created: 0,
+            }),
+            available: Condvar::new(),
+            capacity: capacity.max(1),
+        }
+    }
+
+    fn lock(&self) -> MutexGuard<'_, PoolInner> {
+        self.inner.lock().unwrap_or_else(PoisonError::into_inner)
+    }
+
+    /// Take an idle state, create one if under capacity, or wait for one to be released.
+    fn acquire(&self, ctx: &WhisperContext) -> Result<PooledState<'_>, WhisperError> {
+        let mut inner = self.lock();
+        loop {
+            if let Some(state) = inner.idle.pop() {
+                return Ok(PooledState {
+                    pool: self,
+                    state: Some(state),
+                });
+            }
+            if inner.created < self.capacity {
+                inner.created += 1;
+                drop(inner);
+                return match ctx.create_state() {
+                    Ok(state) => Ok(PooledState {
+                        pool: self,
+                        state: Some(state),
+                    }),
+                    Err(e) => {
+                        self.lock().created -= 1;
+                        self.available.notify_one();
+                        Err(WhisperError::Transcription(e.to_string()))
+                    }
+                };
+            }
+            inner = self
+                .available
+                .wait(inner)
+                .unwrap_or_else(PoisonError::into_inner);
+        }
+    }
+
+    fn release(&self, state: WhisperState) {
+        self.lock().idle.push(state);
+        self.available.notify_one();
+    }
+
+    /// Drop all idle states.
+    fn clear(&self) {
+        let mut inner = self.lock();
+        inner.created -= inner.idle.len();
+        inner.idle.clear();
+    }
+}
+
+/// RAII guard returning a state to its pool on drop.
+struct PooledState<'a> {
+    pool: &'a StatePool,
+    state: Option<WhisperState>,
+}
+
+impl Deref for PooledState<'_> {
+    type Target = WhisperState;
+
+    fn deref(&self) -> &WhisperState {
+        self.state.as_ref().expect("state taken before drop")
+    }
+}
+
+impl DerefMut for PooledState<'_> {
+    fn deref_mut(&mut self) -> &mut WhisperState {
+        self.state.as_mut().expect("state taken before drop")
+    }
+}
+
+impl Drop for PooledState<'_> {
+    fn drop(&mut self) {
+        if let Some(state) = self.state.take() {
+            self.pool.release(state);
+        }
+    }
+}
+
+// --- Decoding ---
+
+/// Run the full encoder/decoder on `state`, stopping early once `cancel` is set.
+fn run_full(
+    state: &mut WhisperState,
+    samples: &[f32],
+    options: &TranscribeOptions,
+    cancel: &CancelToken,
+) -> Result<(), WhisperError> {
+    if cancel.is_cancelled() {
+        return Err(WhisperError::Aborted);
+    }
+
+    let mut params = FullParams::new(SamplingStrategy::Greedy { best_of: 1 });
+    params.set_print_progress(false);
+    params.set_print_realtime(false);
+    params.set_print_timestamps(false);
+    if let Some(prompt) = &options.initial_prompt {
+        params.set_initial_prompt(prompt);
+    }
+    if options.token_timestamps {
+        params.set_token_timestamps(true);
+    }
+    if options.word_timestamps {
+        params.set_token_timestamps(true);
+        params.set_max_len(1);
+        params.set_split_on_word(true);
+    }
+    if let Some(audio_len) = options.audio_len {
+        let audio_ctx = fit_audio_ctx(audio_len.max(MIN_SAMPLES));
+        params.set_audio_ctx(i32::try_from(audio_ctx).unwrap_or(0));
+    }
+    if let Some(n_threads) = options.n_threads {
+        params.set_n_threads(i32::try_from(n_threads).unwrap_or(1));
+    }
+
+    let mut padded: Vec<f32>;
+    let samples = if samples.len() < MIN_SAMPLES {
+        padded = samples.to_vec();
+        padded.resize(MIN_SAMPLES, 0.0);
+        &padded
+    } else {
+        samples
+    };
+    let token = cancel.clone();
+    params.set_abort_callback_safe(move || token.is_cancelled());
+
+    let result = state.full(params, samples);
+    // whisper.cpp may stop early without reporting an error, so check the token first
+    if cancel.is_cancelled() {
+        return Err(WhisperError::Aborted);
+    }
+    result.map_err(|e| WhisperError::Transcription(e.to_string()))?;
+    Ok(())
+}
+
+/// Concatenated, trimmed text of the last decode on `state`.
+fn read_text(state: &WhisperState) -> String {
+    let num_segments = state.full_n_segments().unwrap_or(0);
+    let mut result = String::new();
+
+    for i in 0..num_segments {
+        if let Ok(text) = state.full_get_segment_text(i) {
+            result.push_str(&text);
+        }
+    }
+
+    result.trim().to_string()
+}
+
+/// Collect the segments of the last decode on `state`.
+fn read_segments(state: &WhisperState) -> Vec<Segment> {
+    let num_segments = state.full_n_segments().unwrap_or(0);
+    (0..num_segments)
+        .filter_map(|i| {
+            Some(Segment {
+                t0: state.full_get_segment_t0(i).ok()?,
+                t1: state.full_get_segment_t1(i).ok()?,
+                text: state.full_get_segment_text(i).ok()?,
+            })
+        })
+        .collect()
+}
+
+/// Collect the segments and text tokens of the last decode on `state`. Token ids from
+/// `eot` up are special tokens.
+fn read_transcription(state: &WhisperState, eot: i32) -> Transcription {
+    let num_segments = state.full_n_segments().unwrap_or(0);
+    let mut out = Transcription {
+        token_offsets: vec![0],
+        ..Transcription::default()
+    };
+    for i in 0..num_segments {
+        let (Ok(t0), Ok(t1), Ok(text)) = (
+            state.full_get_segment_t0(i),
+            state.full_get_segment_t1(i),
+            state.full_get_segment_text(i),
+        ) else {
+            continue;
+        };
+        out.segment_t0.push(t0);
+        out.segment_t1.push(t1);
+        out.segment_text.push(text);
+        out.no_speech_prob
+            .push(state.full_get_segment_no_speech_prob(i));
+        for j in 0..state.full_n_tokens(i).unwrap_or(0) {
+            let Ok(token) = state.full_get_token_data(i, j) else {
+                continue;
+            };
+            if token.id >= eot {
+                continue;
+            }
+            out.token_ids.push(token.id);
+            out.token_probs.push(token.p);
+            out.token_t0.push(token.t0);
+            out.token_t1.push(token.t1);
+        }
+        out.token_offsets.push(out.token_ids.len());
+    }
+    out
+}
+
+// --- Public API ---
+
 /// Whisper context for speech-to-text transcription.
+///
+/// One loaded model is shared by a pool of up to `max_concurrency` decoder states, so
+/// that many calls to `transcribe` may run at once from different threads.
 pub struct Whisper {
     ctx: Option<WhisperContext>,
+    pool: StatePool,
 }
 
 impl Whisper {
     /// Load a Whisper model from the given path.
     pub fn new(model_path: impl AsRef<Path>) -> Result<Self, WhisperError> {
+        Self::with_max_concurrency(model_path, DEFAULT_MAX_CONCURRENCY)
+    }
+
+    /// Load a Whisper model, allowing up to `max_concurrency` simultaneous decodes.
+    pub fn with_max_concurrency(
+        model_path: impl AsRef<Path>,
+        max_concurrency: usize,
+    ) -> Result<Self, WhisperError> {
         let ctx = WhisperContext::new_with_params(
             model_path.as_ref().to_str().unwrap_or_default(),
             WhisperContextParameters::default(),
         )
         .map_err(|e| WhisperError::ModelLoad(e.to_string()))?;
 
-        Ok(Self { ctx: Some(ctx) })
+        Ok(Self {
+            ctx: Some(ctx),
+            pool: StatePool::new(max_concurrency),
+        })
+    }
+
+    /// Maximum number of decodes that may run at once.
+    #[must_use]
+    pub fn max_concurrency(&self) -> usize {
+        self.pool.capacity
     }
 
     /// Transcribe audio samples. Expects 16kHz mono f32, up to 30s (480,000 samples).
+    /// Input shorter than 30s is padded internally and need not be padded by the caller.
+    ///
+    /// Blocks while `max_concurrency` other calls are in progress.
     pub fn transcribe(&self, samples: &[f32]) -> Result<String, WhisperError> {
+        self.transcribe_cancellable(samples, &TranscribeOptions::default(), &CancelToken::new())
+    }
+
+    /// Transcribe audio samples, stopping early with `WhisperError::Aborted` once
+    /// `cancel` is set.
+    pub fn transcribe_cancellable(
+        &self,
+        samples: &[f32],
+        options: &TranscribeOptions,
+        cancel: &CancelToken,
+    ) -> Result<String, WhisperError> {
+        self.decode(samples, options, cancel, read_text)
+    }
+
+    /// Transcribe audio samples into a `Transcription`: segments with their times and
+    /// no-speech probability, and the id, probability and times of every text token.
+    ///
+    /// Costs the same decode as `transcribe_cancellable`, which only keeps the text.
+    /// Token times need `options.token_timestamps`.
+    pub fn transcribe_detailed(
+        &self,
+        samples: &[f32],
+        options: &TranscribeOptions,
+        cancel: &CancelToken,
+    ) -> Result<Transcription, WhisperError> {
+        let eot = self.ctx.as_ref().ok_or(WhisperError::Closed)?.token_eot();
+        self.decode(samples, options, cancel, |state| {
+            read_transcription(state, eot)
+        })
+    }
+
+    /// Transcribe many windows in one call, e.g. the pending windows of many sessions.
+    ///
+    /// The batch is spread over up to `max_concurrency` pooled states, and whisper.cpp
+    /// threads are divided between them, so the batch as a whole runs one thread per core
+    /// instead of every caller running `min(4, cores)` threads of its own and contending
+    /// for the same cores and caches. Windows are taken in order by whichever state
+    /// frees up first.
+    ///
+    /// Returns one result per item, in order: its text, or `WhisperError::Aborted` if its
+    /// token was cancelled. Fails as a whole only if no state could be created.
+    pub fn transcribe_batch(
+        &self,
+        items: &[BatchItem<'_>],
+    ) -> Result<Vec<Result<String, WhisperError>>, WhisperError> {
         let ctx = self.ctx.as_ref().ok_or(WhisperError::Closed)?;
+        if items.is_empty() {
+            return Ok(Vec::new());
+        }
+        let cores = thread::available_parallelism().map_or(1, std::num::NonZeroUsize::get);
+        let n_workers = self.pool.capacity.min(items.len()).max(1);
+        let n_threads = (cores / n_workers).max(1);
 
-        let mut state = ctx
-            .create_state()
-            .map_err(|e| WhisperError::Transcription(e.to_string()))?;
+        let next = AtomicUsize::new(0);
+        let results: Mutex<Vec<Option<Result<String, WhisperError>>>> =
+            Mutex::new((0..items.len()).map(|_| None).collect());
 
-        let mut params = FullParams::new(SamplingStrategy::Greedy { best_of: 1 });
-        params.set_print_progress(false);
-        params.set_print_realtime(false);
-        params.set_print_timestamps(false);
+        let worker = || {
+            let mut state = self.pool.acquire(ctx)?;
+            loop {
+                let i = next.fetch_add(1, Ordering::Relaxed);
+                let Some(item) = items.get(i) else {
+                    return Ok(());
+                };
+                let options = TranscribeOptions {
+                    audio_len: Some(item.audio_len.unwrap_or(item.samples.len())),
+                    n_threads: Some(n_threads),
+                    ..TranscribeOptions::default()
+                };
+                let result = run_full(&mut state, item.samples, &options, &item.cancel)
+                    .map(|()| read_text(&state));
+                results.lock().unwrap_or_else(PoisonError::into_inner)[i] = Some(result);
+            }
+        };
+
+        let workers: Vec<Result<(), WhisperError>> = thread::scope(|scope| {
+            let handles: Vec<_> = (0..n_workers).map(|_| scope.spawn(worker)).collect();
+            handles
+                .into_iter()
+                .map(|h| h.join().expect("transcribe_batch worker panicked"))
+                .collect()
+        });
+
+        // workers that got a state run every item, so items are only missing if none did
+        let results = results.into_inner().unwrap_or_else(PoisonError::into_inner);
+        if results.iter().any(Option::is_none) {
+            workers.into_iter().collect::<Result<(), _>>()?;
+        }
+        Ok(results.into_iter().flatten().collect())
+    }
+
+    /// Transcribe audio samples into timestamped segments.
+    pub fn transcribe_segments(
+        &self,
+        samples: &[f32],
+        options: &TranscribeOptions,
+        cancel: &CancelToken,
+    ) -> Result<Vec<Segment>, WhisperError> {
+        self.decode(samples, options, cancel, read_segments)
+    }
 
-        state
-            .full(params, samples)
-            .map_err(|e| WhisperError::Transcription(e.to_string()))?;
+    /// Transcribe audio of any length into segments with absolute timestamps.
+    ///
+    /// The audio is split by `plan_pieces`, and up to `n_workers` pieces are decoded at
+    /// once, each worker on a state taken from the pool, so together with other decodes
+    /// no more than `max_concurrency` states are in use. whisper.cpp threads are divided
+    /// between workers. Segments are returned in order. Defaults to one worker per pooled
+    /// state.
+    ///
+    /// A worker that can't get a state leaves its share to the others; the call only
+    /// fails for that if no worker got one.
+    pub fn transcribe_long(
+        &self,
+        samples: &[f32],
+        split_points: &[usize],
+        n_workers: Option<usize>,
+        cancel: &CancelToken,
+    ) -> Result<Vec<Segment>, WhisperError> {
+        let ctx = self.ctx.as_ref().ok_or(WhisperError::Closed)?;
+        let pieces = plan_pieces(samples, split_points);
+        let cores = thread::available_parallelism().map_or(1, std::num::NonZeroUsize::get);
+        let n_workers = n_workers
+            .unwrap_or(self.pool.capacity)
+            .clamp(1, self.pool.capacity.min(pieces.len()).max(1));
+        let options = TranscribeOptions {
+            n_threads: Some((cores / n_workers).max(1)),
+            ..TranscribeOptions::default()
+        };
 
-        let num_segments = state.full_n_segments().unwrap_or(0);
-        let mut result = String::new();
+        let next = AtomicUsize::new(0);
+        let failed = AtomicBool::new(false);
+        let results: Mutex<Vec<Option<Result<Vec<Segment>, WhisperError>>>> =
+            Mutex::new((0..pieces.len()).map(|_| None).collect());
 
-        for i in 0..num_segments {
-            if let Ok(text) = state.full_get_segment_text(i) {
-                result.push_str(&text);
+        let worker = || {
+            let mut state = self.pool.acquire(ctx)?;
+            loop {
+                let i = next.fetch_add(1, Ordering::Relaxed);
+                if i >= pieces.len() || failed.load(Ordering::Relaxed) {
+                    return Ok(());
+                }
+                let piece = &pieces[i];
+                let options = TranscribeOptions {
+                    audio_len: Some(piece.len()),
+                    ..options.clone()
+                };
+                let offset = i64::try_from(piece.start / SAMPLES_PER_CENTISECOND).unwrap_or(0);
+                let result =
+                    run_full(&mut state, &samples[piece.clone()], &options, cancel).map(|()| {
+                        read_segments(&state)
+                            .into_iter()
+                            .map(|s| Segment {
+                                t0: s.t0 + offset,
+                                t1: s.t1 + offset,
+                                text: s.text,
+                            })
+                            .collect()
+                    });
+                if result.is_err() {
+                    failed.store(true, Ordering::Relaxed);
+                }
+                results.lock().unwrap_or_else(PoisonError::into_inner)[i] = Some(result);
             }
+        };
+
+        let workers: Vec<Result<(), WhisperError>> = thread::scope(|scope| {
+            let handles: Vec<_> = (0..n_workers).map(|_| scope.spawn(worker)).collect();
+            handles
+                .into_iter()
+                .map(|h| h.join().expect("transcribe_long worker panicked"))
+                .collect()
+        });
+
+        // pieces are skipped after a decode failed, so report that error, else missing
+        // pieces mean no worker got a state
+        let results = results.into_inner().unwrap_or_else(PoisonError::into_inner);
+        if results.iter().any(Option::is_none) && !failed.load(Ordering::Relaxed) {
+            workers.into_iter().collect::<Result<(), _>>()?;
         }
+        let mut segments = Vec::new();
+        for result in results.into_iter().flatten() {
+            segments.extend(result?);
+        }
+        Ok(segments)
+    }
 
-        Ok(result.trim().to_string())
+    /// Run one decode on a pooled state and read its output with `read`.
+    fn decode<R>(
+        &self,
+        samples: &[f32],
+        options: &TranscribeOptions,
+        cancel: &CancelToken,
+        read: impl FnOnce(&WhisperState) -> R,
+    ) -> Result<R, WhisperError> {
+        let ctx = self.ctx.as_ref().ok_or(WhisperError::Closed)?;
+
+        if cancel.is_cancelled() {
+            return Err(WhisperError::Aborted);
+        }
+        let mut state = self.pool.acquire(ctx)?;
+        run_full(&mut state, samples, options, cancel)?;
+        Ok(read(&state))
     }
 
     /// Explicitly close the context, releasing resources.
     pub fn close(&mut self) {
         self.ctx = None;
+        self.pool.clear();
     }
 
     /// Check if the context is still open.
@@ -6,7 +6,9 @@ use symphonia::core::io::{MediaSourceStream, MediaSourceStreamOptions};
 use symphonia::core::meta::MetadataOptions;
 use symphonia::core::probe::Hint;
 
-use stt::chunk_audio;
+use stt::{
+    chunk_audio, decode_audio, plan_pieces, LONG_MAX_SAMPLES, LONG_MIN_SAMPLES, PCM_SAMPLE_RATE,
+};
 
 const SOURCE_FILE: &str = "tests/.fixtures/dQw4w9WgXcQ.mp3";
 const SOURCE_DURATION_MS: u64 = 213_072; // From ffprobe
@@ -140,3 +142,103 @@ fn test_total_duration_coverage() {
         "Total duration {total_duration}ms differs from source {SOURCE_DURATION_MS}ms by {diff}ms"
     );
 }
+
+// --- PCM Decode Tests ---
+
+/// Decode the source file to 16kHz mono f32, unwrapping any errors.
+fn collect_pcm(chunk_samples: usize) -> Vec<Vec<f32>> {
+    decode_audio(SOURCE_FILE, chunk_samples)
+        .unwrap()
+        .collect::<Result<Vec<_>, _>>()
+        .unwrap()
+}
+
+#[test]
+fn test_pcm_chunks_have_requested_size() {
+    let chunks = collect_pcm(512);
+
+    let (last, full) = chunks.split_last().unwrap();
+    assert!(full.iter().all(|c| c.len() == 512));
+    assert!((1..=512).contains(&last.len()));
+}
+
+#[test]
+fn test_pcm_total_duration_coverage() {
+    let chunks = collect_pcm(480_000);
+
+    let total: usize = chunks.iter().map(Vec::len).sum();
+    let duration_ms = u64::try_from(total).unwrap() * 1000 / u64::from(PCM_SAMPLE_RATE);
+
+    let diff = duration_ms.abs_diff(SOURCE_DURATION_MS);
+    assert!(
+        diff < 100,
+        "Decoded duration {duration_ms}ms differs from source {SOURCE_DURATION_MS}ms by {diff}ms"
+    );
+}
+
+#[test]
+fn test_pcm_samples_are_normalized() {
+    let chunks = collect_pcm(480_000);
+
+    assert!(chunks.iter().flatten().all(|s| s.is_finite() && s.abs() <= 1.0));
+    assert!(chunks.iter().flatten().any(|s| s.abs() > 0.01), "decoded audio is silent");
+}
+
+// --- Long-form Split Tests ---
+
+/// Constant-amplitude audio with silent stretches at the given sample ranges.
+fn audio_with_gaps(len: usize, gaps: &[std::ops::Range<usize>]) -> Vec<f32> {
+    let mut samples = vec![0.5; len];
+    for gap in gaps {
+        samples[gap.clone()].fill(0.0);
+    }
+    samples
+}
+
+/// Assert pieces cover the audio contiguously and each fits one Whisper window.
+fn assert_pieces_cover(pieces: &[std::ops::Range<usize>], len: usize) {
+    assert_eq!(pieces.first().map(|p| p.start), Some(0));
+    assert_eq!(pieces.last().map(|p| p.end), Some(len));
+    for pair in pieces.windows(2) {
+        assert_eq!(pair[0].end, pair[1].start);
+    }
+    assert!(pieces.iter().all(|p| p.len() <= LONG_MAX_SAMPLES));
+}
+
+#[test]
+fn test_plan_pieces_short_audio_is_one_piece() {
+    let samples = audio_with_gaps(LONG_MAX_SAMPLES, &[]);
+    assert_eq!(plan_pieces(&samples, &[]), vec![0..LONG_MAX_SAMPLES]);
+}
+
+#[test]
+fn test_plan_pieces_cuts_in_silence() {
+    let gap = 400_000..402_000;
+    let samples = audio_with_gaps(1_000_000, &[gap.clone()]);
+
+    let pieces = plan_pieces(&samples, &[]);
+
+    assert_pieces_cover(&pieces, samples.len());
+    assert!(gap.contains(&pieces[0].end), "cut at {} outside gap", pieces[0].end);
+}
+
+#[test]
+fn test_plan_pieces_prefers_split_points() {
+    let samples = audio_with_gaps(1_000_000, &[400_000..402_000]);
+    let hint = LONG_MIN_SAMPLES + 1_000;
+
+    let pieces = plan_pieces(&samples, &[10, hint, LONG_MAX_SAMPLES + 1]);
+
+    assert_pieces_cover(&pieces, samples.len());
+    assert_eq!(pieces[0].end, hint);
+}
+
+#[test]
+fn test_plan_pieces_hour_of_audio() {
+    let samples = audio_with_gaps(16_000 * 3600, &[]);
+
+    let pieces = plan_pieces(&samples, &[]);
+
+    assert_pieces_cover(&pieces, samples.len());
+    assert!(pieces.len() >= 120);
+}
@@ -1,5 +1,5 @@
 """Audio processing utilities."""
 
-from audio.stt import recorder
+from audio.stt import multi_recorder, recorder, speculative_recorder
 
-__all__ = ["recorder"]
+__all__ = ["multi_recorder", "recorder", "speculative_recorder"]
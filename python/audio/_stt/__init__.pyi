@@ -9,10 +9,73 @@ class AudioChunks(Iterator[bytes]):
     def __new__(cls, path: str, chunk_duration_ms: int) -> AudioChunks: ...
     def __iter__(self) -> AudioChunks: ...
     def __next__(self) -> bytes: ...
+    def close(self) -> None: ...
+
+class PcmChunks(Iterator[NDArray[np.float32]]):
+    def __new__(cls, path: str, chunk_samples: int) -> PcmChunks: ...
+    def __iter__(self) -> PcmChunks: ...
+    def __next__(self) -> NDArray[np.float32]: ...
+    def close(self) -> None: ...
+
+class TranscriptionAbortedError(RuntimeError): ...
+
+class CancelToken:
+    def __new__(cls) -> CancelToken: ...
+    def cancel(self) -> None: ...
+    @property
+    def cancelled(self) -> bool: ...
+
+TranscriptionArrays = tuple[
+    NDArray[np.int64],
+    NDArray[np.int64],
+    list[str],
+    NDArray[np.float32],
+    NDArray[np.uintp],
+    NDArray[np.int32],
+    NDArray[np.float32],
+    NDArray[np.int64],
+    NDArray[np.int64],
+]
 
 class Whisper:
-    def __new__(cls, model_path: str) -> Whisper: ...
-    def transcribe(self, samples: NDArray[np.float32]) -> str: ...
+    def __new__(cls, model_path: str, max_concurrency: int = 2) -> Whisper: ...
+    @property
+    def max_concurrency(self) -> int: ...
+    def transcribe(
+        self,
+        samples: NDArray[np.float32],
+        cancel: CancelToken | None = None,
+        audio_len: int | None = None,
+    ) -> str: ...
+    def transcribe_detailed(
+        self,
+        samples: NDArray[np.float32],
+        prompt: str | None = None,
+        cancel: CancelToken | None = None,
+        token_timestamps: bool = False,
+        audio_len: int | None = None,
+    ) -> TranscriptionArrays: ...
+    def transcribe_batch(
+        self,
+        windows: list[NDArray[np.float32]],
+        cancels: list[CancelToken] | None = None,
+        audio_lens: list[int | None] | None = None,
+    ) -> list[tuple[str | None, Exception | None]]: ...
+    def transcribe_segments(
+        self,
+        samples: NDArray[np.float32],
+        prompt: str | None = None,
+        cancel: CancelToken | None = None,
+        word_timestamps: bool = False,
+        audio_len: int | None = None,
+    ) -> list[tuple[int, int, str]]: ...
+    def transcribe_long(
+        self,
+        samples: NDArray[np.float32],
+        n_workers: int | None = None,
+        split_points: list[int] | None = None,
+        cancel: CancelToken | None = None,
+    ) -> list[tuple[int, int, str]]: ...
     def close(self) -> None: ...
     def is_open(self) -> bool: ...
     def __enter__(self) -> Whisper: ...
@@ -1,12 +1,67 @@
 //! PyO3 bindings for the `stt` audio chunking library.
 
-use numpy::{PyArray1, PyArrayMethods};
+use numpy::{PyArray1, PyReadonlyArray1};
+use pyo3::create_exception;
+use pyo3::exceptions::PyBaseException;
 use pyo3::prelude::*;
-use stt::{chunk_audio, Whisper};
+use std::sync::{PoisonError, RwLock, RwLockReadGuard};
+use stt::{
+    chunk_audio, decode_audio, BatchItem, CancelToken, TranscribeOptions, Transcription, Whisper,
+    WhisperError, DEFAULT_MAX_CONCURRENCY,
+};
+
+create_exception!(
+    _stt,
+    TranscriptionAbortedError,
+    pyo3::exceptions::PyRuntimeError,
+    "Transcription stopped early because its CancelToken was cancelled."
+);
+
+fn whisper_err(e: WhisperError) -> PyErr {
+    match e {
+        WhisperError::Aborted => TranscriptionAbortedError::new_err(e.to_string()),
+        _ => PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(e.to_string()),
+    }
+}
+
+/// Outcome of one window of a batch: its text, else the error of its decode, else
+/// neither when it was cancelled.
+type BatchResult = (Option<String>, Option<Py<PyBaseException>>);
+
+/// `Transcription` as a tuple of numpy arrays and segment texts, in field order.
+type PyTranscription<'py> = (
+    Bound<'py, PyArray1<i64>>,
+    Bound<'py, PyArray1<i64>>,
+    Vec<String>,
+    Bound<'py, PyArray1<f32>>,
+    Bound<'py, PyArray1<usize>>,
+    Bound<'py, PyArray1<i32>>,
+    Bound<'py, PyArray1<f32>>,
+    Bound<'py, PyArray1<i64>>,
+    Bound<'py, PyArray1<i64>>,
+);
+
+/// Move the arrays of `t` into numpy without copying them.
+fn transcription_arrays(py: Python<'_>, t: Transcription) -> PyTranscription<'_> {
+    (
+        PyArray1::from_vec_bound(py, t.segment_t0),
+        PyArray1::from_vec_bound(py, t.segment_t1),
+        t.segment_text,
+        PyArray1::from_vec_bound(py, t.no_speech_prob),
+        PyArray1::from_vec_bound(py, t.token_offsets),
+        PyArray1::from_vec_bound(py, t.token_ids),
+        PyArray1::from_vec_bound(py, t.token_probs),
+        PyArray1::from_vec_bound(py, t.token_t0),
+        PyArray1::from_vec_bound(py, t.token_t1),
+    )
+}
 
 /// Python wrapper for `AudioChunks` iterator.
+///
+/// `close()` releases the input file and `FFmpeg` contexts before the object is
+/// garbage-collected; a closed iterator is exhausted.
 #[pyclass(name = "AudioChunks")]
-pub struct PyAudioChunks(stt::AudioChunks);
+pub struct PyAudioChunks(Option<stt::AudioChunks>);
 
 #[pymethods]
 impl PyAudioChunks {
@@ -14,7 +69,7 @@ impl PyAudioChunks {
     fn new(path: &str, chunk_duration_ms: u64) -> PyResult<Self> {
         let chunks = chunk_audio(path, chunk_duration_ms)
             .map_err(|e| PyErr::new::<pyo3::exceptions::PyIOError, _>(e.to_string()))?;
-        Ok(Self(chunks))
+        Ok(Self(Some(chunks)))
     }
 
     fn __iter__(slf: PyRef<Self>) -> PyRef<Self> {
@@ -22,43 +77,302 @@ impl PyAudioChunks {
     }
 
     fn __next__(&mut self) -> PyResult<Option<Vec<u8>>> {
-        match self.0.next() {
+        let Some(chunks) = self.0.as_mut() else {
+            return Ok(None);
+        };
+        match chunks.next() {
             Some(Ok(bytes)) => Ok(Some(bytes)),
             Some(Err(e)) => Err(PyErr::new::<pyo3::exceptions::PyIOError, _>(e.to_string())),
             None => Ok(None),
         }
     }
+
+    /// Release the input file. Further iteration stops.
+    fn close(&mut self) {
+        self.0 = None;
+    }
+}
+
+/// Python wrapper for `PcmChunks`: decodes a file to 16kHz mono float32 numpy arrays.
+#[pyclass(name = "PcmChunks")]
+pub struct PyPcmChunks(Option<stt::PcmChunks>);
+
+#[pymethods]
+impl PyPcmChunks {
+    #[new]
+    fn new(path: &str, chunk_samples: usize) -> PyResult<Self> {
+        let chunks = decode_audio(path, chunk_samples)
+            .map_err(|e| PyErr::new::<pyo3::exceptions::PyIOError, _>(e.to_string()))?;
+        Ok(Self(Some(chunks)))
+    }
+
+    fn __iter__(slf: PyRef<Self>) -> PyRef<Self> {
+        slf
+    }
+
+    /// Decode the next chunk with the GIL released. The samples are moved into the
+    /// returned array without a copy.
+    fn __next__<'py>(&mut self, py: Python<'py>) -> PyResult<Option<Bound<'py, PyArray1<f32>>>> {
+        let Some(chunks) = self.0.as_mut() else {
+            return Ok(None);
+        };
+        match py.allow_threads(|| chunks.next()) {
+            Some(Ok(samples)) => Ok(Some(PyArray1::from_vec_bound(py, samples))),
+            Some(Err(e)) => Err(PyErr::new::<pyo3::exceptions::PyIOError, _>(e.to_string())),
+            None => Ok(None),
+        }
+    }
+
+    /// Release the input file and decoder. Further iteration stops.
+    fn close(&mut self) {
+        self.0 = None;
+    }
+}
+
+/// Thread-safe flag for aborting an in-progress `Whisper.transcribe`.
+#[pyclass(name = "CancelToken")]
+#[derive(Default)]
+pub struct PyCancelToken(CancelToken);
+
+#[pymethods]
+impl PyCancelToken {
+    #[new]
+    fn new() -> Self {
+        Self::default()
+    }
+
+    /// Request cancellation. Safe to call from any thread, any number of times.
+    fn cancel(&self) {
+        self.0.cancel();
+    }
+
+    #[getter]
+    fn cancelled(&self) -> bool {
+        self.0.is_cancelled()
+    }
 }
 
 /// Whisper speech-to-text context.
-#[pyclass(name = "Whisper")]
-pub struct PyWhisper(Whisper);
+///
+/// Decodes run with the GIL released while holding a read lock on the model, so any
+/// number of them may run at once, and `close` takes the write lock: it waits for
+/// decodes in progress (e.g. one still unwinding after its token was cancelled) instead
+/// of failing because the object is borrowed.
+#[pyclass(name = "Whisper", frozen)]
+pub struct PyWhisper(RwLock<Whisper>);
+
+impl PyWhisper {
+    fn whisper(&self) -> RwLockReadGuard<'_, Whisper> {
+        self.0.read().unwrap_or_else(PoisonError::into_inner)
+    }
+
+    /// Run `f` on the model with the GIL released, holding the read lock.
+    fn run<R: Send>(&self, py: Python<'_>, f: impl FnOnce(&Whisper) -> R + Send) -> R {
+        py.allow_threads(|| f(&self.whisper()))
+    }
+}
 
 #[pymethods]
 impl PyWhisper {
+    /// Load a model, with the GIL released.
     #[new]
-    fn new(model_path: &str) -> PyResult<Self> {
-        let whisper = Whisper::new(model_path)
-            .map_err(|e| PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(e.to_string()))?;
-        Ok(Self(whisper))
+    #[pyo3(signature = (model_path, max_concurrency=DEFAULT_MAX_CONCURRENCY))]
+    fn new(py: Python<'_>, model_path: &str, max_concurrency: usize) -> PyResult<Self> {
+        let whisper = py
+            .allow_threads(|| Whisper::with_max_concurrency(model_path, max_concurrency))
+            .map_err(whisper_err)?;
+        Ok(Self(RwLock::new(whisper)))
+    }
+
+    /// Maximum number of decodes that may run at once on this model.
+    #[getter]
+    fn max_concurrency(&self) -> usize {
+        self.whisper().max_concurrency()
     }
 
     /// Transcribe audio samples (16kHz mono f32, up to 30s).
-    fn transcribe(&self, samples: &Bound<'_, PyArray1<f32>>) -> PyResult<String> {
-        let samples = unsafe { samples.as_slice()? };
-        self.0
-            .transcribe(samples)
-            .map_err(|e| PyErr::new::<pyo3::exceptions::PyRuntimeError, _>(e.to_string()))
+    ///
+    /// Samples are copied before the GIL is released so Python code cannot mutate them
+    /// mid-decode. Other Python threads keep running for the duration of the decode.
+    /// Raises `TranscriptionAbortedError` if `cancel` is cancelled before the decode ends.
+    ///
+    /// `audio_len` is the number of real (non-padding) samples. When given, the encoder
+    /// context is shrunk to that length plus a margin instead of a full 30s.
+    #[pyo3(signature = (samples, cancel=None, audio_len=None))]
+    fn transcribe(
+        &self,
+        py: Python<'_>,
+        samples: PyReadonlyArray1<'_, f32>,
+        cancel: Option<PyRef<'_, PyCancelToken>>,
+        audio_len: Option<usize>,
+    ) -> PyResult<String> {
+        let samples = samples.as_array().to_vec();
+        let token = cancel.map(|c| c.0.clone()).unwrap_or_default();
+        let options = TranscribeOptions {
+            audio_len,
+            ..TranscribeOptions::default()
+        };
+        self.run(py, |whisper| {
+            whisper.transcribe_cancellable(&samples, &options, &token)
+        })
+        .map_err(whisper_err)
     }
 
-    /// Explicitly close the context.
-    fn close(&mut self) {
-        self.0.close();
+    /// Transcribe audio samples into the arrays of a structured result: segment `t0`,
+    /// `t1`, texts and no-speech probabilities, per-segment token offsets, then token ids,
+    /// probabilities, `t0` and `t1`. Times are in centiseconds.
+    ///
+    /// Token arrays are handed to numpy without a copy and no object is created per
+    /// token. Token times are computed only with `token_timestamps`. Otherwise this is the
+    /// same decode as `transcribe`.
+    #[pyo3(signature = (samples, prompt=None, cancel=None, token_timestamps=false, audio_len=None))]
+    fn transcribe_detailed<'py>(
+        &self,
+        py: Python<'py>,
+        samples: PyReadonlyArray1<'_, f32>,
+        prompt: Option<String>,
+        cancel: Option<PyRef<'_, PyCancelToken>>,
+        token_timestamps: bool,
+        audio_len: Option<usize>,
+    ) -> PyResult<PyTranscription<'py>> {
+        let samples = samples.as_array().to_vec();
+        let token = cancel.map(|c| c.0.clone()).unwrap_or_default();
+        let options = TranscribeOptions {
+            initial_prompt: prompt,
+            token_timestamps,
+            audio_len,
+            ..TranscribeOptions::default()
+        };
+        let transcription = self
+            .run(py, |whisper| {
+                whisper.transcribe_detailed(&samples, &options, &token)
+            })
+            .map_err(whisper_err)?;
+        Ok(transcription_arrays(py, transcription))
+    }
+
+    /// Transcribe many windows in one call, returning one `(text, error)` per window in
+    /// order.
+    ///
+    /// The windows are spread over this model's decoder states with whisper.cpp threads
+    /// divided between them, so the batch uses each core once. `cancels` and `audio_lens`,
+    /// when given, hold one entry per window. A window whose token is cancelled before its
+    /// decode ends yields `(None, None)`, and a window whose decode fails yields `(None,
+    /// error)`, while the others carry on. Only a failure of the whole batch raises.
+    #[pyo3(signature = (windows, cancels=None, audio_lens=None))]
+    fn transcribe_batch(
+        &self,
+        py: Python<'_>,
+        windows: Vec<PyReadonlyArray1<'_, f32>>,
+        cancels: Option<Vec<PyRef<'_, PyCancelToken>>>,
+        audio_lens: Option<Vec<Option<usize>>>,
+    ) -> PyResult<Vec<BatchResult>> {
+        let n = windows.len();
+        if cancels.as_ref().is_some_and(|c| c.len() != n)
+            || audio_lens.as_ref().is_some_and(|a| a.len() != n)
+        {
+            return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(
+                "cancels and audio_lens need one entry per window",
+            ));
+        }
+        let samples: Vec<Vec<f32>> = windows.iter().map(|w| w.as_array().to_vec()).collect();
+        let tokens: Vec<CancelToken> = match cancels {
+            Some(cancels) => cancels.iter().map(|c| c.0.clone()).collect(),
+            None => (0..n).map(|_| CancelToken::new()).collect(),
+        };
+        let audio_lens = audio_lens.unwrap_or_else(|| vec![None; n]);
+        let results = self
+            .run(py, |whisper| {
+                let items: Vec<BatchItem<'_>> = samples
+                    .iter()
+                    .zip(tokens)
+                    .zip(audio_lens)
+                    .map(|((samples, cancel), audio_len)| BatchItem {
+                        samples,
+                        audio_len,
+                        cancel,
+                    })
+                    .collect();
+                whisper.transcribe_batch(&items)
+            })
+            .map_err(whisper_err)?;
+        Ok(results
+            .into_iter()
+            .map(|result| match result {
+                Ok(text) => (Some(text), None),
+                Err(WhisperError::Aborted) => (None, None),
+                Err(e) => (None, Some(whisper_err(e).into_value(py))),
+            })
+            .collect())
+    }
+
+    /// Transcribe audio samples into `(t0, t1, text)` segments, times in centiseconds.
+    ///
+    /// `prompt` is fed to the decoder as preceding context. With `word_timestamps`,
+    /// each segment is a single word. `audio_len` shrinks the encoder context as in
+    /// `transcribe`.
+    #[pyo3(signature = (samples, prompt=None, cancel=None, word_timestamps=false, audio_len=None))]
+    fn transcribe_segments(
+        &self,
+        py: Python<'_>,
+        samples: PyReadonlyArray1<'_, f32>,
+        prompt: Option<String>,
+        cancel: Option<PyRef<'_, PyCancelToken>>,
+        word_timestamps: bool,
+        audio_len: Option<usize>,
+    ) -> PyResult<Vec<(i64, i64, String)>> {
+        let samples = samples.as_array().to_vec();
+        let token = cancel.map(|c| c.0.clone()).unwrap_or_default();
+        let options = TranscribeOptions {
+            initial_prompt: prompt,
+            word_timestamps,
+            audio_len,
+            ..TranscribeOptions::default()
+        };
+        let segments = self
+            .run(py, |whisper| {
+                whisper.transcribe_segments(&samples, &options, &token)
+            })
+            .map_err(whisper_err)?;
+        Ok(segments.into_iter().map(|s| (s.t0, s.t1, s.text)).collect())
+    }
+
+    /// Transcribe audio of any length into `(t0, t1, text)` segments, times in
+    /// centiseconds from the first sample.
+    ///
+    /// The audio is cut into pieces of up to 30s at the last of `split_points` (e.g. pauses
+    /// found by a VAD) between 20s and 30s into each piece, or else at the quietest 100ms.
+    /// Up to `n_workers` pieces (default and at most `max_concurrency`) decode at once on
+    /// states from this model's pool.
+    #[pyo3(signature = (samples, n_workers=None, split_points=None, cancel=None))]
+    fn transcribe_long(
+        &self,
+        py: Python<'_>,
+        samples: PyReadonlyArray1<'_, f32>,
+        n_workers: Option<usize>,
+        split_points: Option<Vec<usize>>,
+        cancel: Option<PyRef<'_, PyCancelToken>>,
+    ) -> PyResult<Vec<(i64, i64, String)>> {
+        let samples = samples.as_array().to_vec();
+        let split_points = split_points.unwrap_or_default();
+        let token = cancel.map(|c| c.0.clone()).unwrap_or_default();
+        let segments = self
+            .run(py, |whisper| {
+                whisper.transcribe_long(&samples, &split_points, n_workers, &token)
+            })
+            .map_err(whisper_err)?;
+        Ok(segments.into_iter().map(|s| (s.t0, s.t1, s.text)).collect())
+    }
+
+    /// Explicitly close the context, after waiting for decodes in progress to finish.
+    fn close(&self, py: Python<'_>) {
+        let lock = &self.0;
+        py.allow_threads(|| lock.write().unwrap_or_else(PoisonError::into_inner).close());
     }
 
     /// Check if context is open.
     fn is_open(&self) -> bool {
-        self.0.is_open()
+        self.whisper().is_open()
     }
 
     fn __enter__(slf: PyRef<Self>) -> PyRef<Self> {
@@ -67,12 +381,13 @@ impl PyWhisper {
 
     #[pyo3(signature = (_exc_type=None, _exc_value=None, _traceback=None))]
     fn __exit__(
-        &mut self,
+        &self,
+        py: Python<'_>,
         _exc_type: Option<&Bound<'_, PyAny>>,
         _exc_value: Option<&Bound<'_, PyAny>>,
         _traceback: Option<&Bound<'_, PyAny>>,
     ) -> bool {
-        self.close();
+        self.close(py);
         false
     }
 }
@@ -80,6 +395,12 @@ impl PyWhisper {
 #[pymodule]
 fn _stt(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_class::<PyAudioChunks>()?;
+    m.add_class::<PyPcmChunks>()?;
+    m.add_class::<PyCancelToken>()?;
     m.add_class::<PyWhisper>()?;
+    m.add(
+        "TranscriptionAbortedError",
+        m.py().get_type_bound::<TranscriptionAbortedError>(),
+    )?;
     Ok(())
 }
@@ -0,0 +1,211 @@
+"""Cross-session batched transcription on one shared Whisper model.
+
+Many recorder sessions on one box each transcribe their own windows. Decoding them one
+call at a time runs every window with whisper.cpp's own thread count, so concurrent
+sessions oversubscribe the cores and evict each other's caches. A BatchTranscriber
+instead collects the windows submitted by all sessions within a short deadline and hands
+them to the native model as one batch, which spreads them over its decoder states with
+the cores divided between them (see Whisper.transcribe_batch).
+
+Example:
+    batcher = BatchTranscriber.from_path(path, max_concurrency=4)
+    for source in sessions:
+        windows(source).pipe(exhaust_map_latest(batcher.transcribe)).subscribe(...)
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from os import PathLike
+from typing import Self
+
+import reactivex as rx
+from reactivex import Observable
+from reactivex.abc import DisposableBase, ObserverBase, SchedulerBase
+from reactivex.disposable import Disposable
+
+from audio._stt import CancelToken, Whisper
+from audio.types import AudioChunk
+from audio.whisper import DEFAULT_MAX_CONCURRENCY
+
+DEADLINE = 0.05  # seconds a window waits for others to join its batch
+MAX_BATCH = 32
+
+
+@dataclass(frozen=True)
+class BatchStats:
+    """Counters of a BatchTranscriber.
+
+    Attributes:
+        batches: Batches decoded
+        windows: Windows transcribed
+        aborted: Windows disposed before their text was ready
+        max_batch: Most windows decoded in one batch
+        wait_seconds: Time windows spent waiting for their batch to start, summed
+        decode_seconds: Wall-clock time spent in batch decodes
+    """
+
+    batches: int = 0
+    windows: int = 0
+    aborted: int = 0
+    max_batch: int = 0
+    wait_seconds: float = 0.0
+    decode_seconds: float = 0.0
+
+    @property
+    def mean_batch(self) -> float:
+        return self.windows / self.batches if self.batches else 0.0
+
+
+@dataclass
+class _Pending:
+    window: AudioChunk
+    audio_len: int | None
+    observer: ObserverBase[str]
+    token: CancelToken = field(default_factory=CancelToken)
+    submitted: float = field(default_factory=time.perf_counter)
+
+
+class BatchTranscriber:
+    """Transcribe windows from many sessions in shared native batches.
+
+    A batch starts deadline seconds after its oldest window was submitted, or as soon
+    as max_batch windows are waiting. Batches run one at a time on a dedicated thread;
+    windows submitted meanwhile gather into the next one. Each window's text is emitted
+    on its own Observable, from the batch thread.
+
+    Disposing a window's subscription cancels it: it is dropped if still waiting, or its
+    native decode is aborted without affecting the rest of the batch.
+    """
+
+    def __init__(
+        self,
+        whisper: Whisper,
+        deadline: float = DEADLINE,
+        max_batch: int = MAX_BATCH,
+        name: str = "",
+    ) -> None:
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        self.deadline = deadline
+        self.max_batch = max_batch
+        self._whisper = whisper
+        self._name = name
+        self._queue: list[_Pending] = []
+        self._cond = threading.Condition()
+        self._closed = False
+        self._stats = BatchStats()
+        self._thread = threading.Thread(target=self._run, name="batch-transcribe", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def from_path(
+        cls,
+        model_path: str | PathLike[str],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        deadline: float = DEADLINE,
+        max_batch: int = MAX_BATCH,
+    ) -> Self:
+        """Load a model whose max_concurrency decoder states share each batch."""
+        whisper = Whisper(str(model_path), max_concurrency)
+        return cls(whisper, deadline, max_batch, os.path.basename(model_path))
+
+    @property
+    def stats(self) -> BatchStats:
+        with self._cond:
+            return self._stats
+
+    @property
+    def name(self) -> str:
+        """Label of the loaded model, e.g. for metrics."""
+        return self._name
+
+    def close(self) -> None:
+        """Decode the windows still waiting, stop the batch thread and close the model."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        self._whisper.close()
+
+    def transcribe(self, window: AudioChunk, audio_len: int | None = None) -> Observable[str]:
+        """Transcribe a window (up to 30s of 16kHz audio) in the next batch.
+
+        Same contract as Transcriber.transcribe: emits the text once, then completes.
+        """
+
+        def subscribe(
+            observer: ObserverBase[str], _scheduler: SchedulerBase | None = None
+        ) -> DisposableBase:
+            pending = _Pending(window, audio_len, observer)
+            with self._cond:
+                if self._closed:
+                    observer.on_error(RuntimeError("BatchTranscriber is closed"))
+                    return Disposable()
+                self._queue.append(pending)
+                self._cond.notify()
+            return Disposable(pending.token.cancel)
+
+        return rx.create(subscribe)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                due = self._queue[0].submitted + self.deadline
+                while len(self._queue) < self.max_batch and not self._closed:
+                    remaining = due - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._queue[: self.max_batch]
+                del self._queue[: self.max_batch]
+            self._decode(batch)
+
+    def _decode(self, batch: list[_Pending]) -> None:
+        live = [p for p in batch if not p.token.cancelled]
+        aborted = len(batch) - len(live)
+        start = time.perf_counter()
+        results: list[tuple[str | None, Exception | None]] = []
+        if live:
+            try:
+                results = self._whisper.transcribe_batch(
+                    [p.window for p in live],
+                    [p.token for p in live],
+                    [p.audio_len for p in live],
+                )
+            except Exception as e:
+                for p in live:
+                    p.observer.on_error(e)
+                return
+        seconds = time.perf_counter() - start
+
+        done = 0
+        for p, (text, error) in zip(live, results, strict=True):
+            if error is not None:
+                p.observer.on_error(error)  # only this window's session fails
+                continue
+            if text is None:
+                aborted += 1
+                continue
+            done += 1
+            p.observer.on_next(text)
+            p.observer.on_completed()
+
+        with self._cond:
+            s = self._stats
+            self._stats = replace(
+                s,
+                batches=s.batches + bool(live),
+                windows=s.windows + done,
+                aborted=s.aborted + aborted,
+                max_batch=max(s.max_batch, len(live)),
+                wait_seconds=s.wait_seconds + sum(start - p.submitted for p in live),
+                decode_seconds=s.decode_seconds + seconds,
+            )
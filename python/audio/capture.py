@@ -0,0 +1,235 @@
+"""Lock-free capture from the PortAudio callback into a preallocated ring.
+
+The audio callback runs on a real-time thread. Anything slow there (allocating arrays,
+taking locks, running Rx operators) risks an input overflow, i.e. lost audio. In ring
+capture the callback only copies the block into a CaptureRing and bumps counters. A
+pipeline thread wakes every drain_interval and emits everything written since its last
+visit as one batch, which rechunk/rechunk_ring then split into chunks.
+
+The ring is single-producer single-consumer: the callback is the only writer of the
+write position, the drain thread the only writer of the read position. Each side
+publishes its position after copying, so neither needs a lock.
+
+When the drain thread falls behind by more than the ring's capacity, the newest samples
+of a block are dropped rather than overwriting unread ones, and counted.
+
+Example:
+    source = audio_stream(capture=CaptureOptions(blocksize=160, latency="low"))
+    source.stream.pipe(rechunk_ring(512)).subscribe(...)
+    source.capture.stats.dropped_samples
+"""
+
+import threading
+from dataclasses import dataclass
+from functools import reduce
+from typing import Literal
+
+import numpy as np
+import reactivex as rx
+from reactivex import Observable
+from reactivex.abc import DisposableBase, ObserverBase, SchedulerBase
+from reactivex.disposable import Disposable
+
+from audio.latency import SAMPLE_RATE, stamp
+from audio.types import AudioChunk, AudioStream
+
+
+@dataclass(frozen=True)
+class CaptureOptions:
+    """Ring capture settings.
+
+    Attributes:
+        blocksize: Frames per callback, 0 lets the host API choose
+        latency: Input latency in seconds, or PortAudio's "low"/"high" default for the device
+        ring_seconds: Audio the ring holds before dropping, i.e. how far the pipeline thread
+            may fall behind
+        drain_interval: Seconds between drains of the ring by the pipeline thread
+    """
+
+    blocksize: int = 0
+    latency: float | Literal["low", "high"] = "low"
+    ring_seconds: float = 2.0
+    drain_interval: float = 0.02
+
+
+@dataclass(frozen=True)
+class CaptureStats:
+    """Counters of ring capture.
+
+    Attributes:
+        blocks: Callbacks received
+        samples: Samples written to the ring
+        overflows: Callbacks flagged with a PortAudio input overflow (audio lost before
+            the callback ran)
+        dropped_samples: Samples dropped because the ring was full
+        batches: Non-empty drains by the pipeline thread
+        max_fill: Most samples waiting in the ring at a drain
+    """
+
+    blocks: int = 0
+    samples: int = 0
+    overflows: int = 0
+    dropped_samples: int = 0
+    batches: int = 0
+    max_fill: int = 0
+
+
+class CaptureRing:
+    """Preallocated float32 SPSC ring between the audio callback and the drain thread.
+
+    Positions count samples written and read over the ring's lifetime, so the fill level
+    is always write - read with no wrap-around ambiguity.
+    """
+
+    def __init__(self, capacity: int, samplerate: int = SAMPLE_RATE) -> None:
+        self._buf = np.zeros(capacity, dtype=np.float32)
+        self._rate = samplerate
+        self._write = 0  # only the writer assigns
+        self._read = 0  # only the reader assigns
+        self._stamp: tuple[int, float] | None = None  # (write position, its capture time)
+        # Writer counters
+        self._blocks = 0
+        self._samples = 0
+        self._overflows = 0
+        self._dropped = 0
+        # Reader counters
+        self._batches = 0
+        self._max_fill = 0
+
+    def __len__(self) -> int:
+        return self._write - self._read
+
+    @property
+    def capacity(self) -> int:
+        return len(self._buf)
+
+    @property
+    def stats(self) -> CaptureStats:
+        return CaptureStats(
+            blocks=self._blocks,
+            samples=self._samples,
+            overflows=self._overflows,
+            dropped_samples=self._dropped,
+            batches=self._batches,
+            max_fill=self._max_fill,
+        )
+
+    def write(self, block: AudioStream, captured: float | None, overflow: bool = False) -> None:
+        """Copy block in (writer side). Samples that don't fit are dropped.
+
+        captured is the capture time of the block's newest sample, if known.
+        """
+        samples = block.reshape(-1)
+        capacity = len(self._buf)
+        write = self._write
+        n = min(len(samples), capacity - (write - self._read))
+        start = write % capacity
+        head = min(n, capacity - start)
+        self._buf[start : start + head] = samples[:head]
+        self._buf[: n - head] = samples[head:n]
+        self._blocks += 1
+        self._samples += n
+        self._dropped += len(samples) - n
+        self._overflows += overflow
+        self._write = write + n
+        if captured is not None:
+            # The newest sample written is the last that fit
+            self._stamp = (write + n, captured - (len(samples) - n) / self._rate)
+
+    def drain(self) -> AudioChunk | None:
+        """Copy out everything written so far as one array (reader side), None if empty.
+
+        The batch is stamped with the capture time of its newest sample when the writer
+        provides capture times.
+        """
+        read, write = self._read, self._write
+        n = write - read
+        if n == 0:
+            return None
+        capacity = len(self._buf)
+        start = read % capacity
+        head = min(n, capacity - start)
+        out = np.empty(n, dtype=np.float32)
+        out[:head] = self._buf[start : start + head]
+        out[head:] = self._buf[: n - head]
+        self._read = write
+        self._batches += 1
+        self._max_fill = max(self._max_fill, n)
+        stamped = self._stamp
+        if stamped is None:
+            return out
+        position, captured = stamped
+        # The stamp may be for a later write than this batch, or lag one behind it
+        return stamp(out, captured - (position - write) / self._rate)
+
+
+def _combine(a: CaptureStats, b: CaptureStats) -> CaptureStats:
+    return CaptureStats(
+        blocks=a.blocks + b.blocks,
+        samples=a.samples + b.samples,
+        overflows=a.overflows + b.overflows,
+        dropped_samples=a.dropped_samples + b.dropped_samples,
+        batches=a.batches + b.batches,
+        max_fill=max(a.max_fill, b.max_fill),
+    )
+
+
+class CaptureMetrics:
+    """CaptureStats of an audio source, summed over the rings of all its subscriptions."""
+
+    def __init__(self) -> None:
+        self._retired = CaptureStats()
+        self._rings: list[CaptureRing] = []
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> CaptureStats:
+        with self._lock:
+            retired, rings = self._retired, list(self._rings)
+        return reduce(_combine, (ring.stats for ring in rings), retired)
+
+    def track(self, ring: CaptureRing) -> None:
+        with self._lock:
+            self._rings.append(ring)
+
+    def retire(self, ring: CaptureRing) -> None:
+        """Fold the counters of a ring that is no longer written into the totals."""
+        with self._lock:
+            self._rings.remove(ring)
+            self._retired = _combine(self._retired, ring.stats)
+
+
+def ring_capacity(options: CaptureOptions, samplerate: int = SAMPLE_RATE) -> int:
+    """Ring size in samples for options, at least one block."""
+    return max(int(options.ring_seconds * samplerate), options.blocksize, 1)
+
+
+def drain_ring(ring: CaptureRing, interval: float) -> Observable[AudioChunk]:
+    """Emit the contents of ring in batches, from a dedicated thread, until disposed.
+
+    Dispose waits for the thread to stop (unless called from it), after which the caller
+    is the ring's only reader and may drain what was written since the last batch.
+    """
+
+    def subscribe(
+        observer: ObserverBase[AudioChunk], _scheduler: SchedulerBase | None = None
+    ) -> DisposableBase:
+        stop = threading.Event()
+
+        def run() -> None:
+            while not stop.wait(interval):
+                batch = ring.drain()
+                if batch is not None:
+                    observer.on_next(batch)
+
+        thread = threading.Thread(target=run, name="capture-drain", daemon=True)
+        thread.start()
+
+        def dispose() -> None:
+            stop.set()
+            if threading.current_thread() is not thread:
+                thread.join()
+
+        return Disposable(dispose)
+
+    return rx.create(subscribe)
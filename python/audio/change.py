@@ -0,0 +1,139 @@
+"""Skip decodes of windows whose new audio is near-silent.
+
+window_chunks emits a window every emit_interval samples while the VAD gate is open,
+including the tail of an utterance, after speech has ended but before the smoothed
+probability falls below stop and closes the gate. A decode of such a window sees the
+same speech as the previous one plus silence, and costs a full decode to return the same
+text. skip_unchanged sits between the windows and the transcriber: when everything
+appended since the last decode is quiet by both energy and VAD probability, it emits the
+previous text again instead of decoding.
+
+Example:
+    transcribe = skip_unchanged(transcriber.transcribe, SileroVADModel(), metrics=metrics)
+    windows.pipe(exhaust_map_latest(transcribe))
+    metrics.stats.skipped
+"""
+
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+
+import numpy as np
+import reactivex as rx
+from reactivex import Observable
+from reactivex import operators as ops
+
+from audio.config import ChangeOptions
+from audio.latency import SAMPLE_RATE, captured_at
+from audio.types import AudioChunk
+from audio.vad import VADModel, speech_probabilities
+
+
+@dataclass(frozen=True)
+class ChangeStats:
+    """Counters of change detection.
+
+    Attributes:
+        decoded: Windows passed on to the transcriber
+        skipped: Windows answered with the previous text, without a decode
+    """
+
+    decoded: int = 0
+    skipped: int = 0
+
+    @property
+    def skip_ratio(self) -> float:
+        total = self.decoded + self.skipped
+        return self.skipped / total if total else 0.0
+
+
+class ChangeMetrics:
+    """Thread-safe ChangeStats holder, shared by the pipelines of a recorder."""
+
+    def __init__(self) -> None:
+        self._stats = ChangeStats()
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> ChangeStats:
+        return self._stats
+
+    def record(self, skipped: bool) -> None:
+        with self._lock:
+            s = self._stats
+            if skipped:
+                self._stats = replace(s, skipped=s.skipped + 1)
+            else:
+                self._stats = replace(s, decoded=s.decoded + 1)
+
+
+def appended_samples(window: AudioChunk, previous: AudioChunk | None) -> int | None:
+    """Samples at the end of window that previous did not have, None if unknown.
+
+    Uses the capture stamps of both windows when present, else how much the window grew.
+    A shorter window starts a new utterance and is new throughout. Windows of equal
+    length without stamps, e.g. both full, can't be told apart.
+    """
+    if previous is None or len(window) < len(previous):
+        return len(window)
+    now, before = captured_at(window), captured_at(previous)
+    if now is not None and before is not None:
+        n = round((now - before) * SAMPLE_RATE)
+    elif len(window) > len(previous):
+        n = len(window) - len(previous)
+    else:
+        return None
+    return min(max(n, 0), len(window))
+
+
+def is_quiet(samples: AudioChunk, vad_model: VADModel, options: ChangeOptions) -> bool:
+    """Whether samples are below max_rms and no frame reaches max_probability.
+
+    The VAD model only runs on audio that is already quiet by energy.
+    """
+    if not len(samples):
+        return True
+    rms = float(np.sqrt(np.mean(np.square(samples, dtype=np.float64))))
+    if rms > options.max_rms:
+        return False
+    return float(speech_probabilities(vad_model, samples).max()) <= options.max_probability
+
+
+def skip_unchanged(
+    transcribe: Callable[[AudioChunk], Observable[str]],
+    vad_model: VADModel,
+    options: ChangeOptions | None = None,
+    metrics: ChangeMetrics | None = None,
+) -> Callable[[AudioChunk], Observable[str]]:
+    """Wrap transcribe so windows with nothing new but quiet audio reuse the last text.
+
+    Each window is compared with the previous window seen (see appended_samples), and
+    only the new audio is checked, once. A window is skipped when all audio since the
+    last decode was quiet and that decode has produced its text. Skips and decodes are
+    counted in metrics. Calls must not overlap, as with exhaust_map_latest(transcribe).
+    """
+    opts = options or ChangeOptions()
+    previous: AudioChunk | None = None  # last window seen
+    changed = True  # whether audio since the last decode was anything but quiet
+    cached: str | None = None  # text of the last decode
+
+    def remember(text: str) -> None:
+        nonlocal cached
+        cached = text
+
+    def run(window: AudioChunk) -> Observable[str]:
+        nonlocal previous, changed, cached
+        n = appended_samples(window, previous)
+        previous = window
+        changed = changed or n is None or not is_quiet(window[len(window) - n :], vad_model, opts)
+        if not changed and cached is not None:
+            if metrics is not None:
+                metrics.record(skipped=True)
+            return rx.of(cached)
+        if metrics is not None:
+            metrics.record(skipped=False)
+        changed = False
+        cached = None
+        return transcribe(window).pipe(ops.do_action(on_next=remember))
+
+    return run
@@ -5,7 +5,10 @@ from dataclasses import dataclass, field
 from enum import IntEnum
 from pathlib import Path
 
-from audio.whisper import WhisperModel
+from audio.capture import CaptureOptions
+from audio.model_cache import DEFAULT_MEMORY_BUDGET
+from audio.speculative import CONFIRM_INTERVAL, DRAFT_INTERVAL
+from audio.whisper import DEFAULT_MAX_CONCURRENCY, WhisperModel
 
 
 class LogLevel(IntEnum):
@@ -36,6 +39,19 @@ class TunableVad:
     stop: float = 0.3
 
 
+@dataclass(frozen=True)
+class ChangeOptions:
+    """When new audio counts as unchanged, see audio.change.
+
+    Attributes:
+        max_rms: Highest RMS level of quiet audio, 0.01 is about -40 dBFS
+        max_probability: Highest VAD speech probability of any frame of quiet audio
+    """
+
+    max_rms: float = 0.01
+    max_probability: float = 0.3
+
+
 @dataclass(frozen=True)
 class TunableWhisperModel:
     """Whisper model selection."""
@@ -68,6 +84,26 @@ class AppConfig:
     # Credentials (future cloud fallback)
     api_key: str | None = None
 
+    # Transcription
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY  # simultaneous decodes per model
+    model_memory_budget: int = DEFAULT_MEMORY_BUDGET  # bytes of loaded models, see ModelCache
+
+    # recorder() decodes only the uncommitted tail of an utterance instead of whole windows,
+    # see audio.streaming. Change detection does not apply to it
+    streaming: bool = False
+
+    # Microphone capture, None for the per-block (non-ring) path. See audio.capture
+    capture: CaptureOptions | None = field(default_factory=CaptureOptions)
+
+    # Skip decodes of windows that only added quiet audio, None to decode every window.
+    # See audio.change
+    change_detection: ChangeOptions | None = field(default_factory=ChangeOptions)
+
+    # Speculative (dual-model) recorder, see audio.speculative
+    draft_model: WhisperModel = WhisperModel.TINY_EN
+    draft_emit_interval: int = DRAFT_INTERVAL  # samples between draft decodes
+    confirm_emit_interval: int = CONFIRM_INTERVAL  # multiple of draft, in whole chunks
+
     # Initial tunable defaults
     whisper_model: TunableWhisperModel = field(default_factory=lambda: WHISPER_SMALL_EN)
     vad_options: TunableVad = field(default_factory=lambda: VAD_SENTENCE)
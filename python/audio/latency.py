@@ -0,0 +1,156 @@
+"""Capture timestamps and mouth-to-text latency.
+
+audio_stream() stamps every block with the time its newest sample was captured, on the
+time.perf_counter() clock. rechunk/rechunk_ring and window_chunks carry the stamp over to
+the chunks and windows they emit, and vad_gate passes chunks through untouched. A
+transcript of a stamped window then knows how old its newest audio is:
+
+    window = windows[-1]
+    text = Transcript(transcribe(window), time.perf_counter() - captured_at(window))
+
+For the last window of an utterance this is the end-of-speech-to-text latency.
+
+Unstamped arrays (files, tests) flow through the same operators unchanged, and their
+captured_at() is None.
+"""
+
+import threading
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Any, Self
+
+import numpy as np
+
+from audio.types import AudioChunk
+
+SAMPLE_RATE = 16000
+
+# Histogram bucket upper bounds: 1ms to ~2 minutes in 10% steps
+_BOUNDS = tuple(0.001 * 1.1**i for i in range(123))
+
+
+class _Stamped(np.ndarray[Any, np.dtype[np.float32]]):
+    """ndarray carrying the capture time of its newest sample."""
+
+    captured_at: float | None = None
+
+    def __array_finalize__(self, obj: object) -> None:
+        self.captured_at = getattr(obj, "captured_at", None)
+
+
+def stamp(chunk: AudioChunk, captured: float | None) -> AudioChunk:
+    """Return chunk (as a view, no copy) stamped with the capture time of its last sample."""
+    if captured is None:
+        return chunk
+    view = chunk.view(_Stamped)
+    view.captured_at = captured
+    return view
+
+
+def captured_at(chunk: AudioChunk) -> float | None:
+    """Capture time of the newest sample in chunk, or None if it was never stamped."""
+    return getattr(chunk, "captured_at", None)
+
+
+def sample_age(n: int) -> float:
+    """Seconds spanned by n samples."""
+    return n / SAMPLE_RATE
+
+
+class Transcript(str):
+    """Transcribed text that also carries the age of its newest audio when it was emitted.
+
+    Compares equal to the plain text, so it can stand in for str anywhere.
+    """
+
+    latency: float | None
+
+    def __new__(cls, text: str, latency: float | None = None) -> Self:
+        transcript = super().__new__(cls, text)
+        transcript.latency = latency
+        return transcript
+
+
+@dataclass(frozen=True)
+class LatencySummary:
+    """Percentiles of a latency histogram, in seconds, accurate to one 10% bucket."""
+
+    count: int = 0
+    p50: float = 0.0
+    p95: float = 0.0
+    p99: float = 0.0
+
+
+class LatencyHistogram:
+    """Fixed log-bucket latency histogram, 1ms to ~2 minutes at 10% resolution.
+
+    Memory and record() cost are constant however many samples are recorded. Larger
+    values land in the last bucket.
+    """
+
+    def __init__(self) -> None:
+        self._counts = [0] * len(_BOUNDS)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def record(self, seconds: float) -> None:
+        i = min(bisect_left(_BOUNDS, seconds), len(_BOUNDS) - 1)
+        with self._lock:
+            self._counts[i] += 1
+            self._count += 1
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add the samples of other into this histogram."""
+        with other._lock:
+            counts = list(other._counts)
+        with self._lock:
+            self._counts = [a + b for a, b in zip(self._counts, counts, strict=True)]
+            self._count += sum(counts)
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th percentile (0-100), 0.0 if empty."""
+        with self._lock:
+            if not self._count:
+                return 0.0
+            rank = q / 100 * self._count
+            seen = 0
+            for bound, n in zip(_BOUNDS, self._counts, strict=True):
+                seen += n
+                if n and seen >= rank:
+                    return bound
+            return _BOUNDS[-1]
+
+    def summary(self) -> LatencySummary:
+        return LatencySummary(
+            len(self), self.percentile(50), self.percentile(95), self.percentile(99)
+        )
+
+
+class LatencyStats:
+    """End-of-speech-to-text latency histograms, keyed by session and model."""
+
+    def __init__(self) -> None:
+        self._histograms: dict[tuple[str, str], LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, session: str, model: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self._histograms.setdefault((session, model), LatencyHistogram())
+        histogram.record(seconds)
+
+    def by_session(self) -> dict[str, LatencySummary]:
+        return self._summaries(0)
+
+    def by_model(self) -> dict[str, LatencySummary]:
+        return self._summaries(1)
+
+    def _summaries(self, key: int) -> dict[str, LatencySummary]:
+        with self._lock:
+            items = list(self._histograms.items())
+        merged: dict[str, LatencyHistogram] = {}
+        for labels, histogram in items:
+            merged.setdefault(labels[key], LatencyHistogram()).merge(histogram)
+        return {label: histogram.summary() for label, histogram in merged.items()}
@@ -0,0 +1,209 @@
+"""Process-wide cache of loaded Whisper models.
+
+Loading a GGML model reads hundreds of MB from disk. The cache keeps contexts resident
+after their last user releases them, so switching back to a recently used model is
+instant, and sessions asking for the same model share one context.
+
+Example:
+    cache = shared_cache()
+    whisper = cache.acquire(model_path)
+    try:
+        whisper.transcribe(samples)
+    finally:
+        cache.release(whisper)
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field, replace
+from os import PathLike
+from pathlib import Path
+from typing import Self
+
+from audio._stt import Whisper
+from audio.whisper import DEFAULT_MAX_CONCURRENCY
+
+DEFAULT_MEMORY_BUDGET = 2 * 2**30  # 2 GiB of loaded models
+
+type ModelLoader = Callable[[Path, int], Whisper]
+
+
+def _load(path: Path, max_concurrency: int) -> Whisper:
+    return Whisper(str(path), max_concurrency)
+
+
+@dataclass(frozen=True)
+class ModelCacheStats:
+    """Counters for a ModelCache.
+
+    Attributes:
+        hits: Acquires served by an already loaded context
+        misses: Acquires that loaded a model from disk
+        evictions: Idle contexts closed to stay within the memory budget
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    def with_hit(self) -> Self:
+        return replace(self, hits=self.hits + 1)
+
+    def with_miss(self) -> Self:
+        return replace(self, misses=self.misses + 1)
+
+    def with_eviction(self) -> Self:
+        return replace(self, evictions=self.evictions + 1)
+
+
+@dataclass
+class _Entry:
+    refs: int = 1
+    size: int = 0
+    whisper: Whisper | None = None
+    error: Exception | None = None
+    ready: threading.Event = field(default_factory=threading.Event)
+
+
+class ModelCache:
+    """Reference-counted LRU cache of Whisper contexts keyed by model path.
+
+    acquire() loads a model on first use and counts references; release() drops one. A
+    model with no references stays loaded while all loaded models, in use or idle,
+    together fit in budget bytes; past that, the least recently used idle models are
+    closed until they fit again. Models in use are never evicted, so they alone may
+    exceed the budget. A model's size is estimated from its file size.
+
+    The max_concurrency of the first acquire applies to all users of that context.
+    """
+
+    def __init__(self, budget: int = DEFAULT_MEMORY_BUDGET, loader: ModelLoader = _load) -> None:
+        self._budget = budget
+        self._loader = loader
+        self._entries: OrderedDict[Path, _Entry] = OrderedDict()  # least recent first
+        self._lock = threading.Lock()
+        self._stats = ModelCacheStats()
+
+    @property
+    def budget(self) -> int:
+        return self._budget
+
+    @budget.setter
+    def budget(self, budget: int) -> None:
+        with self._lock:
+            self._budget = budget
+            evicted = self._evict()
+        _close_all(evicted)
+
+    @property
+    def stats(self) -> ModelCacheStats:
+        return self._stats
+
+    @property
+    def resident_bytes(self) -> int:
+        """Estimated memory of all loaded models, in use or idle."""
+        with self._lock:
+            return sum(e.size for e in self._entries.values())
+
+    def acquire(
+        self, model_path: str | PathLike[str], max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    ) -> Whisper:
+        """Return the loaded model at model_path, loading it if needed.
+
+        Concurrent acquires of a model that is still loading wait for that load.
+        """
+        key = Path(model_path).resolve()
+        with self._lock:
+            entry = self._entries.get(key)
+            load = entry is None
+            if entry is None:
+                entry = self._entries[key] = _Entry()
+                self._stats = self._stats.with_miss()
+            else:
+                entry.refs += 1
+                self._entries.move_to_end(key)
+                self._stats = self._stats.with_hit()
+
+        if load:
+            self._load_entry(key, entry, max_concurrency)
+        entry.ready.wait()
+
+        if entry.error is not None:
+            raise entry.error
+        assert entry.whisper is not None
+        return entry.whisper
+
+    def release(self, whisper: Whisper) -> None:
+        """Drop one reference to a model returned by acquire."""
+        with self._lock:
+            for entry in self._entries.values():
+                if entry.whisper is whisper:
+                    entry.refs -= 1
+                    break
+            evicted = self._evict()
+        _close_all(evicted)
+
+    def clear(self) -> None:
+        """Close every idle model."""
+        with self._lock:
+            budget, self._budget = self._budget, 0
+            evicted = self._evict()
+            self._budget = budget
+        _close_all(evicted)
+
+    def _load_entry(self, key: Path, entry: _Entry, max_concurrency: int) -> None:
+        try:
+            entry.size = os.path.getsize(key)
+            entry.whisper = self._loader(key, max_concurrency)
+        except Exception as e:
+            entry.error = e
+            with self._lock:
+                del self._entries[key]
+        finally:
+            entry.ready.set()
+        with self._lock:
+            evicted = self._evict()
+        _close_all(evicted)
+
+    def _evict(self) -> list[Whisper]:
+        """Drop least recently used idle models until resident memory fits the budget.
+
+        Returns the dropped models, for the caller to close once it has released the lock:
+        closing waits for decodes still running on a model.
+        """
+        idle = [(k, e) for k, e in self._entries.items() if e.refs == 0]
+        excess = sum(e.size for e in self._entries.values()) - self._budget
+        evicted: list[Whisper] = []
+        for key, entry in idle:
+            if excess <= 0:
+                break
+            del self._entries[key]
+            excess -= entry.size
+            if entry.whisper is not None:
+                evicted.append(entry.whisper)
+            self._stats = self._stats.with_eviction()
+        return evicted
+
+
+def _close_all(models: list[Whisper]) -> None:
+    for whisper in models:
+        whisper.close()
+
+
+_shared: ModelCache | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_cache(budget: int = DEFAULT_MEMORY_BUDGET) -> ModelCache:
+    """The process-wide model cache, created on first use with budget.
+
+    Later calls return the same cache and leave its budget alone, so sessions sharing it
+    can't override each other's; set ModelCache.budget to change it deliberately.
+    """
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = ModelCache(budget)
+        return _shared
@@ -4,8 +4,10 @@ import numpy as np
 import reactivex as rx
 from reactivex import Observable
 from reactivex import operators as ops
+from reactivex.abc import DisposableBase, ObserverBase, SchedulerBase
 from streams.utils import Operator
 
+from audio.latency import captured_at, sample_age, stamp
 from audio.types import AudioChunk, AudioStream
 
 
@@ -13,19 +15,24 @@ def rechunk(chunk_size: int = 512) -> Operator[AudioStream, AudioChunk]:
     """Accumulate audio into fixed-size chunks.
 
     Emits fixed-size chunks as they fill. On completion, emits any
-    remaining samples zero-padded to chunk_size.
+    remaining samples zero-padded to chunk_size. Capture timestamps of the input
+    (see audio.latency) are carried over to the chunks.
     """
     buffer = np.array([], dtype=np.float32)
+    captured: float | None = None  # capture time of the newest buffered sample
 
     def process(chunk: AudioChunk) -> Observable[AudioChunk]:
-        nonlocal buffer
+        nonlocal buffer, captured
         buffer = np.concatenate([buffer, chunk.flatten()])
+        captured = captured_at(chunk)
 
         def emit_chunks() -> Observable[AudioChunk]:
             nonlocal buffer
             if len(buffer) >= chunk_size:
                 out = buffer[:chunk_size]
                 buffer = buffer[chunk_size:]
+                if captured is not None:
+                    out = stamp(out, captured - sample_age(len(buffer)))
                 return rx.of(out).pipe(ops.concat(rx.defer(lambda _: emit_chunks())))
             return rx.empty()
 
@@ -38,7 +45,7 @@ def rechunk(chunk_size: int = 512) -> Operator[AudioStream, AudioChunk]:
             padded = np.zeros(chunk_size, dtype=np.float32)
             padded[: len(buffer)] = buffer
             buffer = np.array([], dtype=np.float32)
-            return rx.of(padded)
+            return rx.of(stamp(padded, captured))
         return rx.empty()
 
     def _operator(source: Observable[AudioChunk]) -> Observable[AudioChunk]:
@@ -49,3 +56,99 @@ def rechunk(chunk_size: int = 512) -> Operator[AudioStream, AudioChunk]:
         )
 
     return _operator
+
+
+class RingBuffer:
+    """Fixed-capacity float32 FIFO that is read in whole chunks.
+
+    Capacity is a multiple of chunk_size and reads always advance by chunk_size, so a
+    read never straddles the end of the buffer. Only writes wrap around.
+    """
+
+    def __init__(self, chunk_size: int, capacity_chunks: int = 16) -> None:
+        self._chunk_size = chunk_size
+        self._buf = np.zeros(chunk_size * capacity_chunks, dtype=np.float32)
+        self._read = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return len(self._buf)
+
+    def write(self, samples: AudioStream) -> int:
+        """Copy as many samples as fit into the buffer, return how many were written."""
+        n = min(len(samples), self.capacity - self._size)
+        start = (self._read + self._size) % self.capacity
+        head = min(n, self.capacity - start)
+        self._buf[start : start + head] = samples[:head]
+        self._buf[: n - head] = samples[head:n]
+        self._size += n
+        return n
+
+    def read(self) -> AudioChunk:
+        """Pop one chunk. Caller must check len(self) >= chunk_size first."""
+        out = self._buf[self._read : self._read + self._chunk_size].copy()
+        self._read = (self._read + self._chunk_size) % self.capacity
+        self._size -= self._chunk_size
+        return out
+
+    def flush(self) -> AudioChunk:
+        """Pop the remaining (< chunk_size) samples zero-padded to chunk_size."""
+        out = np.zeros(self._chunk_size, dtype=np.float32)
+        out[: self._size] = self._buf[self._read : self._read + self._size]
+        self._read = 0
+        self._size = 0
+        return out
+
+
+def rechunk_ring(
+    chunk_size: int = 512, capacity_chunks: int = 16
+) -> Operator[AudioStream, AudioChunk]:
+    """Accumulate audio into fixed-size chunks using a preallocated ring buffer.
+
+    Same output as rechunk(), but incoming blocks are copied into a fixed float32
+    buffer and every complete chunk is emitted in a plain loop. Blocks larger than the
+    ring are written in pieces, draining complete chunks between pieces. Capture
+    timestamps are carried over as in rechunk().
+    """
+
+    def _operator(source: Observable[AudioStream]) -> Observable[AudioChunk]:
+        def subscribe(
+            observer: ObserverBase[AudioChunk], scheduler: SchedulerBase | None = None
+        ) -> DisposableBase:
+            ring = RingBuffer(chunk_size, capacity_chunks)
+            captured: float | None = None  # capture time of the newest sample written
+
+            def on_next(block: AudioStream) -> None:
+                nonlocal captured
+                samples = block.reshape(-1)
+                captured = captured_at(block)
+                offset = 0
+                while offset < len(samples):
+                    offset += ring.write(samples[offset:])
+                    while len(ring) >= chunk_size:
+                        chunk = ring.read()
+                        if captured is not None:
+                            # samples newer than the chunk: the rest of the ring and block
+                            newer = len(ring) + len(samples) - offset
+                            chunk = stamp(chunk, captured - sample_age(newer))
+                        observer.on_next(chunk)
+
+            def on_completed() -> None:
+                if len(ring) > 0:
+                    observer.on_next(stamp(ring.flush(), captured))
+                observer.on_completed()
+
+            return source.subscribe(
+                on_next=on_next,
+                on_error=observer.on_error,
+                on_completed=on_completed,
+                scheduler=scheduler,
+            )
+
+        return rx.create(subscribe)
+
+    return _operator
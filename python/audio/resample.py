@@ -0,0 +1,158 @@
+"""Streaming polyphase resampling operator for RxPy streams."""
+
+from math import ceil, gcd
+
+import numpy as np
+import reactivex as rx
+from numpy.lib.stride_tricks import sliding_window_view
+from reactivex import Observable
+from reactivex.abc import DisposableBase, ObserverBase, SchedulerBase
+from streams.utils import Operator
+
+from audio.latency import SAMPLE_RATE, captured_at, stamp
+from audio.types import AudioChunk, AudioStream
+
+ZERO_CROSSINGS = 16  # per side of the windowed sinc, longer is sharper and slower
+ROLLOFF = 0.9  # passband edge as a fraction of the output Nyquist frequency
+KAISER_BETA = 8.0  # about 80 dB stopband attenuation
+STRIDED_MAX_PHASES = 8  # up to this many phases, outputs are computed phase by phase
+
+
+def design_filter(
+    up: int, down: int, zero_crossings: int = ZERO_CROSSINGS, rolloff: float = ROLLOFF
+) -> AudioChunk:
+    """Kaiser-windowed sinc lowpass at up times the input rate, with a gain of up.
+
+    The cutoff is rolloff times the lower of the input and output Nyquist frequencies.
+    """
+    spacing = ceil(max(up, down) / rolloff)  # samples between zero crossings
+    n = 2 * zero_crossings * spacing + 1
+    t = np.arange(n) - (n - 1) / 2
+    h = np.sinc(t / (max(up, down) / rolloff)) * np.kaiser(n, KAISER_BETA)
+    taps: AudioChunk = (h * up / h.sum()).astype(np.float32)
+    return taps
+
+
+class PolyphaseResampler:
+    """Resample by a rational factor block by block, carrying filter state across blocks.
+
+    The prototype filter is split into up phases of taps each. Output m sits at position
+    m * down on the upsampled grid and is the dot product of one phase with the taps most
+    recent input samples, so no zeros are ever inserted or computed.
+
+    Outputs are computed over a sliding window view of the history plus the block. Every
+    up-th output uses the same phase and steps down inputs further, so with few phases
+    (e.g. 48kHz, a single one) each phase is a strided view times a vector, copying
+    nothing. With many (44.1kHz has 160), all windows of a block are gathered at once.
+
+    The filter's delay is compensated: output m lines up with input m * down / up, and
+    flush() emits the outputs still held back by the delay.
+    """
+
+    def __init__(
+        self,
+        from_rate: int,
+        to_rate: int = SAMPLE_RATE,
+        zero_crossings: int = ZERO_CROSSINGS,
+        rolloff: float = ROLLOFF,
+    ) -> None:
+        g = gcd(from_rate, to_rate)
+        self.up, self.down = to_rate // g, from_rate // g
+        self.from_rate = from_rate
+        h = design_filter(self.up, self.down, zero_crossings, rolloff)
+        self.taps = ceil(len(h) / self.up)
+        padded = np.zeros(self.up * self.taps, dtype=np.float32)
+        padded[: len(h)] = h
+        # phases[p, k] weighs input n - (taps - 1) + k for an output at n * up + p
+        self._phases = np.ascontiguousarray(padded.reshape(self.taps, self.up).T[:, ::-1])
+        self._delay = (len(h) - 1) // 2  # upsampled samples
+        self._history = np.zeros(self.taps - 1, dtype=np.float32)
+        self._inputs = 0  # input samples received
+        self._outputs = 0  # output samples emitted
+        self._next = self._delay  # upsampled position of the next output
+
+    def process(self, block: AudioStream) -> AudioChunk:
+        """Resample the next block of input, return the outputs it completes."""
+        samples = block.reshape(-1)
+        buf = np.concatenate([self._history, samples])
+        base = self._inputs - len(self._history)  # input index of buf[0]
+        self._inputs += len(samples)
+        # Outputs whose newest input sample has arrived
+        count = max(0, (self.up * self._inputs - 1 - self._next) // self.down + 1)
+        windows = sliding_window_view(buf, self.taps)  # windows[i] ends at buf[i + taps - 1]
+        if self.up <= STRIDED_MAX_PHASES:
+            out = np.empty(count, dtype=np.float32)
+            for r in range(min(self.up, count)):
+                position = self._next + self.down * r
+                first = position // self.up - base - (self.taps - 1)
+                n = len(out[r :: self.up])
+                step = windows[first : first + self.down * (n - 1) + 1 : self.down]
+                out[r :: self.up] = step @ self._phases[position % self.up]
+        else:
+            positions = self._next + self.down * np.arange(count)
+            starts = positions // self.up - base - (self.taps - 1)
+            out = np.einsum("mk,mk->m", self._phases[positions % self.up], windows[starts])
+        self._next += self.down * count
+        self._outputs += count
+        self._history = buf[len(buf) - (self.taps - 1) :].copy()
+        return out
+
+    def flush(self) -> AudioChunk:
+        """Emit the outputs held back by the filter delay, as if the input ended in silence."""
+        expected = ceil(self._inputs * self.up / self.down)
+        pad = np.zeros(ceil(self._delay / self.up) + 1, dtype=np.float32)
+        remaining = expected - self._outputs
+        return self.process(pad)[: max(0, remaining)]
+
+    def lag(self) -> float:
+        """Seconds from the newest output emitted so far to the newest input received."""
+        last = self._next - self.down - self._delay  # newest output, on the upsampled grid
+        return (self._inputs - 1 - last / self.up) / self.from_rate
+
+
+def resample(
+    from_rate: int,
+    to_rate: int = SAMPLE_RATE,
+    zero_crossings: int = ZERO_CROSSINGS,
+    rolloff: float = ROLLOFF,
+) -> Operator[AudioStream, AudioChunk]:
+    """Resample a stream of blocks from from_rate to to_rate (see PolyphaseResampler).
+
+    Each block is emitted as one resampled block, and the filter's tail on completion.
+    Blocks that complete no output are swallowed. Capture timestamps are carried over to
+    the newest output of each block. Returns a pass-through when the rates are equal.
+    """
+    if from_rate == to_rate:
+        return lambda source: source
+
+    def _operator(source: Observable[AudioStream]) -> Observable[AudioChunk]:
+        def subscribe(
+            observer: ObserverBase[AudioChunk], scheduler: SchedulerBase | None = None
+        ) -> DisposableBase:
+            resampler = PolyphaseResampler(from_rate, to_rate, zero_crossings, rolloff)
+            captured: float | None = None
+
+            def on_next(block: AudioStream) -> None:
+                nonlocal captured
+                captured = captured_at(block)
+                out = resampler.process(block)
+                if len(out):
+                    lag = resampler.lag()
+                    observer.on_next(stamp(out, None if captured is None else captured - lag))
+
+            def on_completed() -> None:
+                out = resampler.flush()
+                if len(out):
+                    observer.on_next(stamp(out, captured))
+                observer.on_completed()
+
+            return source.subscribe(
+                on_next=on_next,
+                on_error=observer.on_error,
+                on_completed=on_completed,
+                scheduler=scheduler,
+            )
+
+        return rx.create(subscribe)
+
+    return _operator
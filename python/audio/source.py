@@ -1,13 +1,25 @@
-from dataclasses import dataclass
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any
 
 import reactivex as rx
 import sounddevice as sd  # type: ignore[import-untyped]
 from reactivex import Observable
+from reactivex import operators as ops
 from reactivex.abc import DisposableBase, ObserverBase, SchedulerBase
-from reactivex.disposable import Disposable
+from reactivex.disposable import CompositeDisposable, Disposable
 from reactivex.scheduler import NewThreadScheduler
 
-from audio.stream import ops
+from audio.capture import (
+    CaptureMetrics,
+    CaptureOptions,
+    CaptureRing,
+    drain_ring,
+    ring_capacity,
+)
+from audio.latency import SAMPLE_RATE, stamp
+from audio.resample import resample
 from audio.types import AudioStream, DeviceMeta
 
 
@@ -22,18 +34,133 @@ class AudioSource:
     device_name: str
     meta: DeviceMeta
     stream: Observable[AudioStream]
+    capture: CaptureMetrics = field(default_factory=CaptureMetrics)  # ring capture only
 
 
-def audio_stream(device: int | None = None) -> AudioSource:
+def captured_time(frames: int, time_info: Any, samplerate: int = SAMPLE_RATE) -> float:
+    """perf_counter() time the newest sample of a callback's block was captured."""
+    # inputBufferAdcTime is when the first sample was, in the stream's own clock (0 if the
+    # host API doesn't report it), so shift by its age relative to the stream's current time.
+    now = time.perf_counter()
+    adc = time_info.inputBufferAdcTime
+    age = time_info.currentTime - adc - frames / samplerate if adc else 0.0
+    return now - max(0.0, age)
+
+
+def ring_stream(
+    device: int | None = None,
+    options: CaptureOptions | None = None,
+    metrics: CaptureMetrics | None = None,
+    samplerate: int = SAMPLE_RATE,
+    until: Observable[Any] | None = None,
+) -> Observable[AudioStream]:
+    """Capture a device through a CaptureRing, emitting drained batches on the drain thread.
+
+    Batches are at samplerate, see resample() to convert them. Every subscription opens its
+    own stream and ring, counted in metrics if given.
+
+    When until emits or completes, capture stops: the stream is stopped, the audio written
+    since the last batch is emitted, then the observable completes. Disposing instead
+    stops at once, without that last batch (up to drain_interval of audio).
+    """
+    options = options or CaptureOptions()
+    metrics = metrics or CaptureMetrics()
+
+    def subscribe(
+        obs: ObserverBase[AudioStream], scheduler: SchedulerBase | None = None
+    ) -> DisposableBase:
+        ring = CaptureRing(ring_capacity(options, samplerate), samplerate)
+        metrics.track(ring)
+        lock = threading.Lock()
+        stopped = False
+
+        def callback(data: AudioStream, frames: int, time_info: Any, status: Any) -> None:
+            # Real-time thread: copy into the ring and return, no allocation or locking
+            captured = captured_time(frames, time_info, samplerate)
+            ring.write(data, captured, status.input_overflow)
+
+        stream = sd.InputStream(
+            device=device,
+            callback=callback,
+            channels=1,
+            samplerate=samplerate,
+            blocksize=options.blocksize,
+            latency=options.latency,
+        )
+        drained = drain_ring(ring, options.drain_interval).subscribe(obs)
+        stream.start()
+
+        def stop() -> bool:
+            """Stop capture and the drain thread, False if already stopped."""
+            nonlocal stopped
+            with lock:
+                if stopped:
+                    return False
+                stopped = True
+            stream.stop()
+            drained.dispose()  # the drain thread has exited, this is the only reader
+            return True
+
+        def finish(_: object = None) -> None:
+            if not stop():
+                return
+            batch = ring.drain()
+            stream.close()
+            metrics.retire(ring)
+            if batch is not None:
+                obs.on_next(batch)
+            obs.on_completed()
+
+        def dispose() -> None:
+            if stop():
+                stream.close()
+                metrics.retire(ring)
+
+        if until is None:
+            return Disposable(dispose)
+        stopping = until.subscribe(
+            on_next=finish, on_error=obs.on_error, on_completed=finish, scheduler=scheduler
+        )
+        return CompositeDisposable(stopping, Disposable(dispose))
+
+    return rx.create(subscribe)
+
+
+def audio_stream(
+    device: int | None = None,
+    capture: CaptureOptions | None = None,
+    until: Observable[Any] | None = None,
+) -> AudioSource:
+    """Open an input device as an AudioSource, stamping audio with its capture time.
+
+    The device is opened at its default sample rate and resampled to 16kHz here, so
+    devices that only run at 44.1/48kHz work, with a resampler of known quality.
+
+    With capture options, the callback writes into a lock-free ring drained in batches
+    (see audio.capture), and the source's capture metrics count overflows and drops.
+    Capture then ends when until emits, after the last audio (see ring_stream). Without,
+    every block is copied and emitted through observe_on, up to until.
+    """
+    meta = query_input_device(device)
+    rate = int(meta["default_samplerate"])
+    if capture is not None:
+        metrics = CaptureMetrics()
+        return AudioSource(
+            device_id=meta["index"],
+            device_name=meta["name"],
+            meta=meta,
+            stream=ring_stream(device, capture, metrics, rate, until).pipe(resample(rate)),
+            capture=metrics,
+        )
+
     def subscribe(
         obs: ObserverBase[AudioStream], _sched: SchedulerBase | None = None
     ) -> DisposableBase:
-        def callback(data: AudioStream, _fr: int, _time: object, _status: object) -> None:
-            obs.on_next(data.copy())
+        def callback(data: AudioStream, frames: int, time_info: Any, _status: object) -> None:
+            # Stamp the block with when its newest sample was captured
+            obs.on_next(stamp(data.copy(), captured_time(frames, time_info, rate)))
 
-        # NOTE - might need to implement resample to 16Khz, (default is usually 44.1khz or 48khz).
-        #        sd resamples if device supports it. Supposedly most modern devices support
-        stream = sd.InputStream(device=device, callback=callback, channels=1, samplerate=16000)
+        stream = sd.InputStream(device=device, callback=callback, channels=1, samplerate=rate)
         stream.start()
 
         def dispose() -> None:
@@ -43,8 +170,9 @@ def audio_stream(device: int | None = None) -> AudioSource:
         return Disposable(dispose)
 
     # callback runs on system audio thread, observe_on switches to new thread for downstream
-    observable = rx.create(subscribe).pipe(ops.observe_on(NewThreadScheduler()))
-    meta = query_input_device(device)
+    observable = rx.create(subscribe).pipe(ops.observe_on(NewThreadScheduler()), resample(rate))
+    if until is not None:
+        observable = observable.pipe(ops.take_until(until))
     return AudioSource(
         device_id=meta["index"],
         device_name=meta["name"],
@@ -0,0 +1,157 @@
+"""Speculative transcription with a fast draft model and a heavy confirming model.
+
+See docs/dual-model-stt.md. The gated audio is shared between two branches. The draft
+branch transcribes a window every draft_interval samples with a small model, the confirm
+branch every confirm_interval samples with a larger one. Their results are merged into
+one stream of events, so text shows up at the draft model's latency and is corrected to
+the heavy model's accuracy.
+
+Windows carry monotonic IDs counted in draft intervals over the stream's lifetime (see
+WindowIds). Rounded up to whole chunks as window_chunks does, the confirm interval is a
+multiple of the draft interval, so confirm windows line up with draft windows:
+
+    draft:   0  1  2  3  4  5  6  7 ...
+    confirm:          3           7 ...  (confirm_interval = 4 * draft_interval)
+
+A confirmed event corrects every window since the previous confirmation. IDs are taken
+before transcribing, so windows skipped while a model was busy show up as gaps.
+
+Example:
+    mic.pipe(
+        rechunk_ring(512),
+        vad_gate(vad, options),
+        speculative_transcribe(tiny, small),
+        ops.repeat(),
+    ).subscribe(on_next=lambda e: print(e.confidence, e.text))
+"""
+
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Literal
+
+import reactivex as rx
+from reactivex import Observable
+from reactivex import operators as ops
+from streams import exhaust_map_latest
+from streams.utils import Operator
+
+from audio.latency import captured_at
+from audio.types import AudioChunk
+from audio.whisper import CHUNK_SIZE, Transcriber
+from audio.window import window_chunks
+
+DRAFT_INTERVAL = 4000  # 0.25s
+CONFIRM_INTERVAL = 16000  # 1s
+
+type Confidence = Literal["draft", "confirmed"]
+
+
+@dataclass(frozen=True)
+class TranscriptEvent:
+    """Transcript of the utterance so far, from one of the two models.
+
+    Attributes:
+        text: Text of the whole window, i.e. the utterance up to window_id
+        confidence: "draft" from the fast model, "confirmed" from the heavy model
+        window_id: Monotonic ID of the transcribed window
+        corrects_window_ids: Windows this event replaces. A draft replaces only itself,
+            a confirmation every window since the previous confirmation
+        latency: Age of the window's newest audio when the event was emitted, if stamped
+    """
+
+    text: str
+    confidence: Confidence
+    window_id: int
+    corrects_window_ids: tuple[int, ...]
+    latency: float | None = None
+
+
+class WindowIds:
+    """Window numbering shared by both branches, and across pipelines of one stream.
+
+    Pass the same instance to successive speculative_transcribe() pipelines (e.g. when
+    the confirming model is switched) to keep IDs increasing.
+    """
+
+    def __init__(self) -> None:
+        self.chunks = 0  # chunks seen over the stream's lifetime
+        self.confirmed = -1  # latest confirmed window ID
+        self.lock = threading.Lock()
+
+    def count(self, _: AudioChunk) -> None:
+        self.chunks += 1
+
+    def window_id(self, id_chunks: int) -> int:
+        """ID of a window ending at the latest chunk. A partial interval gets the next ID."""
+        return -(-self.chunks // id_chunks) - 1
+
+
+def speculative_transcribe(
+    draft: Transcriber,
+    confirm: Transcriber,
+    draft_interval: int = DRAFT_INTERVAL,
+    confirm_interval: int = CONFIRM_INTERVAL,
+    ids: WindowIds | None = None,
+) -> Operator[AudioChunk, TranscriptEvent]:
+    """Transcribe gated audio with both models and merge the results.
+
+    Both intervals are rounded up to whole chunks of CHUNK_SIZE, as window_chunks emits on
+    chunk boundaries, and the confirm chunks must be a multiple of the draft chunks (700 and
+    1400 samples round to 2 and 3 chunks, and fail). Each branch decodes one window at a
+    time and only keeps its newest waiting window (exhaust_map_latest), so the heavy model
+    never holds back drafts. Drafts older than the latest confirmation are dropped.
+    Completes when both branches have finished the utterance.
+    """
+    # window_chunks rounds intervals up to whole chunks, and window IDs count draft chunks
+    id_chunks = -(-draft_interval // CHUNK_SIZE)
+    confirm_chunks = -(-confirm_interval // CHUNK_SIZE)
+    if confirm_chunks % id_chunks:
+        raise ValueError(
+            f"confirm_interval ({confirm_chunks} chunks) must be a multiple of "
+            f"draft_interval ({id_chunks} chunks) in whole chunks of {CHUNK_SIZE} samples"
+        )
+    state = ids or WindowIds()
+
+    def transcribe(
+        transcriber: Transcriber, confidence: Confidence, emit_interval: int
+    ) -> Operator[AudioChunk, TranscriptEvent]:
+        def run(numbered: tuple[int, AudioChunk]) -> Observable[TranscriptEvent]:
+            window_id, window = numbered
+            captured = captured_at(window)
+
+            def event(text: str) -> TranscriptEvent:
+                latency = None if captured is None else time.perf_counter() - captured
+                return TranscriptEvent(text, confidence, window_id, (window_id,), latency)
+
+            return transcriber.transcribe(window).pipe(ops.map(event))
+
+        def numbered(window: AudioChunk) -> tuple[int, AudioChunk]:
+            # window_chunks emits inside on_next of the chunk completing the window, so
+            # the ID is taken before the (possibly skipped) transcription starts
+            return state.window_id(id_chunks), window
+
+        return lambda source: source.pipe(
+            window_chunks(CHUNK_SIZE, emit_interval=emit_interval),
+            ops.map(numbered),
+            exhaust_map_latest(run),
+        )
+
+    def merge(event: TranscriptEvent) -> Observable[TranscriptEvent]:
+        with state.lock:
+            if event.window_id <= state.confirmed:
+                return rx.empty()  # superseded by a confirmation
+            if event.confidence == "confirmed":
+                corrects = tuple(range(state.confirmed + 1, event.window_id + 1))
+                state.confirmed = event.window_id
+                return rx.of(replace(event, corrects_window_ids=corrects))
+            return rx.of(event)
+
+    def _operator(source: Observable[AudioChunk]) -> Observable[TranscriptEvent]:
+        # Counted once before the fork, so both branches read the same chunk count
+        shared = source.pipe(ops.do_action(on_next=state.count), ops.share())
+        drafts = shared.pipe(transcribe(draft, "draft", draft_interval))
+        confirms = shared.pipe(transcribe(confirm, "confirmed", confirm_interval))
+        return rx.merge(drafts, confirms).pipe(ops.concat_map(merge))
+
+    return _operator
@@ -21,12 +21,15 @@ from reactivex.abc import DisposableBase, ObserverBase, SchedulerBase
 from reactivex.disposable import Disposable
 from reactivex.observable import Observable
 from reactivex.scheduler import NewThreadScheduler
-from streams import from_async
+from streams import from_async, from_iterator
 from yt_dlp import YoutubeDL
 from yt_dlp.utils import YoutubeDLError
 
 from audio._stt import AudioChunks
+from audio.capture import CaptureOptions
 from audio.exceptions import AudioExtractionError
+from audio.resample import resample
+from audio.source import query_input_device, ring_stream
 
 if TYPE_CHECKING:
     from yt_dlp import _Params
@@ -42,25 +45,27 @@ def safe_cleanup(tmpdir: tempfile.TemporaryDirectory) -> Callable:
     return do_cleanup
 
 
+def _fetch(url: str, format: str, tmpdir: tempfile.TemporaryDirectory) -> Path:
+    """Download url with yt-dlp into tmpdir and extract its audio, return the file path."""
+    opts: _Params = {
+        "format": "bestaudio/best",
+        "postprocessors": [{"key": "FFmpegExtractAudio", "preferredcodec": format}],
+        "outtmpl": str(Path(tmpdir.name) / "%(id)s"),
+        "quiet": True,
+    }
+    try:
+        with YoutubeDL(opts) as ydl:
+            info = ydl.extract_info(url, download=True)
+            return Path(tmpdir.name) / f"{info['id']}.{format}"
+    except YoutubeDLError as e:
+        raise AudioExtractionError(str(e)) from e
+
+
 def download_audio(url: str, format: str = "mp3") -> Observable[tuple[str, list[bytes]]]:
     def create_source(_scheduler: SchedulerBase | None) -> Observable[tuple[str, list[bytes]]]:
         tmpdir = tempfile.TemporaryDirectory()
 
-        def fetch() -> Path:
-            opts: _Params = {
-                "format": "bestaudio/best",
-                "postprocessors": [{"key": "FFmpegExtractAudio", "preferredcodec": format}],
-                "outtmpl": str(Path(tmpdir.name) / "%(id)s"),
-                "quiet": True,
-            }
-            try:
-                with YoutubeDL(opts) as ydl:
-                    info = ydl.extract_info(url, download=True)
-                    return Path(tmpdir.name) / f"{info['id']}.{format}"
-            except YoutubeDLError as e:
-                raise AudioExtractionError(str(e)) from e
-
-        return from_async(lambda: asyncio.to_thread(fetch)).pipe(
+        return from_async(lambda: asyncio.to_thread(_fetch, url, format, tmpdir)).pipe(
             ops.map(lambda path: (format, list(AudioChunks(str(path), 30_000)))),
             ops.finally_action(safe_cleanup(tmpdir)),
         )
@@ -68,8 +73,41 @@ def download_audio(url: str, format: str = "mp3") -> Observable[tuple[str, list[
     return rx.defer(create_source)
 
 
-def listen_to_mic(device: int | None = None) -> Observable[AudioStream]:
-    """Create an observable that emits audio samples from a microphone."""
+def stream_audio(
+    url: str, format: str = "mp3", chunk_duration_ms: int = 30_000, prefetch: int = 2
+) -> Observable[bytes]:
+    """Download audio and emit its chunks one at a time as they are read.
+
+    Unlike download_audio, chunks are not collected into a list. At most prefetch chunks
+    are read ahead of the subscriber, and disposing closes the native iterator and
+    removes the download.
+    """
+
+    def create_source(_scheduler: SchedulerBase | None) -> Observable[bytes]:
+        tmpdir = tempfile.TemporaryDirectory()
+
+        def chunks(path: Path) -> Observable[bytes]:
+            return from_iterator(lambda: AudioChunks(str(path), chunk_duration_ms), prefetch)
+
+        return from_async(lambda: asyncio.to_thread(_fetch, url, format, tmpdir)).pipe(
+            ops.flat_map(chunks),
+            ops.finally_action(safe_cleanup(tmpdir)),
+        )
+
+    return rx.defer(create_source)
+
+
+def listen_to_mic(
+    device: int | None = None, capture: CaptureOptions | None = None
+) -> Observable[AudioStream]:
+    """Create an observable that emits 16kHz audio samples from a microphone.
+
+    The device runs at its default sample rate, resampled to 16kHz. With capture options,
+    audio goes through a lock-free ring (see audio.capture).
+    """
+    rate = int(query_input_device(device)["default_samplerate"])
+    if capture is not None:
+        return ring_stream(device, capture, samplerate=rate).pipe(resample(rate))
 
     def subscribe(
         obs: ObserverBase[AudioStream],
@@ -78,9 +116,7 @@ def listen_to_mic(device: int | None = None) -> Observable[AudioStream]:
         def callback(data: AudioStream, _fr: int, _time: object, _status: object) -> None:
             obs.on_next(data.copy())
 
-        # NOTE - might need to implement resample to 16Khz, (default is usually 44.1khz or 48khz).
-        #        sd resamples if device supports it. Supposedly most modern devices support
-        stream = sd.InputStream(device=device, callback=callback, channels=1, samplerate=16000)
+        stream = sd.InputStream(device=device, callback=callback, channels=1, samplerate=rate)
         stream.start()
 
         def dispose() -> None:
@@ -90,4 +126,4 @@ def listen_to_mic(device: int | None = None) -> Observable[AudioStream]:
         return Disposable(dispose)
 
     # callback runs on system audio thread, observe_on switches to new thread for downstream
-    return rx.create(subscribe).pipe(ops.observe_on(NewThreadScheduler()))
+    return rx.create(subscribe).pipe(ops.observe_on(NewThreadScheduler()), resample(rate))
@@ -0,0 +1,213 @@
+"""Incremental streaming transcription with a committed prefix.
+
+Instead of re-transcribing the whole utterance on every emit, only the uncommitted tail of
+the audio is decoded. Words that two consecutive hypotheses agree on (local agreement) are
+committed, their audio is trimmed off the window, and the committed text is passed to the
+next decode as its initial prompt. Decode cost per emit is bounded by the uncommitted
+tail, and utterances of any length are transcribed without loss.
+
+Example:
+    mic.pipe(
+        rechunk_ring(512),
+        vad_gate(model, options),
+        streaming_transcribe(transcriber),
+    ).subscribe(on_next=lambda u: print(u.committed, end=" "))
+"""
+
+import re
+import threading
+from dataclasses import dataclass
+
+import reactivex as rx
+from reactivex import Observable
+from reactivex.abc import DisposableBase, ObserverBase, SchedulerBase
+from reactivex.disposable import CompositeDisposable, SerialDisposable
+from streams.utils import Operator
+
+from audio.types import AudioChunk
+from audio.whisper import SAMPLES_PER_CENTISECOND, Segment, Transcriber
+from audio.window import WINDOW_SIZE, WindowBuffer
+
+EMIT_INTERVAL = 8000  # 0.5s
+PROMPT_CHARS = 200  # committed text passed back as initial prompt
+
+_NORMALIZE = re.compile(r"[^\w']+")
+
+
+@dataclass(frozen=True)
+class StreamingUpdate:
+    """One step of a streaming transcript.
+
+    Attributes:
+        committed: Text committed by this update. Committed text is never revised.
+        tentative: Current hypothesis for the uncommitted audio, may change next update.
+        dropped: Samples discarded untranscribed since the previous update, because the
+            window overflowed without words to commit (e.g. decodes found none).
+    """
+
+    committed: str
+    tentative: str
+    dropped: int = 0
+
+
+@dataclass(frozen=True)
+class Word:
+    """A decoded word with absolute start/end sample positions in the stream."""
+
+    start: int
+    end: int
+    text: str
+
+    @property
+    def key(self) -> str:
+        return _NORMALIZE.sub("", self.text.lower())
+
+
+def to_words(segments: list[Segment], offset: int) -> list[Word]:
+    """Convert word segments relative to a window starting at sample offset."""
+    return [
+        Word(offset + s.t0 * SAMPLES_PER_CENTISECOND, offset + s.t1 * SAMPLES_PER_CENTISECOND, t)
+        for s in segments
+        if (t := s.text.strip())
+    ]
+
+
+def local_agreement(previous: list[Word], current: list[Word]) -> int:
+    """Length of the common prefix of two hypotheses, compared by normalized text."""
+    n = 0
+    for prev, cur in zip(previous, current, strict=False):
+        if prev.key != cur.key:
+            break
+        n += 1
+    return n
+
+
+def _join(words: list[Word]) -> str:
+    return " ".join(w.text for w in words)
+
+
+def streaming_transcribe(
+    transcriber: Transcriber,
+    window_size: int = WINDOW_SIZE,
+    emit_interval: int = EMIT_INTERVAL,
+) -> Operator[AudioChunk, StreamingUpdate]:
+    """Transcribe a chunk stream incrementally, committing text by local agreement.
+
+    Every emit_interval samples the uncommitted audio is decoded, unless a decode is still
+    running, in which case the next one starts as soon as it finishes. On completion the
+    remaining audio is decoded once more and everything is committed.
+
+    If the uncommitted audio is about to exceed window_size (decodes keep disagreeing),
+    all but the last word of the latest hypothesis is committed to make room, or the whole
+    hypothesis if that is not enough. Audio the hypothesis does not cover is then dropped
+    and reported in the update's dropped count.
+    """
+
+    def _operator(source: Observable[AudioChunk]) -> Observable[StreamingUpdate]:
+        def subscribe(
+            observer: ObserverBase[StreamingUpdate], scheduler: SchedulerBase | None = None
+        ) -> DisposableBase:
+            lock = threading.RLock()
+            window = WindowBuffer(window_size)
+            decode = SerialDisposable()
+            offset = 0  # absolute sample index of the window start
+            pending = 0  # samples appended since the last decode started
+            committed = ""
+            hypothesis: list[Word] = []
+            busy = False
+            source_done = False
+
+            def commit(words: list[Word]) -> str:
+                nonlocal committed, offset
+                if not words:
+                    return ""
+                text = _join(words)
+                committed = f"{committed} {text}".strip()
+                trim = min(max(0, words[-1].end - offset), len(window))
+                window.trim(trim)
+                offset += trim
+                return text
+
+            def start_decode(final: bool) -> None:
+                nonlocal busy, pending
+                if final and pending == 0:
+                    finish()  # the latest hypothesis already covers all audio
+                    return
+                busy = True
+                pending = 0
+                start = offset
+                prompt = committed[-PROMPT_CHARS:] or None
+                result = transcriber.transcribe_segments(
+                    window.samples(), prompt, word_timestamps=True
+                )
+                decode.disposable = result.subscribe(
+                    on_next=lambda segments: on_result(to_words(segments, start), final),
+                    on_error=observer.on_error,
+                    scheduler=scheduler,
+                )
+
+            def finish() -> None:
+                nonlocal hypothesis
+                text = commit(hypothesis)
+                hypothesis = []
+                if text:
+                    observer.on_next(StreamingUpdate(text, ""))
+                observer.on_completed()
+
+            def on_result(words: list[Word], final: bool) -> None:
+                nonlocal hypothesis, busy
+                with lock:
+                    busy = False
+                    words = [w for w in words if w.end > offset]
+                    if final:
+                        hypothesis = words
+                        finish()
+                        return
+                    agreed = local_agreement(hypothesis, words)
+                    text = commit(words[:agreed])
+                    hypothesis = words[agreed:]
+                    observer.on_next(StreamingUpdate(text, _join(hypothesis)))
+                    if source_done:
+                        start_decode(final=True)
+                    elif pending >= emit_interval:
+                        start_decode(final=False)
+
+            def on_next(chunk: AudioChunk) -> None:
+                nonlocal hypothesis, offset, pending
+                with lock:
+                    n = chunk.size
+                    overflow = len(window) + n - window_size
+                    if overflow > 0:
+                        words = hypothesis[:-1]
+                        if not words or words[-1].end - offset < overflow:
+                            words = hypothesis  # keeping the last word leaves no room
+                        text = commit(words)
+                        hypothesis = hypothesis[len(words) :]
+                        # anything still over capacity is dropped by the window
+                        dropped = max(0, len(window) + n - window_size)
+                        offset += dropped
+                        if text or dropped:
+                            observer.on_next(StreamingUpdate(text, _join(hypothesis), dropped))
+                    window.append(chunk)
+                    pending += n
+                    if pending >= emit_interval and not busy:
+                        start_decode(final=False)
+
+            def on_completed() -> None:
+                nonlocal source_done
+                with lock:
+                    source_done = True
+                    if not busy:
+                        start_decode(final=True)
+
+            subscription = source.subscribe(
+                on_next=on_next,
+                on_error=observer.on_error,
+                on_completed=on_completed,
+                scheduler=scheduler,
+            )
+            return CompositeDisposable(subscription, decode)
+
+        return rx.create(subscribe)
+
+    return _operator
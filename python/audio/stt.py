@@ -3,33 +3,228 @@
 # WhisperModel - Tunable
 # Device (ie int or str) - Tunable
 
+import threading
+import time
 from collections.abc import Callable
 from concurrent.futures import Executor
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from functools import partial
+from typing import Self
 
 import reactivex as rx
 import reactivex.operators as ops
 from reactivex import Observable
-from streams import filter_instance_start_with
+from reactivex.abc import SchedulerBase
+from reactivex.subject import Subject
+from streams import (
+    Metrics,
+    RoundRobinPool,
+    count_dropped,
+    exhaust_map_latest,
+    filter_instance_start_with,
+    instrument,
+    instrument_inner,
+    preload_resource,
+)
 from streams.switch_resource import switch_resource
 from streams.utils import Operator
 
+from audio.change import ChangeMetrics, skip_unchanged
 from audio.config import AppConfig, Tunable, TunableWhisperModel
-from audio.rechunk import rechunk
+from audio.latency import LatencyStats, Transcript, captured_at
+from audio.model_cache import ModelCache, shared_cache
+from audio.rechunk import rechunk_ring
 from audio.silero import SileroVADModel
 from audio.source import AudioSource, audio_stream
-from audio.types import AudioStream
+from audio.speculative import TranscriptEvent, WindowIds, speculative_transcribe
+from audio.streaming import StreamingUpdate, streaming_transcribe
+from audio.types import AudioChunk
 from audio.vad import VADModel, vad_gate
-from audio.whisper import SAMPLE_RATE, Transcriber
+from audio.whisper import SAMPLE_RATE, Transcriber, WhisperModel
 from audio.window import window_chunks
 
 
+@dataclass(frozen=True)
+class ModelSwitchStats:
+    """Latency of model switches, from a TunableWhisperModel arriving to the model serving.
+
+    The first model of a recorder counts as a switch too.
+
+    Attributes:
+        switches: Models put into service
+        last_seconds: Latency of the latest switch
+        total_seconds: Summed latency of all switches
+        failures: Switches whose model failed to load, leaving the previous model serving
+        last_error: Error of the latest failed switch
+    """
+
+    switches: int = 0
+    last_seconds: float = 0.0
+    total_seconds: float = 0.0
+    failures: int = 0
+    last_error: Exception | None = None
+
+    def with_switch(self, seconds: float) -> Self:
+        return replace(
+            self,
+            switches=self.switches + 1,
+            last_seconds=seconds,
+            total_seconds=self.total_seconds + seconds,
+        )
+
+    def with_failure(self, error: Exception) -> Self:
+        return replace(self, failures=self.failures + 1, last_error=error)
+
+
+class ModelSwitchMetrics:
+    """Thread-safe ModelSwitchStats holder, updated by the recorder as switches finish."""
+
+    def __init__(self) -> None:
+        self._stats = ModelSwitchStats()
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> ModelSwitchStats:
+        return self._stats
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._stats = self._stats.with_switch(seconds)
+
+    def record_failure(self, error: Exception) -> None:
+        with self._lock:
+            self._stats = self._stats.with_failure(error)
+
+
+EMIT_INTERVAL = int(0.5 * SAMPLE_RATE)  # samples between window decodes
+
+
+@dataclass(frozen=True)
+class DeviceTranscript:
+    """Transcript of a window of one device's audio, from multi_recorder().
+
+    Attributes:
+        device: Name of the AudioSource the audio came from
+        text: Transcribed text, carrying its latency
+    """
+
+    device: str
+    text: Transcript
+
+
+def _passthrough[T](source: Observable[T]) -> Observable[T]:
+    return source
+
+
 @dataclass
 class RecorderDependencies:
     vad: Callable[[], VADModel] = SileroVADModel
     whisper: Transcriber | None = None
-    executor: Executor | None = None
+    draft: Transcriber | None = None  # draft model of speculative_recorder()
+    executor: Executor | None = None  # decodes and model loads, from_thread default if None
+    models: ModelCache | None = None  # process-wide shared_cache() if None, see its budget
+    switches: ModelSwitchMetrics = field(default_factory=ModelSwitchMetrics)
+    metrics: Metrics | None = None  # per-stage pipeline metrics, off when None
+    latency: LatencyStats = field(default_factory=LatencyStats)  # end-of-speech-to-text
+    session: str | None = None  # latency label, defaults to the device name
+    pool: RoundRobinPool | None = None  # multi_recorder() decoders, cfg.max_concurrency if None
+    changes: ChangeMetrics = field(default_factory=ChangeMetrics)  # decodes skipped as unchanged
+
+
+def _transcribe_timed(
+    transcribe: Callable[[AudioChunk], Observable[str]], window: AudioChunk
+) -> Observable[Transcript]:
+    """Transcribe a window into Transcripts carrying the age of its newest audio."""
+    captured = captured_at(window)
+
+    def timed(text: str) -> Transcript:
+        latency = None if captured is None else time.perf_counter() - captured
+        return Transcript(text, latency)
+
+    return transcribe(window).pipe(ops.map(timed))
+
+
+def _streaming_timed(transcriber: Transcriber) -> Operator[AudioChunk, Transcript]:
+    """streaming_transcribe() as Transcripts of the utterance so far, like whole windows give.
+
+    Each Transcript is the committed text followed by the tentative tail, carrying the age of
+    the newest audio fed in when it was emitted.
+    """
+
+    def _operator(source: Observable[AudioChunk]) -> Observable[Transcript]:
+        def utterance(_: SchedulerBase | None) -> Observable[Transcript]:
+            captured: float | None = None
+            committed: list[str] = []
+
+            def remember(chunk: AudioChunk) -> None:
+                nonlocal captured
+                captured = captured_at(chunk)
+
+            def timed(update: StreamingUpdate) -> Transcript:
+                if update.committed:
+                    committed.append(update.committed)
+                text = " ".join([*committed, update.tentative]).strip()
+                latency = None if captured is None else time.perf_counter() - captured
+                return Transcript(text, latency)
+
+            return source.pipe(
+                ops.do_action(on_next=remember),
+                streaming_transcribe(transcriber, emit_interval=EMIT_INTERVAL),
+                ops.map(timed),
+            )
+
+        return rx.defer(utterance)
+
+    return _operator
+
+
+def _record_end_of_speech(
+    latency: LatencyStats, session: str, model: str
+) -> Operator[Transcript, Transcript]:
+    """Record the latency of the last transcript of every utterance."""
+
+    def _operator(source: Observable[Transcript]) -> Observable[Transcript]:
+        last: Transcript | None = None  # latest transcript of the current utterance
+
+        def remember(transcript: Transcript) -> None:
+            nonlocal last
+            last = transcript
+
+        def record() -> None:
+            # The last window of an utterance ends where speech ended
+            nonlocal last
+            if last is not None and last.latency is not None:
+                latency.record(session, model, last.latency)
+            last = None
+
+        return source.pipe(ops.do_action(on_next=remember, on_completed=record))
+
+    return _operator
+
+
+def _change_detection(
+    transcriber: Transcriber, cfg: AppConfig, deps: RecorderDependencies
+) -> Callable[[AudioChunk], Observable[str]]:
+    """transcriber.transcribe, skipping unchanged windows unless cfg turns that off."""
+    if cfg.change_detection is None:
+        return transcriber.transcribe
+    # A VAD model of its own, as the gate's holds the state of the stream
+    return skip_unchanged(transcriber.transcribe, deps.vad(), cfg.change_detection, deps.changes)
+
+
+def _load_transcriber(
+    model: WhisperModel, cfg: AppConfig, deps: RecorderDependencies, models: ModelCache
+) -> Transcriber:
+    """Acquire a model from the cache and warm it up, blocking."""
+    # Sessions share loaded models; close() hands the model back to the cache
+    whisper = models.acquire(cfg.model_cache_dir / model, cfg.max_concurrency)
+    transcriber = Transcriber(whisper, deps.executor, models.release, model)
+    try:
+        transcriber.warm_up()
+    except Exception:
+        transcriber.close()
+        raise
+    return transcriber
 
 
 def recorder(
@@ -40,6 +235,7 @@ def recorder(
     cfg = maybe_cfg or AppConfig()
     deps = maybe_deps or RecorderDependencies()
     vad_model = deps.vad()
+    models = deps.models or shared_cache(cfg.model_memory_budget)
 
     def operator(obs: Observable[Tunable]) -> Observable[str]:
         # Get our tunable parameters
@@ -49,38 +245,231 @@ def recorder(
         obs_whisper = obs.pipe(filter_whisper)
 
         # Get our audio source stream
-        obs_source = source or rx.of(audio_stream())
+        obs_source = source or rx.of(audio_stream(capture=cfg.capture))
 
         def make_transcriber(t: TunableWhisperModel) -> Transcriber:
             # TODO deps.whisper should be a Transcriber factory
             if deps.whisper is not None:
                 return deps.whisper
-            return Transcriber.from_path(cfg.model_cache_dir / t.model, deps.executor)
-
-        def make_transcribe_pipeline(
-            audio: Observable[AudioStream], transcriber: Transcriber
-        ) -> Observable[str]:
-            emit_interval = int(0.5 * SAMPLE_RATE)  # TODO add emit interval to cfg
-            return audio.pipe(
-                rechunk(512),
-                vad_gate(vad_model, obs_vad),
-                window_chunks(emit_interval=emit_interval),
-                ops.switch_map(transcriber.transcribe),
+            return _load_transcriber(t.model, cfg, deps, models)
+
+        def make_transcribe_pipeline(src: AudioSource, transcriber: Transcriber) -> Observable[str]:
+            m = deps.metrics
+            session = deps.session or src.device_name
+            if cfg.streaming:
+                decode: Operator[AudioChunk, Transcript] = instrument(
+                    "transcribe", _streaming_timed(transcriber), m
+                )
+            else:
+                transcribe = partial(_transcribe_timed, _change_detection(transcriber, cfg, deps))
+                decode = rx.compose(
+                    instrument("window", window_chunks(emit_interval=EMIT_INTERVAL), m),
+                    # A decode runs to the end; while it does, only the newest window waits.
+                    # Windows replaced while waiting count as dropped by the transcribe stage.
+                    exhaust_map_latest(
+                        instrument_inner("transcribe", transcribe, m),
+                        on_superseded=count_dropped("transcribe", m),
+                    ),
+                )
+
+            return src.stream.pipe(
+                instrument("source", _passthrough, m),
+                instrument("rechunk", rechunk_ring(512), m),
+                instrument("vad_gate", vad_gate(vad_model, obs_vad), m),
+                decode,
+                _record_end_of_speech(deps.latency, session, transcriber.name),
                 ops.repeat(),
             )
 
         def make_device_pipeline(src: AudioSource) -> Observable[str]:
+            # Make-before-break: the current model keeps transcribing while the next one
+            # loads and warms up in the background, then the pipeline switches over
             return obs_whisper.pipe(
-                ops.map(make_transcriber),
-                switch_resource(partial(make_transcribe_pipeline, src.stream)),
+                preload_resource(
+                    make_transcriber,
+                    deps.executor,
+                    deps.switches.record,
+                    deps.switches.record_failure,
+                ),
+                switch_resource(partial(make_transcribe_pipeline, src)),
             )
 
         # Share source so we can use it for both switch_map and completion signal
         shared_source = obs_source.pipe(ops.share())
         # last() emits final item on source complete, triggering take_until
+        return shared_source.pipe(
+            ops.switch_map(make_device_pipeline),
+            ops.take_until(shared_source.pipe(ops.last())),
+            instrument("output", _passthrough, deps.metrics),
+        )
+
+    return operator
+
+
+def speculative_recorder(
+    source: Observable[AudioSource] | None = None,
+    maybe_cfg: AppConfig | None = None,
+    maybe_deps: RecorderDependencies | None = None,
+) -> Operator[Tunable, TranscriptEvent]:
+    """Dual-model recorder: drafts with cfg.draft_model, confirms with the tunable model.
+
+    See audio.speculative. The draft model is loaded once per audio source. The confirming
+    model switches make-before-break as in recorder(), and window IDs keep increasing
+    across switches.
+    """
+    cfg = maybe_cfg or AppConfig()
+    deps = maybe_deps or RecorderDependencies()
+    vad_model = deps.vad()
+    models = deps.models or shared_cache(cfg.model_memory_budget)
+
+    def operator(obs: Observable[Tunable]) -> Observable[TranscriptEvent]:
+        obs_vad = obs.pipe(filter_instance_start_with(cfg.vad_options))
+        obs_whisper = obs.pipe(filter_instance_start_with(cfg.whisper_model))
+        obs_source = source or rx.of(audio_stream(capture=cfg.capture))
+
+        def make_confirm(t: TunableWhisperModel) -> Transcriber:
+            if deps.whisper is not None:
+                return deps.whisper
+            return _load_transcriber(t.model, cfg, deps, models)
+
+        def make_device_pipeline(src: AudioSource) -> Observable[TranscriptEvent]:
+            ids = WindowIds()
+
+            def with_draft(draft: Transcriber) -> Observable[TranscriptEvent]:
+                def make_speculative_pipeline(confirm: Transcriber) -> Observable[TranscriptEvent]:
+                    return src.stream.pipe(
+                        rechunk_ring(512),
+                        vad_gate(vad_model, obs_vad),
+                        speculative_transcribe(
+                            draft,
+                            confirm,
+                            cfg.draft_emit_interval,
+                            cfg.confirm_emit_interval,
+                            ids,
+                        ),
+                        ops.repeat(),
+                    )
+
+                return obs_whisper.pipe(
+                    preload_resource(
+                        make_confirm,
+                        deps.executor,
+                        deps.switches.record,
+                        deps.switches.record_failure,
+                    ),
+                    switch_resource(make_speculative_pipeline),
+                )
+
+            def load_draft() -> Transcriber:
+                if deps.draft is not None:
+                    return deps.draft
+                return _load_transcriber(cfg.draft_model, cfg, deps, models)
+
+            # The draft model lives as long as the source, in background like the confirm one
+            return rx.of(cfg.draft_model).pipe(
+                preload_resource(lambda _: load_draft(), deps.executor),
+                switch_resource(with_draft),
+            )
+
+        shared_source = obs_source.pipe(ops.share())
         return shared_source.pipe(
             ops.switch_map(make_device_pipeline),
             ops.take_until(shared_source.pipe(ops.last())),
         )
 
     return operator
+
+
+def multi_recorder(
+    sources: Observable[AudioSource],
+    maybe_cfg: AppConfig | None = None,
+    maybe_deps: RecorderDependencies | None = None,
+) -> Operator[Tunable, DeviceTranscript]:
+    """Record every AudioSource of sources at once, e.g. one mic per meeting room.
+
+    Each source has its own front end (rechunk, its own VAD model, window), and decodes
+    at most one window at a time. All sources share one whisper model and a pool of
+    decoders (deps.pool, cfg.max_concurrency slots by default) that serves the sources
+    round-robin, so a talkative room can't starve a quiet one. Silent sources never reach
+    the pool, so decoding cost follows speech, not the number of devices.
+
+    Runs until sources has completed and the audio stream of every source has ended,
+    even if obs goes on. The model switches make-before-break as in recorder().
+    """
+    cfg = maybe_cfg or AppConfig()
+    deps = maybe_deps or RecorderDependencies()
+    models = deps.models or shared_cache(cfg.model_memory_budget)
+    pool = deps.pool or RoundRobinPool(cfg.max_concurrency)
+
+    def operator(obs: Observable[Tunable]) -> Observable[DeviceTranscript]:
+        obs_vad = obs.pipe(filter_instance_start_with(cfg.vad_options))
+        obs_whisper = obs.pipe(filter_instance_start_with(cfg.whisper_model))
+
+        def make_transcriber(t: TunableWhisperModel) -> Transcriber:
+            if deps.whisper is not None:
+                return deps.whisper
+            return _load_transcriber(t.model, cfg, deps, models)
+
+        def make_device_pipeline(
+            transcriber: Transcriber, src: AudioSource
+        ) -> Observable[DeviceTranscript]:
+            device = src.device_name
+            vad_model = deps.vad()  # VAD state is per stream
+            transcribe_text = _change_detection(transcriber, cfg, deps)
+
+            def transcribe(window: AudioChunk) -> Observable[Transcript]:
+                return pool.submit(device, lambda: _transcribe_timed(transcribe_text, window))
+
+            def tag(text: Transcript) -> DeviceTranscript:
+                return DeviceTranscript(device, text)
+
+            def utterances(audio: Observable[AudioChunk]) -> Observable[Transcript]:
+                # The gate completes at the end of every utterance and is subscribed
+                # again to the shared audio, until the audio itself has ended
+                ended = False
+
+                def end() -> None:
+                    nonlocal ended
+                    ended = True
+
+                def more(_: Observable[Transcript]) -> bool:
+                    return not ended
+
+                return audio.pipe(
+                    ops.do_action(on_completed=end),
+                    vad_gate(vad_model, obs_vad),
+                    window_chunks(emit_interval=EMIT_INTERVAL),
+                    exhaust_map_latest(transcribe),
+                    _record_end_of_speech(deps.latency, device, transcriber.name),
+                    ops.while_do(more),
+                )
+
+            return src.stream.pipe(rechunk_ring(512), ops.publish(utterances), ops.map(tag))
+
+        # Replayed, so the pipelines of a newly switched model get every source again
+        shared_sources = sources.pipe(ops.replay(), ops.ref_count())
+
+        def record(_: SchedulerBase | None) -> Observable[DeviceTranscript]:
+            ended: Subject[None] = Subject()
+
+            def make_pipelines(transcriber: Transcriber) -> Observable[DeviceTranscript]:
+                return shared_sources.pipe(
+                    ops.flat_map(partial(make_device_pipeline, transcriber)),
+                    ops.do_action(on_completed=lambda: ended.on_next(None)),
+                )
+
+            # Ends once sources has completed and the audio of every source has ended
+            return obs_whisper.pipe(
+                preload_resource(
+                    make_transcriber,
+                    deps.executor,
+                    deps.switches.record,
+                    deps.switches.record_failure,
+                ),
+                switch_resource(make_pipelines),
+                ops.take_until(ended),
+            )
+
+        return rx.defer(record)
+
+    return operator
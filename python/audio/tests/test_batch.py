@@ -0,0 +1,154 @@
+"""Tests for BatchTranscriber."""
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from audio._stt import CancelToken, Whisper
+from audio.batch import BatchTranscriber
+from audio.types import AudioChunk
+from audio.whisper import CHUNK_SIZE
+
+
+def chunk(value: float = 0.0) -> AudioChunk:
+    """Create a 512-sample chunk filled with value."""
+    return np.full(CHUNK_SIZE, value, dtype=np.float32)
+
+
+def mock_whisper(gate: threading.Event | None = None) -> MagicMock:
+    """Mock Whisper whose batches answer each window with its first sample value.
+
+    A window whose first sample is negative fails on its own. With a gate, every batch
+    blocks until the gate is set.
+    """
+    mock = MagicMock(spec=Whisper)
+    mock.batches = []
+
+    def transcribe_batch(
+        windows: list[AudioChunk],
+        cancels: list[CancelToken] | None = None,
+        audio_lens: list[int | None] | None = None,
+    ) -> list[tuple[str | None, Exception | None]]:
+        mock.batches.append([float(w[0]) for w in windows])
+        if gate is not None:
+            gate.wait(timeout=5.0)
+        tokens = cancels or [CancelToken() for _ in windows]
+        results: list[tuple[str | None, Exception | None]] = []
+        for w, t in zip(windows, tokens, strict=True):
+            if t.cancelled:
+                results.append((None, None))
+            elif w[0] < 0:
+                results.append((None, RuntimeError("decode failed")))
+            else:
+                results.append((f"{w[0]:.0f}", None))
+        return results
+
+    mock.transcribe_batch.side_effect = transcribe_batch
+    return mock
+
+
+def collect(batcher: BatchTranscriber, values: list[float]) -> list[list[str]]:
+    """Submit one window per value at once, wait for every text."""
+    results: list[list[str]] = [[] for _ in values]
+    done = [threading.Event() for _ in values]
+    for i, value in enumerate(values):
+        batcher.transcribe(chunk(value)).subscribe(
+            on_next=results[i].append, on_completed=done[i].set
+        )
+    for event in done:
+        assert event.wait(timeout=5.0)
+    return results
+
+
+def test_batch_transcriber_batches_windows_within_deadline() -> None:
+    """Windows submitted within the deadline are decoded as one batch."""
+    whisper = mock_whisper()
+    batcher = BatchTranscriber(whisper, deadline=0.2)
+
+    results = collect(batcher, [1.0, 2.0, 3.0])
+
+    assert results == [["1"], ["2"], ["3"]]
+    assert whisper.batches == [[1.0, 2.0, 3.0]]
+    assert batcher.stats.batches == 1
+    assert batcher.stats.windows == 3
+    assert batcher.stats.max_batch == 3
+    batcher.close()
+
+
+def test_batch_transcriber_splits_at_max_batch() -> None:
+    """A batch starts as soon as max_batch windows wait, without waiting for the deadline."""
+    whisper = mock_whisper()
+    batcher = BatchTranscriber(whisper, deadline=10.0, max_batch=2)
+
+    results = collect(batcher, [1.0, 2.0])
+
+    assert results == [["1"], ["2"]]
+    assert whisper.batches == [[1.0, 2.0]]
+    batcher.close()
+
+
+def test_batch_transcriber_gathers_windows_during_a_decode() -> None:
+    """Windows submitted while a batch decodes form the next batch."""
+    gate = threading.Event()
+    whisper = mock_whisper(gate)
+    batcher = BatchTranscriber(whisper, deadline=0.0)
+
+    first = threading.Event()
+    batcher.transcribe(chunk(1.0)).subscribe(on_completed=first.set)
+    while not whisper.batches:
+        time.sleep(0.001)
+    rest = threading.Event()
+    results: list[str] = []
+    batcher.transcribe(chunk(2.0)).subscribe(on_next=results.append)
+    batcher.transcribe(chunk(3.0)).subscribe(on_next=results.append, on_completed=rest.set)
+    gate.set()
+
+    assert first.wait(timeout=5.0)
+    assert rest.wait(timeout=5.0)
+    assert whisper.batches == [[1.0], [2.0, 3.0]]
+    assert results == ["2", "3"]
+    batcher.close()
+
+
+def test_batch_transcriber_dispose_drops_waiting_window() -> None:
+    """A window disposed before its batch starts is not decoded."""
+    whisper = mock_whisper()
+    batcher = BatchTranscriber(whisper, deadline=0.2)
+
+    results: list[str] = []
+    batcher.transcribe(chunk(1.0)).subscribe(on_next=results.append).dispose()
+    assert collect(batcher, [2.0]) == [["2"]]
+
+    assert whisper.batches == [[2.0]]
+    assert results == []
+    assert batcher.stats.aborted == 1
+    batcher.close()
+
+
+def test_batch_transcriber_errors_only_the_failing_window() -> None:
+    """A window whose decode fails errors its own session, the rest of the batch completes."""
+    whisper = mock_whisper()
+    batcher = BatchTranscriber(whisper, deadline=0.2)
+    errors: list[Exception] = []
+    failed = threading.Event()
+
+    def on_error(e: Exception) -> None:
+        errors.append(e)
+        failed.set()
+
+    batcher.transcribe(chunk(-1.0)).subscribe(on_error=on_error)
+    results = collect(batcher, [1.0, 2.0])
+
+    assert failed.wait(timeout=5.0)
+    assert results == [["1"], ["2"]]
+    assert [str(e) for e in errors] == ["decode failed"]
+    assert whisper.batches == [[-1.0, 1.0, 2.0]]
+    batcher.close()
+
+
+def test_batch_transcriber_rejects_bad_max_batch() -> None:
+    with pytest.raises(ValueError, match="max_batch"):
+        BatchTranscriber(mock_whisper(), max_batch=0)
@@ -0,0 +1,101 @@
+"""Tests for lock-free ring capture."""
+
+import threading
+
+import numpy as np
+
+from audio.capture import CaptureMetrics, CaptureRing, drain_ring
+from audio.latency import captured_at, sample_age
+
+
+def block(start: int, n: int) -> np.ndarray:
+    """(n, 1) block like sounddevice delivers, counting up from start."""
+    return np.arange(start, start + n, dtype=np.float32).reshape(-1, 1)
+
+
+def test_capture_ring_drains_writes_in_order_across_wrap() -> None:
+    """Batches hold every sample written since the last drain, also across the end."""
+    ring = CaptureRing(8)
+    ring.write(block(0, 6), None)
+    first = ring.drain()
+    ring.write(block(6, 3), None)
+    ring.write(block(9, 3), None)
+    second = ring.drain()
+
+    assert first is not None and second is not None
+    np.testing.assert_array_equal(first, np.arange(0, 6))
+    np.testing.assert_array_equal(second, np.arange(6, 12))
+    assert ring.drain() is None
+    assert ring.stats.batches == 2
+    assert ring.stats.max_fill == 6
+
+
+def test_capture_ring_drops_newest_samples_when_full() -> None:
+    """A full ring keeps unread samples and counts what it dropped."""
+    ring = CaptureRing(8)
+    ring.write(block(0, 6), None)
+    ring.write(block(6, 6), None, overflow=True)
+
+    batch = ring.drain()
+    assert batch is not None
+    np.testing.assert_array_equal(batch, np.arange(0, 8))
+    stats = ring.stats
+    assert (stats.blocks, stats.samples, stats.dropped_samples, stats.overflows) == (2, 8, 4, 1)
+
+
+def test_capture_ring_stamps_batch_with_newest_sample_time() -> None:
+    """The batch is stamped like its newest sample, also when part of a block is dropped."""
+    ring = CaptureRing(8)
+    ring.write(block(0, 4), 10.0)
+    ring.write(block(4, 6), 20.0)  # the last 2 samples don't fit
+
+    batch = ring.drain()
+    assert batch is not None
+    assert captured_at(batch) == 20.0 - sample_age(2)
+
+
+def test_capture_metrics_sum_live_and_retired_rings() -> None:
+    """Counters survive resubscriptions: retired rings stay in the totals."""
+    metrics = CaptureMetrics()
+    old, new = CaptureRing(8), CaptureRing(8)
+    metrics.track(old)
+    old.write(block(0, 10), None)
+    metrics.retire(old)
+    metrics.track(new)
+    new.write(block(0, 4), None, overflow=True)
+
+    stats = metrics.stats
+    assert (stats.blocks, stats.samples, stats.dropped_samples, stats.overflows) == (2, 12, 2, 1)
+
+
+def test_drain_ring_emits_batches_until_disposed() -> None:
+    """The drain thread emits what the writer put in the ring."""
+    ring = CaptureRing(64)
+    batches: list[np.ndarray] = []
+    received = threading.Event()
+
+    def on_next(batch: np.ndarray) -> None:
+        batches.append(batch)
+        received.set()
+
+    subscription = drain_ring(ring, 0.001).subscribe(on_next)
+    ring.write(block(0, 16), None)
+    assert received.wait(timeout=1.0)
+    subscription.dispose()
+
+    np.testing.assert_array_equal(np.concatenate(batches), np.arange(0, 16))
+
+
+def test_drain_ring_dispose_leaves_the_rest_to_the_caller() -> None:
+    """After dispose the drain thread has stopped, and the caller drains what is left."""
+    ring = CaptureRing(64)
+    batches: list[np.ndarray] = []
+
+    subscription = drain_ring(ring, 60.0).subscribe(batches.append)
+    ring.write(block(0, 16), None)
+    subscription.dispose()
+
+    rest = ring.drain()
+    assert batches == []
+    assert rest is not None
+    np.testing.assert_array_equal(rest, np.arange(0, 16))
@@ -0,0 +1,92 @@
+"""Tests for skipping decodes of unchanged windows."""
+
+from unittest.mock import Mock
+
+import numpy as np
+import reactivex as rx
+from reactivex import Observable
+from reactivex.subject import Subject
+from streams import exhaust_map_latest
+
+from audio.change import ChangeMetrics, appended_samples, skip_unchanged
+from audio.config import ChangeOptions
+from audio.latency import stamp
+from audio.types import AudioChunk
+from audio.window import window_chunks
+
+
+def vad(speech: float = 1.0) -> Mock:
+    """VAD scoring a frame as speech when its first sample is at least speech."""
+    return Mock(side_effect=lambda frame: 1.0 if float(frame[0]) >= speech else 0.0)
+
+
+def counting_transcriber() -> Mock:
+    """Transcribe a window to the number of decodes so far."""
+    calls = 0
+
+    def transcribe(_window: AudioChunk) -> Observable[str]:
+        nonlocal calls
+        calls += 1
+        return rx.of(str(calls))
+
+    return Mock(side_effect=transcribe)
+
+
+def run(
+    levels: list[float], vad_model: Mock, metrics: ChangeMetrics, transcribe: Mock
+) -> list[str]:
+    """Push one 512-sample chunk per level through 1024-sample windows."""
+    source: Subject[AudioChunk] = Subject()
+    texts: list[str] = []
+    unchanged = skip_unchanged(transcribe, vad_model, ChangeOptions(), metrics)
+    source.pipe(window_chunks(512, emit_interval=1024), exhaust_map_latest(unchanged)).subscribe(
+        on_next=texts.append
+    )
+    for level in levels:
+        source.on_next(np.full(512, level, dtype=np.float32))
+    source.on_completed()
+    return texts
+
+
+def test_skip_unchanged_reuses_text_for_quiet_tail() -> None:
+    """Windows that only added silence re-emit the last text without decoding."""
+    metrics = ChangeMetrics()
+    transcribe = counting_transcriber()
+
+    texts = run([1.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 1.0], vad(), metrics, transcribe)
+
+    assert texts == ["1", "1", "1", "2"]
+    assert transcribe.call_count == 2
+    assert metrics.stats.decoded == 2
+    assert metrics.stats.skipped == 2
+    assert metrics.stats.skip_ratio == 0.5
+
+
+def test_skip_unchanged_decodes_speech_below_energy_threshold() -> None:
+    """Quiet audio the VAD calls speech is still new."""
+    transcribe = counting_transcriber()
+
+    texts = run([1.0, 1.0, 0.001, 0.001], vad(speech=0.001), ChangeMetrics(), transcribe)
+
+    assert texts == ["1", "2"]
+
+
+def test_skip_unchanged_decodes_loud_audio_without_vad() -> None:
+    """Audio above max_rms is new whatever the VAD says, and the VAD is not run."""
+    vad_model = vad(speech=2.0)
+    transcribe = counting_transcriber()
+
+    texts = run([0.5, 0.5, 0.5, 0.5], vad_model, ChangeMetrics(), transcribe)
+
+    assert texts == ["1", "2"]
+    vad_model.assert_not_called()
+
+
+def test_appended_samples_uses_stamps_then_growth() -> None:
+    full = np.zeros(4096, dtype=np.float32)
+
+    assert appended_samples(full, None) == 4096
+    assert appended_samples(full, full[:1024]) == 3072
+    assert appended_samples(full[:1024], full) == 1024  # a new utterance
+    assert appended_samples(full, full) is None
+    assert appended_samples(stamp(full, 10.1), stamp(full, 10.0)) == 1600
@@ -0,0 +1,91 @@
+"""Tests for capture timestamps and latency histograms."""
+
+import numpy as np
+import pytest
+import reactivex as rx
+
+from audio.latency import (
+    SAMPLE_RATE,
+    LatencyHistogram,
+    LatencyStats,
+    Transcript,
+    captured_at,
+    stamp,
+)
+from audio.rechunk import rechunk, rechunk_ring
+from audio.types import AudioChunk
+from audio.window import window_chunks
+
+
+def stamped_blocks(n: int, size: int) -> list[AudioChunk]:
+    """Blocks stamped as if sample i was captured at i / SAMPLE_RATE seconds."""
+    return [stamp(np.zeros(size, dtype=np.float32), (i + 1) * size / SAMPLE_RATE) for i in range(n)]
+
+
+def test_stamp_is_a_view_and_unstamped_arrays_have_no_time() -> None:
+    """Stamping copies nothing, and plain arrays report None."""
+    plain = np.zeros(4, dtype=np.float32)
+    stamped = stamp(plain, 1.5)
+
+    assert captured_at(plain) is None
+    assert captured_at(stamped) == 1.5
+    assert np.shares_memory(plain, stamped)
+    assert stamp(plain, None) is plain
+
+
+def test_transcript_compares_as_text() -> None:
+    """A Transcript is the plain text plus its latency."""
+    transcript = Transcript("hello", 0.25)
+
+    assert transcript == "hello"
+    assert transcript.latency == 0.25
+
+
+@pytest.mark.parametrize("operator", [rechunk, rechunk_ring])
+def test_rechunk_carries_capture_time_of_last_sample(operator: object) -> None:
+    """Each chunk is stamped with the capture time of its own last sample."""
+    chunks: list[AudioChunk] = []
+    rx.from_iterable(stamped_blocks(32, 160)).pipe(operator(512)).subscribe(  # type: ignore[operator]
+        on_next=chunks.append
+    )
+
+    times = [captured_at(c) for c in chunks[:-1]]
+    assert times == pytest.approx([(i + 1) * 512 / SAMPLE_RATE for i in range(len(times))])
+    # The zero-padded remainder ends at the newest real sample
+    assert captured_at(chunks[-1]) == pytest.approx(32 * 160 / SAMPLE_RATE)
+
+
+def test_window_chunks_carries_capture_time_of_newest_chunk() -> None:
+    """Windows are stamped like the newest chunk appended to them."""
+    windows: list[AudioChunk] = []
+    rx.from_iterable(stamped_blocks(8, 512)).pipe(window_chunks(512, 2048, 1024)).subscribe(
+        on_next=windows.append
+    )
+
+    assert [captured_at(w) for w in windows] == pytest.approx(
+        [i * 1024 / SAMPLE_RATE for i in (1, 2, 3, 4)]
+    )
+
+
+def test_latency_histogram_percentiles() -> None:
+    """Percentiles are within one 10% bucket of the exact value."""
+    histogram = LatencyHistogram()
+    for ms in range(1, 101):
+        histogram.record(ms / 1000)
+
+    summary = histogram.summary()
+    assert summary.count == 100
+    assert 0.050 <= summary.p50 <= 0.055
+    assert 0.095 <= summary.p95 <= 0.105
+    assert 0.099 <= summary.p99 <= 0.109
+
+
+def test_latency_stats_by_session_and_model() -> None:
+    """Samples are summarized per session and per model."""
+    stats = LatencyStats()
+    stats.record("mic", "small", 0.1)
+    stats.record("mic", "medium", 0.2)
+    stats.record("line", "small", 0.3)
+
+    assert {k: v.count for k, v in stats.by_session().items()} == {"mic": 2, "line": 1}
+    assert {k: v.count for k, v in stats.by_model().items()} == {"small": 2, "medium": 1}
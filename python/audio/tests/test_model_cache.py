@@ -0,0 +1,202 @@
+"""Tests for ModelCache."""
+
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from audio._stt import Whisper
+from audio.model_cache import ModelCache
+from audio.whisper import Transcriber
+
+
+class FakeLoader:
+    """Loader returning mock Whisper contexts and counting loads per path."""
+
+    def __init__(self) -> None:
+        self.loads: list[str] = []
+
+    def __call__(self, path: Path, _max_concurrency: int) -> Whisper:
+        self.loads.append(path.name)
+        whisper = MagicMock(spec=Whisper)
+        whisper.name = path.name
+        return whisper
+
+
+def model(tmp_path: Path, name: str, size: int) -> Path:
+    path = tmp_path / name
+    path.write_bytes(b"\0" * size)
+    return path
+
+
+def test_model_cache_shares_loaded_model(tmp_path: Path) -> None:
+    """Acquiring the same model twice returns one context loaded once."""
+    loader = FakeLoader()
+    cache = ModelCache(budget=1000, loader=loader)
+    path = model(tmp_path, "small.bin", 100)
+
+    a = cache.acquire(path)
+    b = cache.acquire(path)
+
+    assert a is b
+    assert loader.loads == ["small.bin"]
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+def test_model_cache_keeps_idle_models_within_budget(tmp_path: Path) -> None:
+    """Released models stay loaded until the budget is exceeded, then LRU goes first."""
+    loader = FakeLoader()
+    cache = ModelCache(budget=250, loader=loader)
+    small, tiny, base = (model(tmp_path, n, 100) for n in ("small", "tiny", "base"))
+
+    first_small = cache.acquire(small)
+    cache.release(first_small)
+    first_tiny = cache.acquire(tiny)
+    cache.release(first_tiny)
+    cache.release(cache.acquire(small))  # switching back is a hit, tiny is now LRU
+    assert loader.loads == ["small", "tiny"]
+
+    cache.release(cache.acquire(base))  # 300 bytes idle
+
+    first_tiny.close.assert_called_once()  # type: ignore[attr-defined]
+    first_small.close.assert_not_called()  # type: ignore[attr-defined]
+    assert cache.stats.evictions == 1
+    assert cache.resident_bytes == 200
+    cache.release(cache.acquire(tiny))
+    assert loader.loads == ["small", "tiny", "base", "tiny"]
+
+
+def test_model_cache_counts_models_in_use_against_budget(tmp_path: Path) -> None:
+    """An idle model is evicted when it and the models in use together exceed the budget."""
+    cache = ModelCache(budget=150, loader=FakeLoader())
+    in_use = cache.acquire(model(tmp_path, "small", 100))
+    idle = cache.acquire(model(tmp_path, "tiny", 100))
+
+    cache.release(idle)
+
+    idle.close.assert_called_once()  # type: ignore[attr-defined]
+    in_use.close.assert_not_called()  # type: ignore[attr-defined]
+    assert cache.resident_bytes == 100
+
+
+def test_model_cache_never_evicts_models_in_use(tmp_path: Path) -> None:
+    """A model with references survives even when over budget."""
+    cache = ModelCache(budget=0, loader=FakeLoader())
+    whisper = cache.acquire(model(tmp_path, "small", 100))
+
+    cache.clear()
+
+    whisper.close.assert_not_called()  # type: ignore[attr-defined]
+    cache.release(whisper)
+    whisper.close.assert_called_once()  # type: ignore[attr-defined]
+
+
+def test_model_cache_concurrent_acquire_loads_once(tmp_path: Path) -> None:
+    """Sessions racing for the same model wait for a single load."""
+    gate = threading.Event()
+    loader = FakeLoader()
+
+    def slow_loader(path: Path, max_concurrency: int) -> Whisper:
+        gate.wait(timeout=1.0)
+        return loader(path, max_concurrency)
+
+    cache = ModelCache(loader=slow_loader)
+    path = model(tmp_path, "small", 100)
+    results: list[Whisper] = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.acquire(path))) for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    gate.set()
+    for t in threads:
+        t.join(timeout=1.0)
+
+    assert len(results) == 4
+    assert all(r is results[0] for r in results)
+    assert loader.loads == ["small"]
+
+
+def test_model_cache_load_error_is_not_cached(tmp_path: Path) -> None:
+    """A failed load raises and the next acquire retries."""
+    calls = 0
+
+    def flaky(path: Path, max_concurrency: int) -> Whisper:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError("bad model")
+        return FakeLoader()(path, max_concurrency)
+
+    cache = ModelCache(loader=flaky)
+    path = model(tmp_path, "small", 100)
+    with pytest.raises(RuntimeError, match="bad model"):
+        cache.acquire(path)
+    assert cache.acquire(path) is not None
+
+
+def test_transcriber_close_releases_cached_model(tmp_path: Path) -> None:
+    """Closing a Transcriber built from the cache releases instead of closing, once."""
+    cache = ModelCache(budget=1000, loader=FakeLoader())
+    whisper = cache.acquire(model(tmp_path, "small", 100))
+    release = MagicMock(side_effect=cache.release)
+    transcriber = Transcriber(whisper, release=release)
+
+    transcriber.close()
+    transcriber.close()
+
+    release.assert_called_once_with(whisper)
+    whisper.close.assert_not_called()  # type: ignore[attr-defined]
+
+
+def test_transcriber_close_waits_for_in_flight_decode(tmp_path: Path) -> None:
+    """A model released mid-decode is evicted and closed only after the decode returns."""
+    cache = ModelCache(budget=0, loader=FakeLoader())
+    whisper = cache.acquire(model(tmp_path, "small", 100))
+    started, finish = threading.Event(), threading.Event()
+
+    def transcribe(*_args: object) -> str:
+        started.set()
+        finish.wait(timeout=5.0)
+        return "text"
+
+    whisper.transcribe.side_effect = transcribe  # type: ignore[attr-defined]
+    transcriber = Transcriber(whisper, release=cache.release)
+    done = threading.Event()
+    subscription = transcriber.transcribe(np.zeros(512, dtype=np.float32)).subscribe(
+        on_completed=done.set, on_error=lambda _: done.set()
+    )
+    assert started.wait(timeout=5.0)
+
+    subscription.dispose()
+    transcriber.close()
+    whisper.close.assert_not_called()  # type: ignore[attr-defined]
+    assert cache.stats.evictions == 0
+
+    finish.set()
+    deadline = time.monotonic() + 5.0
+    while not whisper.close.called and time.monotonic() < deadline:  # type: ignore[attr-defined]
+        time.sleep(0.001)
+    whisper.close.assert_called_once_with()  # type: ignore[attr-defined]
+    assert cache.stats.evictions == 1
+
+
+def test_model_cache_closes_evicted_models_outside_lock(tmp_path: Path) -> None:
+    """Closing an evicted model, which waits for its decodes, does not block the cache."""
+    loader = FakeLoader()
+    cache = ModelCache(budget=0, loader=loader)
+    small, large = model(tmp_path, "small", 100), model(tmp_path, "large", 100)
+    whisper = cache.acquire(small)
+    acquired: list[Whisper] = []
+    whisper.close.side_effect = lambda: acquired.append(cache.acquire(large))  # type: ignore[attr-defined]
+
+    thread = threading.Thread(target=cache.release, args=(whisper,))
+    thread.start()
+    thread.join(timeout=5.0)
+
+    assert not thread.is_alive()
+    assert len(acquired) == 1
+    assert loader.loads == ["small", "large"]
@@ -5,7 +5,7 @@ from typing import Any
 import numpy as np
 from reactivex.testing.marbles import marbles_testing
 
-from audio.rechunk import rechunk
+from audio.rechunk import rechunk, rechunk_ring
 from audio.types import AudioChunk
 
 type Lookup = dict[str | float, Any]
@@ -84,3 +84,73 @@ def test_rechunk_empty() -> None:
 
         result = start(source.pipe(rechunk(chunk_size=4)))
         assert result == expected
+
+
+def test_rechunk_ring_matches_rechunk() -> None:
+    """Ring buffer variant emits the same chunks with the same timing."""
+    with marbles_testing() as (start, cold, _hot, exp):
+        a = arr(1.0, 2.0)
+        b = arr(3.0, 4.0)
+        c = arr(5.0, 6.0)
+        out1 = arr(1.0, 2.0, 3.0, 4.0)
+        out2 = arr(5.0, 6.0, 0.0, 0.0)
+
+        lookup: Lookup = {"a": a, "b": b, "c": c, "x": out1, "y": out2}
+
+        source = cold("-a-b-c-|", lookup)  # type: ignore[call-arg]
+        expected = exp("---x---(y,|)", lookup)  # type: ignore[call-arg]
+        result = start(source.pipe(rechunk_ring(chunk_size=4)))
+        assert result == expected
+
+
+def test_rechunk_ring_emits_many_chunks_per_block() -> None:
+    """A block spanning several chunks emits them all on the same tick."""
+    with marbles_testing() as (start, cold, _hot, exp):
+        a = arr(1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0)
+        lookup: Lookup = {
+            "a": a,
+            "x": arr(1.0, 2.0, 3.0, 4.0),
+            "y": arr(5.0, 6.0, 7.0, 8.0),
+            "z": arr(9.0, 0.0, 0.0, 0.0),
+        }
+
+        source = cold("-a-----|", lookup)  # type: ignore[call-arg]
+        expected = exp("-(x,y)-(z,|)", lookup)  # type: ignore[call-arg]
+        result = start(source.pipe(rechunk_ring(chunk_size=4, capacity_chunks=1)))
+        assert result == expected
+
+
+def test_rechunk_ring_wraps_around() -> None:
+    """Writes that straddle the end of the ring are reassembled in order."""
+    with marbles_testing() as (start, cold, _hot, exp):
+        # capacity 8: writes of 3 samples wrap after the second chunk is read
+        a = arr(1.0, 2.0, 3.0)
+        b = arr(4.0, 5.0, 6.0)
+        c = arr(7.0, 8.0, 9.0)
+        d = arr(10.0, 11.0, 12.0)
+        lookup: Lookup = {
+            "a": a,
+            "b": b,
+            "c": c,
+            "d": d,
+            "x": arr(1.0, 2.0, 3.0, 4.0),
+            "y": arr(5.0, 6.0, 7.0, 8.0),
+            "z": arr(9.0, 10.0, 11.0, 12.0),
+        }
+
+        source = cold("-a-b-c-d-|", lookup)  # type: ignore[call-arg]
+        expected = exp("---x-y-z-|", lookup)  # type: ignore[call-arg]
+        result = start(source.pipe(rechunk_ring(chunk_size=4, capacity_chunks=2)))
+        assert result == expected
+
+
+def test_rechunk_ring_flattens_device_blocks() -> None:
+    """(frames, 1) blocks from the audio callback are flattened."""
+    with marbles_testing() as (start, cold, _hot, exp):
+        a = arr(1.0, 2.0, 3.0, 4.0).reshape(-1, 1)
+        lookup: Lookup = {"a": a, "x": arr(1.0, 2.0, 3.0, 4.0)}
+
+        source = cold("-a-|", lookup)  # type: ignore[call-arg]
+        expected = exp("-x-|", lookup)  # type: ignore[call-arg]
+        result = start(source.pipe(rechunk_ring(chunk_size=4)))
+        assert result == expected
@@ -0,0 +1,68 @@
+"""Tests for the streaming polyphase resampler."""
+
+import numpy as np
+import pytest
+import reactivex as rx
+from reactivex import operators as ops
+
+from audio.latency import captured_at, stamp
+from audio.resample import PolyphaseResampler, resample
+
+
+def tone(freq: float, rate: int, seconds: float = 1.0) -> np.ndarray:
+    t = np.arange(int(rate * seconds)) / rate
+    return np.sin(2 * np.pi * freq * t).astype(np.float32)
+
+
+def run(resampler: PolyphaseResampler, blocks: list[np.ndarray]) -> np.ndarray:
+    return np.concatenate([resampler.process(b) for b in blocks] + [resampler.flush()])
+
+
+def rms(x: np.ndarray) -> float:
+    return float(np.sqrt(np.mean(x**2)))
+
+
+@pytest.mark.parametrize("rate", [44100, 48000])
+def test_resampler_suppresses_aliasing(rate: int) -> None:
+    """A 12kHz tone, above the 8kHz output Nyquist, must not fold into the output."""
+    out = run(PolyphaseResampler(rate), np.array_split(tone(12000, rate), 100))
+    assert rms(out[1000:-1000]) < 1e-3  # below -60 dB
+
+
+@pytest.mark.parametrize("rate", [44100, 48000])
+def test_resampler_keeps_passband(rate: int) -> None:
+    """A 1kHz tone comes out as the same tone at 16kHz, aligned in time."""
+    out = run(PolyphaseResampler(rate), np.array_split(tone(1000, rate), 100))
+    assert len(out) == 16000
+    np.testing.assert_allclose(out[1000:-1000], tone(1000, 16000)[1000:-1000], atol=1e-3)
+
+
+@pytest.mark.parametrize("rate", [44100, 48000])
+def test_resampler_carries_state_across_blocks(rate: int) -> None:
+    """Irregular blocks give the same output as one block."""
+    x = np.random.default_rng(0).standard_normal(rate).astype(np.float32)
+    sizes = np.random.default_rng(1).integers(1, 1000, 200)
+    blocks = np.split(x, np.cumsum(sizes)[np.cumsum(sizes) < len(x)])
+
+    streamed = run(PolyphaseResampler(rate), blocks)
+    whole = run(PolyphaseResampler(rate), [x])
+
+    np.testing.assert_allclose(streamed, whole, atol=1e-5)
+
+
+def test_resample_operator_stamps_blocks() -> None:
+    """Each output block is stamped like its newest output sample."""
+    blocks = [stamp(b, 1.0 + i * 0.01) for i, b in enumerate(np.split(tone(1000, 48000), 100))]
+    out: list[np.ndarray] = []
+    rx.from_iterable(blocks).pipe(resample(48000), ops.to_list()).subscribe(out.extend)
+
+    assert sum(len(b) for b in out) == 16000
+    stamps = [captured_at(b) for b in out]
+    assert all(s is not None and s <= 1.0 + i * 0.01 for i, s in enumerate(stamps[:-1]))
+
+
+def test_resample_passes_through_equal_rates() -> None:
+    block = tone(1000, 16000)
+    out: list[np.ndarray] = []
+    rx.of(block).pipe(resample(16000)).subscribe(out.append)
+    assert out[0] is block
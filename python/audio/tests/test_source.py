@@ -0,0 +1,81 @@
+"""Tests for ring_stream capture."""
+
+import threading
+from types import SimpleNamespace
+from typing import Any, ClassVar
+
+import numpy as np
+import pytest
+from reactivex.subject import Subject
+
+from audio import source
+from audio.capture import CaptureMetrics, CaptureOptions
+from audio.source import ring_stream
+
+
+class FakeInputStream:
+    """InputStream whose callback is driven by the test instead of a device."""
+
+    instances: ClassVar[list["FakeInputStream"]] = []
+
+    def __init__(self, callback: Any, **_kwargs: Any) -> None:
+        self.callback = callback
+        self.active = False
+        self.closed = False
+        FakeInputStream.instances.append(self)
+
+    def start(self) -> None:
+        self.active = True
+
+    def stop(self) -> None:
+        self.active = False
+
+    def close(self) -> None:
+        self.closed = True
+
+    def write(self, start: int, n: int) -> None:
+        data = np.arange(start, start + n, dtype=np.float32).reshape(-1, 1)
+        time_info = SimpleNamespace(inputBufferAdcTime=0.0, currentTime=0.0)
+        self.callback(data, n, time_info, SimpleNamespace(input_overflow=False))
+
+
+@pytest.fixture
+def device(monkeypatch: pytest.MonkeyPatch) -> type[FakeInputStream]:
+    FakeInputStream.instances = []
+    monkeypatch.setattr(source.sd, "InputStream", FakeInputStream)
+    return FakeInputStream
+
+
+def test_ring_stream_until_emits_the_tail_then_completes(
+    device: type[FakeInputStream],
+) -> None:
+    """Audio written after the last drain still arrives when capture is stopped."""
+    until: Subject[None] = Subject()
+    metrics = CaptureMetrics()
+    batches: list[np.ndarray] = []
+    completed = threading.Event()
+    options = CaptureOptions(drain_interval=60.0)  # no batch before until
+
+    ring_stream(None, options, metrics, until=until).subscribe(
+        on_next=batches.append, on_completed=completed.set
+    )
+    stream = device.instances[0]
+    stream.write(0, 160)
+    stream.write(160, 160)
+    until.on_next(None)
+
+    assert completed.is_set()
+    np.testing.assert_array_equal(np.concatenate(batches), np.arange(0, 320))
+    assert not stream.active
+    assert stream.closed
+
+
+def test_ring_stream_dispose_closes_the_stream(device: type[FakeInputStream]) -> None:
+    subscription = ring_stream(None, CaptureOptions(drain_interval=60.0)).subscribe()
+    stream = device.instances[0]
+
+    subscription.dispose()
+    subscription.dispose()
+
+    assert not stream.active
+    assert stream.closed
@@ -0,0 +1,99 @@
+"""Tests for speculative dual-model transcription."""
+
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+import reactivex as rx
+from reactivex import Observable
+from reactivex.subject import Subject
+
+from audio.speculative import TranscriptEvent, WindowIds, speculative_transcribe
+from audio.types import AudioChunk
+
+
+def transcriber(*texts: str) -> Mock:
+    """Transcriber answering each window synchronously with the next text."""
+    mock = Mock()
+    mock.transcribe = Mock(side_effect=[rx.of(t) for t in texts])
+    return mock
+
+
+def run(
+    draft: Mock, confirm: Mock, chunks: int, ids: WindowIds | None = None
+) -> list[TranscriptEvent]:
+    """Push chunks of 512 samples through a 1024/2048 sample speculative transcriber."""
+    source: Subject[AudioChunk] = Subject()
+    events: list[TranscriptEvent] = []
+    source.pipe(speculative_transcribe(draft, confirm, 1024, 2048, ids)).subscribe(
+        on_next=events.append
+    )
+    for _ in range(chunks):
+        source.on_next(np.zeros(512, dtype=np.float32))
+    source.on_completed()
+    return events
+
+
+def summary(events: list[TranscriptEvent]) -> list[tuple[str, str, int, tuple[int, ...]]]:
+    return [(e.text, e.confidence, e.window_id, e.corrects_window_ids) for e in events]
+
+
+def test_speculative_transcribe_merges_drafts_and_confirmations() -> None:
+    """Drafts come every window, confirmations correct all windows since the last one."""
+    draft = transcriber("a", "a b", "a b c", "a b c d")
+    confirm = transcriber("A B", "A B C D")
+
+    events = run(draft, confirm, chunks=8)
+
+    assert summary(events) == [
+        ("a", "draft", 0, (0,)),
+        ("a b", "draft", 1, (1,)),
+        ("A B", "confirmed", 1, (0, 1)),
+        ("a b c", "draft", 2, (2,)),
+        ("a b c d", "draft", 3, (3,)),
+        ("A B C D", "confirmed", 3, (2, 3)),
+    ]
+
+
+def test_speculative_transcribe_drops_drafts_older_than_confirmation() -> None:
+    """A draft finishing after its window was confirmed is not emitted."""
+    late: Subject[str] = Subject()
+    draft = Mock()
+    draft.transcribe = Mock(side_effect=[rx.of("a"), late])
+    confirm = transcriber("A B")
+
+    events = run(draft, confirm, chunks=4)
+    late.on_next("a b")
+
+    assert summary(events) == [("a", "draft", 0, (0,)), ("A B", "confirmed", 1, (0, 1))]
+
+
+def test_speculative_transcribe_ids_increase_across_pipelines() -> None:
+    """Sharing WindowIds keeps numbering going, e.g. after a model switch."""
+    ids = WindowIds()
+    run(transcriber("a", "b"), transcriber("B"), chunks=4, ids=ids)
+
+    events = run(transcriber("c", "d"), transcriber("D"), chunks=4, ids=ids)
+
+    assert summary(events) == [
+        ("c", "draft", 2, (2,)),
+        ("d", "draft", 3, (3,)),
+        ("D", "confirmed", 3, (2, 3)),
+    ]
+
+
+def test_speculative_transcribe_requires_aligned_intervals() -> None:
+    """The confirm interval must be a whole number of draft intervals, in whole chunks."""
+
+    def never(_: AudioChunk) -> Observable[str]:
+        return rx.never()
+
+    def models() -> tuple[Mock, Mock]:
+        return Mock(transcribe=never), Mock(transcribe=never)
+
+    with pytest.raises(ValueError, match="multiple"):
+        speculative_transcribe(*models(), 1024, 1536)
+    # 2x in samples, but 2 and 3 chunks: confirm IDs would not be draft IDs
+    with pytest.raises(ValueError, match="multiple"):
+        speculative_transcribe(*models(), 700, 1400)
+    speculative_transcribe(*models(), 1000, 2048)  # 2 and 4 chunks
@@ -0,0 +1,134 @@
+"""Tests for streaming_transcribe operator."""
+
+from unittest.mock import Mock
+
+import numpy as np
+import reactivex as rx
+from reactivex import Observable
+from reactivex.scheduler import ImmediateScheduler
+
+from audio.streaming import StreamingUpdate, Word, local_agreement, streaming_transcribe
+from audio.types import AudioChunk
+from audio.whisper import Segment
+
+WORD = 1600  # one word per 10 centiseconds of audio
+
+
+def chunk(value: float) -> AudioChunk:
+    return np.full(WORD, value, dtype=np.float32)
+
+
+def mock_transcriber(stable: bool = True) -> Mock:
+    """Transcriber that reads one word per WORD samples, named after the sample value.
+
+    Results are emitted synchronously, so every decode finishes before the next chunk.
+
+    With stable=False every decode labels words differently, so hypotheses never agree.
+    """
+    transcriber = Mock()
+    transcriber.windows = []
+    transcriber.prompts = []
+
+    def transcribe_segments(
+        samples: AudioChunk, prompt: str | None = None, word_timestamps: bool = False
+    ) -> Observable[list[Segment]]:
+        transcriber.windows.append(len(samples))
+        transcriber.prompts.append(prompt)
+        call = len(transcriber.windows)
+        segments = []
+        for i in range(0, len(samples), WORD):
+            name = f"w{int(samples[i])}" if stable else f"w{int(samples[i])}-{call}"
+            segments.append(Segment(i // 160, (i + WORD) // 160, f" {name}"))
+        return rx.from_iterable([segments], scheduler=ImmediateScheduler())
+
+    transcriber.transcribe_segments = Mock(side_effect=transcribe_segments)
+    return transcriber
+
+
+def whole_window_transcriber(words: bool = True) -> Mock:
+    """Transcriber reading the whole window as one word, named after the call, or none."""
+    transcriber = Mock()
+    transcriber.windows = []
+
+    def transcribe_segments(
+        samples: AudioChunk, prompt: str | None = None, word_timestamps: bool = False
+    ) -> Observable[list[Segment]]:
+        transcriber.windows.append(len(samples))
+        call = len(transcriber.windows)
+        segments = [Segment(0, len(samples) // 160, f" c{call}")] if words else []
+        return rx.from_iterable([segments], scheduler=ImmediateScheduler())
+
+    transcriber.transcribe_segments = Mock(side_effect=transcribe_segments)
+    return transcriber
+
+
+def run(transcriber: Mock, values: range, window_size: int) -> list[StreamingUpdate]:
+    updates: list[StreamingUpdate] = []
+    completed: list[bool] = []
+    rx.from_iterable([chunk(v) for v in values]).pipe(
+        streaming_transcribe(transcriber, window_size=window_size, emit_interval=WORD),
+    ).subscribe(on_next=updates.append, on_completed=lambda: completed.append(True))
+    assert completed == [True]
+    return updates
+
+
+def committed_text(updates: list[StreamingUpdate]) -> str:
+    return " ".join(u.committed for u in updates if u.committed)
+
+
+def test_local_agreement_counts_common_prefix() -> None:
+    """Words match by normalized text, stopping at the first difference."""
+    prev = [Word(0, 1, "Hello,"), Word(1, 2, "world"), Word(2, 3, "again")]
+    cur = [Word(0, 1, "hello"), Word(1, 2, "World."), Word(2, 3, "then")]
+    assert local_agreement(prev, cur) == 2
+    assert local_agreement([], cur) == 0
+
+
+def test_streaming_commits_agreed_words_and_trims_audio() -> None:
+    """Agreed words are committed once, and decodes only see the uncommitted tail."""
+    transcriber = mock_transcriber()
+    updates = run(transcriber, range(1, 11), window_size=WORD * 4)
+
+    assert committed_text(updates) == " ".join(f"w{v}" for v in range(1, 11))
+    assert max(transcriber.windows) <= 2 * WORD
+    assert transcriber.prompts[0] is None
+    assert transcriber.prompts[-1].endswith("w8")
+
+
+def test_streaming_first_hypothesis_is_tentative() -> None:
+    """A single hypothesis is not committed until a second one agrees."""
+    transcriber = mock_transcriber()
+    updates = run(transcriber, range(1, 3), window_size=WORD * 4)
+
+    assert updates[0] == StreamingUpdate("", "w1")
+    assert updates[1] == StreamingUpdate("w1", "w2")
+    assert updates[-1] == StreamingUpdate("w2", "")
+
+
+def test_streaming_long_utterance_without_agreement_loses_nothing() -> None:
+    """When hypotheses never agree, words are force-committed before the window overflows."""
+    transcriber = mock_transcriber(stable=False)
+    updates = run(transcriber, range(1, 21), window_size=WORD * 4)
+
+    words = committed_text(updates).split()
+    assert [w.split("-")[0] for w in words] == [f"w{v}" for v in range(1, 21)]
+    assert max(transcriber.windows) <= WORD * 4
+
+
+def test_streaming_overflow_commits_single_word_hypothesis() -> None:
+    """A one-word hypothesis is force-committed on overflow instead of dropping its audio."""
+    transcriber = whole_window_transcriber()
+    updates = run(transcriber, range(1, 21), window_size=WORD * 4)
+
+    assert sum(u.dropped for u in updates) == 0
+    assert committed_text(updates).split() == [f"c{n}" for n in (4, 8, 12, 16, 20)]
+    assert max(transcriber.windows) <= WORD * 4
+
+
+def test_streaming_overflow_reports_dropped_audio() -> None:
+    """Audio no decode found words in is counted as dropped when the window overflows."""
+    transcriber = whole_window_transcriber(words=False)
+    updates = run(transcriber, range(1, 21), window_size=WORD * 4)
+
+    assert committed_text(updates) == ""
+    assert sum(u.dropped for u in updates) == 16 * WORD
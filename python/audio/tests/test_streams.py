@@ -6,7 +6,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from audio.stream import download_audio
+from audio.stream import download_audio, stream_audio
 
 FIXTURES_DIR = Path(__file__).parent / ".fixtures"
 VIDEO_ID = "dQw4w9WgXcQ"
@@ -48,3 +48,58 @@ async def test_download_audio_emits_chunked_audio(
     assert len(results[0][1]) > 0  # Real chunks from fixture
     assert completed == [True]
     mock_ydl.extract_info.assert_called_once()
+
+
+class FakeChunks:
+    """Stand-in for the native AudioChunks iterator."""
+
+    def __init__(self, path: str, chunk_duration_ms: int) -> None:
+        self.path = path
+        self.chunk_duration_ms = chunk_duration_ms
+        self.remaining = [b"a", b"b", b"c"]
+        self.closed = False
+
+    def __iter__(self) -> "FakeChunks":
+        return self
+
+    def __next__(self) -> bytes:
+        if not self.remaining:
+            raise StopIteration
+        return self.remaining.pop(0)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.mark.asyncio
+@patch("audio.stream.AudioChunks")
+@patch("audio.stream.tempfile.TemporaryDirectory")
+@patch("audio.stream.YoutubeDL")
+async def test_stream_audio_emits_chunks_one_at_a_time(
+    mock_ydl_class: MagicMock, mock_tmpdir: MagicMock, mock_chunks: MagicMock
+) -> None:
+    """Chunks are emitted individually, the iterator is closed and the download removed."""
+    mock_tmpdir.return_value.name = str(FIXTURES_DIR)
+    mock_tmpdir.return_value.cleanup = MagicMock()
+    mock_ydl = MagicMock()
+    mock_ydl_class.return_value = mock_ydl
+    mock_ydl.__enter__.return_value = mock_ydl
+    mock_ydl.extract_info.return_value = {"id": VIDEO_ID}
+    chunks = FakeChunks(str(FIXTURES_DIR / f"{VIDEO_ID}.mp3"), 10_000)
+    mock_chunks.return_value = chunks
+
+    results: list[bytes] = []
+    completed = asyncio.Event()
+    loop = asyncio.get_running_loop()
+
+    def on_completed() -> None:
+        loop.call_soon_threadsafe(completed.set)
+
+    obs = stream_audio(f"https://www.youtube.com/watch?v={VIDEO_ID}", chunk_duration_ms=10_000)
+    obs.subscribe(on_next=results.append, on_completed=on_completed)
+
+    await asyncio.wait_for(completed.wait(), timeout=1.0)
+    assert results == [b"a", b"b", b"c"]
+    mock_chunks.assert_called_once_with(chunks.path, 10_000)
+    assert chunks.closed
+    mock_tmpdir.return_value.cleanup.assert_called_once()
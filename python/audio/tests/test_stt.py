@@ -1,20 +1,35 @@
 """Tests for recorder speech-to-text pipeline."""
 
-from collections.abc import Generator
+import time
+from collections.abc import Callable, Generator
+from concurrent.futures import Executor, Future
 from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Any
+from typing import TYPE_CHECKING, Any
 from unittest.mock import Mock
 
 import numpy as np
 import reactivex as rx
+import reactivex.operators as ops
 from reactivex import Observable
 from reactivex.testing.marbles import MarblesContext, marbles_testing
+from streams import Metrics
 
 from audio.config import AppConfig, TunableVad, TunableWhisperModel
+from audio.latency import Transcript, stamp
 from audio.source import AudioSource
-from audio.stt import RecorderDependencies, recorder
+from audio.stt import (
+    DeviceTranscript,
+    RecorderDependencies,
+    multi_recorder,
+    recorder,
+    speculative_recorder,
+)
 from audio.types import AudioChunk, DeviceMeta
+from audio.whisper import Segment
+
+if TYPE_CHECKING:
+    from audio.speculative import TranscriptEvent
 
 type Lookup = dict[str | float, Any]
 
@@ -46,6 +61,18 @@ def mock_transcriber(text: str) -> Mock:
     return transcriber
 
 
+class InlineExecutor(Executor):
+    """Executor running tasks synchronously, so background loads fit in virtual time."""
+
+    def submit[T](self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> Future[T]:
+        future: Future[T] = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
 def mock_device_meta(name: str = "test") -> DeviceMeta:
     """Create DeviceMeta with sensible defaults for testing."""
     return {
@@ -144,7 +171,185 @@ def test_recorder_transcribes_single_utterance() -> None:
         # injectd w/ a TranscriberFactor. Or we need TunableWhisperModels to be transcribers
         transcriber = mock_transcriber("hello")
         vad = mock_vad({0.0: 0.0, 1.0: 1.0})
-        deps = RecorderDependencies(vad=lambda: vad, whisper=transcriber)
+        deps = RecorderDependencies(vad=lambda: vad, whisper=transcriber, executor=InlineExecutor())
 
         result = start(tunables.pipe(recorder(source, cfg, deps)))
         assert result == expected
+        assert deps.switches.stats.switches == 1
+
+
+def test_recorder_reports_stage_metrics() -> None:
+    """Every stage of an instrumented recorder reports under its name."""
+    with audio_testing(
+        source="a----|",
+        audio=" s-h-s|",
+        tune="  (vw)|",
+        exp="   ----h|",
+    ) as test:
+        (start, _cold, _hot, _exp) = test.marbles
+        metrics = Metrics()
+        vad = mock_vad({0.0: 0.0, 1.0: 1.0})
+        deps = RecorderDependencies(
+            vad=lambda: vad,
+            whisper=mock_transcriber("hello"),
+            executor=InlineExecutor(),
+            metrics=metrics,
+        )
+
+        cfg = AppConfig(vad_options=INSTANT_VAD)
+        result = start(test.tunables.pipe(recorder(test.source, cfg, deps)))
+        assert result == test.expected
+
+    stats = metrics.snapshot()
+    assert set(stats) == {"source", "rechunk", "vad_gate", "window", "transcribe", "output"}
+    assert stats["source"].outputs == stats["rechunk"].items > 0
+    assert stats["transcribe"].items == stats["transcribe"].outputs == 1
+    assert stats["output"].items == 1
+
+
+def test_recorder_reports_end_of_speech_latency() -> None:
+    """Transcripts of stamped audio carry latency, recorded once per utterance."""
+    with marbles_testing() as (start, cold, _hot, _exp):
+        captured = time.perf_counter() - 1.0  # audio captured a second ago
+        silence = stamp(chunk(0.0), captured)
+        speech = stamp(chunk(1.0), captured)
+        audio = cold("s-h-s|", {"s": silence, "h": speech})  # type: ignore[call-arg]
+        source = cold("a----|", {"a": make_audio_source("mic", audio)})  # type: ignore[call-arg]
+        tunables = cold(  # type: ignore[call-arg]
+            "(vw)|", {"v": INSTANT_VAD, "w": TunableWhisperModel()}
+        )
+        transcriber = mock_transcriber("hello")
+        transcriber.name = "small"
+        vad = mock_vad({0.0: 0.0, 1.0: 1.0})
+        deps = RecorderDependencies(vad=lambda: vad, whisper=transcriber, executor=InlineExecutor())
+        transcripts: list[str] = []
+
+        start(
+            tunables.pipe(
+                recorder(source, AppConfig(vad_options=INSTANT_VAD), deps),
+                ops.do_action(on_next=transcripts.append),
+            )
+        )
+
+    assert transcripts == ["hello"]
+    transcript = transcripts[0]
+    assert isinstance(transcript, Transcript)
+    assert transcript.latency is not None
+    assert transcript.latency >= 1.0
+    assert deps.latency.by_session()["mic"].count == 1
+    assert deps.latency.by_model()["small"].p50 >= 1.0
+
+
+def test_recorder_streaming_transcribes_single_utterance() -> None:
+    """With cfg.streaming the utterance is decoded by streaming_transcribe, not by windows."""
+    with audio_testing(
+        source="a----|",
+        audio=" s-h-s|",
+        tune="  (vw)|",
+        exp="   ----h|",
+    ) as test:
+        (start, _cold, _hot, _exp) = test.marbles
+        transcriber = mock_transcriber("unused")
+        transcriber.transcribe_segments = Mock(return_value=rx.of([Segment(0, 3, " hello")]))
+        vad = mock_vad({0.0: 0.0, 1.0: 1.0})
+        deps = RecorderDependencies(vad=lambda: vad, whisper=transcriber, executor=InlineExecutor())
+
+        cfg = AppConfig(vad_options=INSTANT_VAD, streaming=True)
+        result = start(test.tunables.pipe(recorder(test.source, cfg, deps)))
+        assert result == test.expected
+
+    transcriber.transcribe.assert_not_called()
+    assert transcriber.transcribe_segments.call_count == 1  # once, as the utterance ends
+
+
+def test_speculative_recorder_drafts_then_confirms() -> None:
+    """Each chunk of speech gets a draft, every second chunk a confirmation."""
+    with marbles_testing() as (start, cold, _hot, _exp):
+        audio = cold("s-h-h-s|", {"s": chunk(0.0), "h": chunk(1.0)})  # type: ignore[call-arg]
+        source = cold("a------|", {"a": make_audio_source("mic", audio)})  # type: ignore[call-arg]
+        tunables = cold(  # type: ignore[call-arg]
+            "(vw)|", {"v": INSTANT_VAD, "w": TunableWhisperModel()}
+        )
+        vad = mock_vad({0.0: 0.0, 1.0: 1.0})
+        deps = RecorderDependencies(
+            vad=lambda: vad,
+            whisper=mock_transcriber("final"),
+            draft=mock_transcriber("draft"),
+            executor=InlineExecutor(),
+        )
+        cfg = AppConfig(
+            vad_options=INSTANT_VAD, draft_emit_interval=512, confirm_emit_interval=1024
+        )
+        events: list[TranscriptEvent] = []
+
+        start(tunables.pipe(speculative_recorder(source, cfg, deps), ops.do_action(events.append)))
+
+    assert [(e.text, e.window_id, e.corrects_window_ids) for e in events] == [
+        ("draft", 0, (0,)),
+        ("draft", 1, (1,)),
+        ("final", 1, (0, 1)),
+        ("draft", 2, (2,)),
+        ("final", 2, (2,)),
+    ]
+
+
+def test_multi_recorder_tags_transcripts_by_device() -> None:
+    """Every source is gated on its own and transcribed through the shared pool."""
+    with marbles_testing() as (start, cold, _hot, _exp):
+        speech = cold("s-h-s|", {"s": chunk(0.0), "h": chunk(1.0)})  # type: ignore[call-arg]
+        silence = cold("s-s-s|", {"s": chunk(0.0)})  # type: ignore[call-arg]
+        sources = cold(  # type: ignore[call-arg]
+            "(a,b,c)|",
+            {
+                "a": make_audio_source("kitchen", speech),
+                "b": make_audio_source("hall", silence),
+                "c": make_audio_source("office", speech),
+            },
+        )
+        tunables = cold(  # type: ignore[call-arg]
+            "(vw)|", {"v": INSTANT_VAD, "w": TunableWhisperModel()}
+        )
+        vad = mock_vad({0.0: 0.0, 1.0: 1.0})
+        transcriber = mock_transcriber("hello")
+        deps = RecorderDependencies(vad=lambda: vad, whisper=transcriber, executor=InlineExecutor())
+        transcripts: list[DeviceTranscript] = []
+
+        start(
+            tunables.pipe(
+                multi_recorder(sources, AppConfig(vad_options=INSTANT_VAD), deps),
+                ops.do_action(on_next=transcripts.append),
+            )
+        )
+
+    assert sorted((t.device, t.text) for t in transcripts) == [
+        ("kitchen", "hello"),
+        ("office", "hello"),
+    ]
+    assert deps.latency.by_session().keys() <= {"kitchen", "office"}
+
+
+def device_of(transcript: DeviceTranscript) -> str:
+    return transcript.device
+
+
+def test_multi_recorder_runs_until_audio_ends() -> None:
+    """A finite list of sources completes at once; the recorder ends with the audio."""
+    with marbles_testing() as (start, cold, _hot, exp):
+        speech = cold("s-h-s-h-s|", {"s": chunk(0.0), "h": chunk(1.0)})  # type: ignore[call-arg]
+        silence = cold("s-s-s|", {"s": chunk(0.0)})  # type: ignore[call-arg]
+        sources = rx.of(make_audio_source("kitchen", speech), make_audio_source("hall", silence))
+        tunables = cold(  # type: ignore[call-arg]
+            "(vw)|", {"v": INSTANT_VAD, "w": TunableWhisperModel()}
+        )
+        vad = mock_vad({0.0: 0.0, 1.0: 1.0})
+        deps = RecorderDependencies(
+            vad=lambda: vad, whisper=mock_transcriber("hello"), executor=InlineExecutor()
+        )
+
+        result = start(
+            tunables.pipe(
+                multi_recorder(sources, AppConfig(vad_options=INSTANT_VAD), deps),
+                ops.map(device_of),
+            )
+        )
+        assert result == exp("----k---k|", {"k": "kitchen"})  # type: ignore[call-arg]
@@ -1,15 +1,26 @@
 """Tests for VAD gate operator."""
 
+from pathlib import Path
 from typing import Any
 from unittest.mock import Mock
 
 import numpy as np
+import pytest
 import reactivex as rx
+import reactivex.operators as ops
+from reactivex.subject import Subject
 from reactivex.testing.marbles import marbles_testing
 
-from audio.config import TunableVad
+from audio.config import VAD_SENTENCE, VAD_STORY, TunableVad
 from audio.types import AudioChunk
-from audio.vad import vad_gate, while_speaking
+from audio.vad import (
+    SpeechSegment,
+    detect_speech,
+    pause_points,
+    smooth_probabilities,
+    vad_gate,
+    while_speaking,
+)
 
 type Lookup = dict[str | float, Any]
 
@@ -129,3 +140,76 @@ def test_vad_gate_all_silence() -> None:
 
         result = start(source.pipe(vad_gate(model, rx.of(INSTANT))))
         assert result == expected
+
+
+def smooth_reference(probs: np.ndarray, attack: float, decay: float) -> list[float]:
+    """The per-chunk smoothing loop from vad_gate."""
+    avg = 0.0
+    out = []
+    for prob in map(float, probs):
+        alpha = attack if prob > avg else decay
+        avg = alpha * prob + (1 - alpha) * avg
+        out.append(avg)
+    return out
+
+
+@pytest.mark.parametrize("opts", [INSTANT, SLOW_DECAY, VAD_SENTENCE, VAD_STORY])
+def test_smooth_probabilities_matches_sequential(opts: TunableVad) -> None:
+    """Bulk attack/decay smoothing equals the one-float-at-a-time loop."""
+    probs = np.random.default_rng(0).random(2000).astype(np.float32)
+    expected = smooth_reference(probs, opts.attack, opts.decay)
+    np.testing.assert_allclose(
+        smooth_probabilities(probs, opts.attack, opts.decay), expected, atol=1e-9
+    )
+
+
+def test_detect_speech_matches_vad_gate() -> None:
+    """Offline segments cover exactly the frames the repeating Rx gate passes."""
+    rng = np.random.default_rng(1)
+    # alternating stretches of silence and speech with noisy probabilities
+    levels = np.repeat(rng.choice([0.05, 0.95], size=40), rng.integers(1, 20, size=40))
+    probs = np.clip(levels + rng.normal(0, 0.1, len(levels)), 0, 1).astype(np.float32)
+    frames = np.zeros((len(probs), 4), dtype=np.float32)
+    frames[:, 0] = probs
+    frames[:, 1] = np.arange(len(probs))
+
+    def model(chunk: AudioChunk) -> float:
+        return float(chunk[0])
+
+    gated: list[int] = []
+    subject: Subject[AudioChunk] = Subject()
+    subject.pipe(vad_gate(model, rx.of(VAD_SENTENCE)), ops.repeat()).subscribe(
+        on_next=lambda chunk: gated.append(int(chunk[1]))
+    )
+    for frame in frames:
+        subject.on_next(frame)
+
+    result = detect_speech(model, frames.reshape(-1), VAD_SENTENCE, frame_size=4)
+    offline = [i for s in result.segments for i in range(s.start // 4, s.end // 4)]
+    assert result.segments
+    assert offline == gated
+
+
+def test_detect_speech_reads_memmap(tmp_path: Path) -> None:
+    """A read-only memory-mapped file is accepted and the last frame is zero-padded."""
+    path = tmp_path / "speech.raw"
+    np.concatenate([np.zeros(1024), np.ones(1500)]).astype(np.float32).tofile(path)
+    samples = np.memmap(path, dtype=np.float32, mode="r")
+    seen: list[AudioChunk] = []
+
+    def model(chunk: AudioChunk) -> float:
+        seen.append(chunk.copy())
+        return float(chunk.max())
+
+    result = detect_speech(model, samples, INSTANT)
+
+    assert len(result.probs) == 5
+    assert seen[-1][476:].sum() == 0.0
+    assert result.segments == [SpeechSegment(1024, 2524)]
+
+
+def test_pause_points_are_gap_midpoints() -> None:
+    """Split points fall in the middle of each pause between segments."""
+    segments = [SpeechSegment(0, 100), SpeechSegment(300, 400), SpeechSegment(410, 500)]
+    assert pause_points(segments) == [200, 405]
+    assert pause_points(segments[:1]) == []
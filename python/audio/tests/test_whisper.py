@@ -1,13 +1,14 @@
 """Tests for Transcriber."""
 
 import threading
+import time
 from unittest.mock import MagicMock
 
 import numpy as np
 
-from audio._stt import Whisper
+from audio._stt import CancelToken, TranscriptionAbortedError, Whisper
 from audio.types import AudioChunk
-from audio.whisper import CHUNK_SIZE, Transcriber
+from audio.whisper import CHUNK_SIZE, Segment, Transcriber, Transcription
 
 
 def chunk(value: float = 0.0) -> AudioChunk:
@@ -20,9 +21,13 @@ def mock_whisper(responses: dict[float, str] | None = None) -> MagicMock:
     responses = responses or {}
     mock = MagicMock(spec=Whisper)
     mock.calls = []
+    mock.audio_lens = []
 
-    def transcribe(samples: AudioChunk) -> str:
+    def transcribe(
+        samples: AudioChunk, _cancel: CancelToken | None = None, audio_len: int | None = None
+    ) -> str:
         mock.calls.append(samples)
+        mock.audio_lens.append(audio_len)
         key = round(float(samples[0]), 1)
         return responses.get(key, "")
 
@@ -49,3 +54,111 @@ def test_transcriber_transcribes_window() -> None:
 
     assert results == ["hello world"]
     assert len(whisper.calls) == 1
+    assert whisper.audio_lens == [CHUNK_SIZE * 2]
+
+
+def test_transcriber_fits_encoder_to_audio_len() -> None:
+    """An explicit audio_len is passed through for zero-padded windows."""
+    whisper = mock_whisper({1.0: "hi"})
+    window = np.zeros(CHUNK_SIZE * 4, dtype=np.float32)
+    window[:CHUNK_SIZE] = 1.0
+    done = threading.Event()
+
+    Transcriber(whisper).transcribe(window, audio_len=CHUNK_SIZE).subscribe(on_completed=done.set)
+
+    done.wait(timeout=5.0)
+    assert whisper.audio_lens == [CHUNK_SIZE]
+
+
+def test_transcriber_exposes_max_concurrency() -> None:
+    """Transcriber reports the native state pool size."""
+    whisper = mock_whisper()
+    whisper.max_concurrency = 3
+    assert Transcriber(whisper).max_concurrency == 3
+
+
+def test_transcriber_dispose_aborts_decode() -> None:
+    """Disposing a running transcription cancels the native decode and counts it."""
+    whisper = MagicMock(spec=Whisper)
+    started = threading.Event()
+    aborted = threading.Event()
+
+    def transcribe(
+        samples: AudioChunk, cancel: CancelToken | None = None, _audio_len: int | None = None
+    ) -> str:
+        if float(samples[0]) == 0.0:
+            time.sleep(0.05)  # a completed decode, to estimate the cost of one
+            return "done"
+        started.set()
+        while cancel is not None and not cancel.cancelled:
+            time.sleep(0.001)
+        aborted.set()
+        raise TranscriptionAbortedError("aborted")
+
+    whisper.transcribe.side_effect = transcribe
+    transcriber = Transcriber(whisper)
+
+    done = threading.Event()
+    transcriber.transcribe(chunk(0.0)).subscribe(on_completed=done.set)
+    done.wait(timeout=5.0)
+
+    subscription = transcriber.transcribe(chunk(1.0)).subscribe()
+    started.wait(timeout=5.0)
+    subscription.dispose()
+
+    assert aborted.wait(timeout=5.0)
+    deadline = time.monotonic() + 5.0
+    while transcriber.stats.aborted == 0 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    assert transcriber.stats.completed == 1
+    assert transcriber.stats.aborted == 1
+    assert transcriber.stats.cpu_seconds_saved > 0.0
+
+
+def test_transcriber_transcribe_long_returns_segments() -> None:
+    """Long-form transcription passes workers and split points, and wraps segments."""
+    whisper = MagicMock(spec=Whisper)
+    whisper.transcribe_long.return_value = [(0, 150, " hello"), (3000, 3100, " world")]
+    samples = np.zeros(16000 * 60, dtype=np.float32)
+    results: list[list[Segment]] = []
+    done = threading.Event()
+
+    Transcriber(whisper).transcribe_long(samples, 4, [480_000]).subscribe(
+        on_next=results.append, on_completed=done.set
+    )
+
+    done.wait(timeout=5.0)
+    assert results == [[Segment(0, 150, " hello"), Segment(3000, 3100, " world")]]
+    args = whisper.transcribe_long.call_args.args
+    assert args[1:3] == (4, [480_000])
+
+
+def test_transcriber_transcribe_detailed_wraps_arrays() -> None:
+    """The structured result keeps segments and tokens as arrays, and agrees with the text."""
+    whisper = MagicMock(spec=Whisper)
+    whisper.transcribe_detailed.return_value = (
+        np.array([0, 150], dtype=np.int64),
+        np.array([150, 300], dtype=np.int64),
+        [" hello", " world"],
+        np.array([0.01, 0.02], dtype=np.float32),
+        np.array([0, 1, 3], dtype=np.uintp),
+        np.array([31373, 995, 13], dtype=np.int32),
+        np.array([0.9, 0.8, 0.7], dtype=np.float32),
+        np.zeros(3, dtype=np.int64),
+        np.zeros(3, dtype=np.int64),
+    )
+    window = np.zeros(CHUNK_SIZE * 4, dtype=np.float32)
+    results: list[Transcription] = []
+    done = threading.Event()
+
+    Transcriber(whisper).transcribe_detailed(window, token_timestamps=True).subscribe(
+        on_next=results.append, on_completed=done.set
+    )
+
+    done.wait(timeout=5.0)
+    [result] = results
+    assert result.text == "hello world"
+    assert result.segments() == [Segment(0, 150, " hello"), Segment(150, 300, " world")]
+    assert result.token_ids[result.token_offsets[1] : result.token_offsets[2]].tolist() == [995, 13]
+    args = whisper.transcribe_detailed.call_args.args
+    assert args[3:] == (True, CHUNK_SIZE * 4)
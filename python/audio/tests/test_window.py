@@ -6,10 +6,11 @@ from typing import Any, Self
 import numpy as np
 import reactivex.operators as ops
 from reactivex import Observable
+from reactivex.subject import Subject
 from reactivex.testing.marbles import marbles_testing
 from streams.utils import Operator
 
-from audio.window import window_chunks
+from audio.window import WindowBuffer, window_chunks
 
 type Lookup = dict[str | float, Any]
 
@@ -68,10 +69,10 @@ def make_uut(
 
 
 def test_window_chunks_accumulates_and_emits() -> None:
-    """Accumulates chunks and emits padded window at emit_interval."""
+    """Accumulates chunks and emits the unpadded window at emit_interval."""
     with marbles_testing() as (start, cold, _hot, exp):
         c1, c2 = chunk(1.0), chunk(2.0)
-        w1 = Window([(1.0, 512), (2.0, 512), (0.0, 1024)], 2048)
+        w1 = Window([(1.0, 512), (2.0, 512)], 1024)
         lookup: Lookup = {"a": c1, "b": c2, "x": w1}
 
         source = cold("-a-b-|", lookup)  # type: ignore[call-arg]
@@ -85,8 +86,8 @@ def test_window_chunks_emits_on_complete() -> None:
     """Emits partial window on source completion."""
     with marbles_testing() as (start, cold, _hot, exp):
         c1, c2, c3 = chunk(1.0), chunk(2.0), chunk(3.0)
-        w1 = Window([(1.0, 512), (2.0, 512), (0.0, 1024)], 2048)
-        w2 = Window([(1.0, 512), (2.0, 512), (3.0, 512), (0.0, 512)], 2048)
+        w1 = Window([(1.0, 512), (2.0, 512)], 1024)
+        w2 = Window([(1.0, 512), (2.0, 512), (3.0, 512)], 1536)
         lookup: Lookup = {"a": c1, "b": c2, "c": c3, "x": w1, "y": w2}
 
         source = cold("-a-b-c-|", lookup)  # type: ignore[call-arg]
@@ -109,3 +110,84 @@ def test_window_chunks_slides_at_max_capacity() -> None:
 
         result = start(source.pipe(make_uut(512, 1024, 1024)))
         assert result == expected
+
+
+def test_window_chunks_slides_by_sample() -> None:
+    """Window keeps the latest window_size samples even if chunks don't divide it."""
+    with marbles_testing() as (start, cold, _hot, exp):
+        c1, c2, c3, c4 = chunk(1.0), chunk(2.0), chunk(3.0), chunk(4.0)
+        w1 = Window([(1.0, 512), (2.0, 512)], 1024)
+        w2 = Window([(2.0, 256), (3.0, 512), (4.0, 512)], 1280)
+        lookup: Lookup = {"a": c1, "b": c2, "c": c3, "d": c4, "x": w1, "y": w2}
+
+        source = cold("-a-b-c-d-|", lookup)  # type: ignore[call-arg]
+        expected = exp("---x---y-|", lookup)  # type: ignore[call-arg]
+
+        result = start(source.pipe(make_uut(512, 1280, 1024)))
+        assert result == expected
+
+
+def test_window_chunks_held_windows_survive_later_chunks() -> None:
+    """Windows kept downstream (e.g. queued for a decode) are not overwritten."""
+    source: Subject[np.ndarray] = Subject()
+    windows: list[np.ndarray] = []
+    source.pipe(window_chunks(512, 1024, 512)).subscribe(on_next=windows.append)
+    for value in range(1, 9):
+        source.on_next(chunk(float(value)))
+
+    assert [float(w[-1]) for w in windows] == [float(v) for v in range(1, 9)]
+
+
+def test_window_chunks_resubscribe_starts_empty() -> None:
+    """Each subscription gets its own window (e.g. under ops.repeat)."""
+    with marbles_testing() as (start, cold, _hot, exp):
+        c1 = chunk(1.0)
+        w1 = Window([(1.0, 512)], 512)
+        lookup: Lookup = {"a": c1, "x": w1}
+
+        source = cold("-a|", lookup)  # type: ignore[call-arg]
+        expected = exp("-x-x|", lookup)  # type: ignore[call-arg]
+
+        result = start(source.pipe(make_uut(512, 1024, 512), ops.repeat(2)))
+        assert result == expected
+
+
+def test_window_buffer_full_window_is_view() -> None:
+    """A full window is a read-only view and the buffers are never reallocated."""
+    buf = WindowBuffer(1024)
+    bufs = buf._bufs  # pyright: ignore[reportPrivateUsage]
+    for i in range(16):
+        buf.append(chunk(float(i)))
+        if i >= 1:
+            w = buf.samples()
+            assert any(np.shares_memory(w, b) for b in bufs)
+            assert not w.flags.writeable
+            assert Window.from_array(w) == Window([(float(i - 1), 512), (float(i), 512)], 1024)
+    assert buf._bufs is bufs  # pyright: ignore[reportPrivateUsage]
+
+
+def test_window_buffer_keeps_held_views_and_shrinks_back() -> None:
+    """Held views are never overwritten, and two buffers remain once they are let go."""
+    buf = WindowBuffer(1024)
+    held = []
+    for i in range(8):
+        buf.append(chunk(float(i)))
+        held.append((float(i), buf.samples()))
+    assert all(float(w[-1]) == i for i, w in held)
+    assert len(buf._bufs) > 2  # pyright: ignore[reportPrivateUsage]
+
+    held.clear()
+    for i in range(8):
+        buf.append(chunk(float(i)))
+        buf.samples()
+    assert len(buf._bufs) == 2  # pyright: ignore[reportPrivateUsage]
+
+
+def test_window_buffer_partial_window_is_unpadded_view() -> None:
+    """A partial window is a view of only the samples appended so far."""
+    buf = WindowBuffer(2048)
+    buf.append(chunk(1.0))
+    w = buf.samples()
+    assert len(buf) == 512
+    assert Window.from_array(w) == Window([(1.0, 512)], 512)
+    assert not w.flags.writeable
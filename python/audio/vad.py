@@ -13,11 +13,22 @@ Example:
         on_next=lambda chunk: buffer.append(chunk),
         on_completed=lambda: transcribe(concat(buffer)),
     )
+
+For files and other offline input, detect_speech runs the same smoothing and hysteresis
+over a whole array (or np.memmap) at once:
+
+    result = detect_speech(model, np.memmap("speech.raw", dtype=np.float32, mode="r"))
+    for segment in result.segments:
+        transcribe(samples[segment.start : segment.end])
 """
 
 from collections.abc import Callable
-from typing import Protocol
+from dataclasses import dataclass
+from itertools import pairwise
+from typing import NamedTuple, Protocol, runtime_checkable
 
+import numpy as np
+from numpy.typing import NDArray
 from reactivex import Observable
 from reactivex import operators as ops
 from streams import take_while_inclusive
@@ -26,11 +37,20 @@ from streams.utils import Operator
 from audio.config import TunableVad
 from audio.types import AudioChunk
 
+FRAME_SIZE = 512  # samples per VAD call, 32ms at 16kHz
+
 
 class VADModel(Protocol):
     def __call__(self, chunk: AudioChunk) -> float: ...
 
 
+@runtime_checkable
+class BatchVADModel(VADModel, Protocol):
+    """A VAD model that can also score many frames, shaped (n, frame_size), in one call."""
+
+    def probabilities(self, frames: NDArray[np.float32]) -> NDArray[np.float32]: ...
+
+
 def while_speaking(tunable: Observable[TunableVad]) -> Operator[float, float]:
     def _operator(source: Observable[float]) -> Observable[float]:
         speaking = False
@@ -120,3 +140,158 @@ def vad_gate(
         return skipped.pipe(ops.map(get_chunk))
 
     return _operator
+
+
+# --- Offline (batched) VAD ---
+
+
+class SpeechSegment(NamedTuple):
+    """Sample range [start, end) of one utterance."""
+
+    start: int
+    end: int
+
+
+@dataclass(frozen=True)
+class VadResult:
+    """Per-frame output of detect_speech.
+
+    Attributes:
+        probs: Raw model probability of each frame
+        smoothed: Attack/decay smoothed probability of each frame
+        speaking: Gate state after each frame
+        segments: Speech segments in samples, one per utterance. Like vad_gate, a segment
+            includes the frame that ended it
+    """
+
+    probs: NDArray[np.float32]
+    smoothed: NDArray[np.float64]
+    speaking: NDArray[np.bool_]
+    segments: list[SpeechSegment]
+
+
+def speech_probabilities(
+    model: VADModel, samples: AudioChunk, frame_size: int = FRAME_SIZE
+) -> NDArray[np.float32]:
+    """Run the model over consecutive frames, the last one zero-padded.
+
+    A BatchVADModel scores all whole frames in one call. Otherwise each frame is copied
+    into one reusable writable buffer, so read-only arrays and memory-mapped files can
+    be passed directly.
+    """
+    samples = samples.reshape(-1)
+    n_frames = -(-len(samples) // frame_size)  # ceiling division
+    if isinstance(model, BatchVADModel):
+        whole = len(samples) // frame_size * frame_size
+        tail = np.zeros((n_frames - whole // frame_size, frame_size), dtype=np.float32)
+        tail.reshape(-1)[: len(samples) - whole] = samples[whole:]
+        body = model.probabilities(samples[:whole].reshape(-1, frame_size))
+        return np.concatenate([body, model.probabilities(tail)]).astype(np.float32)
+    probs = np.empty(n_frames, dtype=np.float32)
+    frame = np.zeros(frame_size, dtype=np.float32)
+    for i in range(n_frames):
+        chunk = samples[i * frame_size : (i + 1) * frame_size]
+        frame[: len(chunk)] = chunk
+        frame[len(chunk) :] = 0.0
+        probs[i] = model(frame)
+    return probs
+
+
+def _linear_scan(
+    decay: NDArray[np.float64], drive: NDArray[np.float64], initial: float
+) -> NDArray[np.float64]:
+    """Solve y[t] = decay[t] * y[t-1] + drive[t] for all t with a log-step parallel scan."""
+    c = decay.copy()
+    b = drive.copy()
+    b[0] += c[0] * initial
+    shift = 1
+    while shift < len(b):
+        b[shift:] += c[shift:] * b[:-shift]
+        c[shift:] *= c[:-shift]
+        shift *= 2
+    return b
+
+
+def smooth_probabilities(
+    probs: NDArray[np.float32], attack: float, decay: float, initial: float = 0.0
+) -> NDArray[np.float64]:
+    """Attack/decay EMA over an array, matching vad_gate's per-chunk smoothing.
+
+    Each step uses attack when the probability rises above the running average and decay
+    otherwise. Which one applies depends on the previous average, so the branches are
+    guessed from the last estimate, the EMA is solved for all frames at once, and the
+    computation restarts after the first frame whose guess was wrong. Everything before
+    that frame is exact, and estimates converge within a few passes.
+    """
+    p = probs.astype(np.float64)
+    n = len(p)
+    out = np.empty(n, dtype=np.float64)
+    prev = np.full(n, initial, dtype=np.float64)  # estimated average before each frame
+    start = 0
+    while start < n:
+        rising = p[start:] > prev[start:]
+        alpha = np.where(rising, attack, decay)
+        avg = _linear_scan(1.0 - alpha, alpha * p[start:], prev[start])
+        out[start:] = avg
+        prev[start + 1 :] = avg[:-1]
+        wrong = np.flatnonzero((p[start + 1 :] > avg[:-1]) != rising[1:])
+        if not wrong.size:
+            break
+        start += int(wrong[0]) + 1
+    return out
+
+
+def hysteresis(
+    smoothed: NDArray[np.float64], start: float, stop: float, speaking: bool = False
+) -> NDArray[np.bool_]:
+    """Speaking state after each frame: on above start, off below stop, else unchanged.
+
+    Assumes stop <= start, as in every preset.
+    """
+    n = len(smoothed)
+    on = smoothed > start
+    off = smoothed < stop
+    # index of the latest on/off crossing at or before each frame
+    idx = np.where(on | off, np.arange(n), -1)
+    latest = np.maximum.accumulate(idx) if n else idx
+    return np.where(latest >= 0, on[np.maximum(latest, 0)], speaking)
+
+
+def speech_segments(
+    speaking: NDArray[np.bool_], frame_size: int = FRAME_SIZE
+) -> list[SpeechSegment]:
+    """Convert per-frame gate states into sample ranges, each ending after its stop frame."""
+    edges = np.diff(speaking.astype(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.minimum(np.flatnonzero(edges == -1) + 1, len(speaking))
+    return [
+        SpeechSegment(int(s) * frame_size, int(e) * frame_size)
+        for s, e in zip(starts, ends, strict=True)
+    ]
+
+
+def pause_points(segments: list[SpeechSegment]) -> list[int]:
+    """Midpoints of the pauses between consecutive speech segments, in samples."""
+    return [(a.end + b.start) // 2 for a, b in pairwise(segments)]
+
+
+def detect_speech(
+    model: VADModel,
+    samples: AudioChunk,
+    options: TunableVad | None = None,
+    frame_size: int = FRAME_SIZE,
+) -> VadResult:
+    """Offline equivalent of vad_gate over a whole PCM array or memory-mapped file.
+
+    Probabilities are computed frame by frame without any Rx machinery, then smoothing,
+    hysteresis and segmentation run over the arrays in bulk.
+    """
+    opts = options or TunableVad()
+    probs = speech_probabilities(model, samples, frame_size)
+    smoothed = smooth_probabilities(probs, opts.attack, opts.decay)
+    speaking = hysteresis(smoothed, opts.start, opts.stop)
+    n = samples.size
+    segments = [
+        SpeechSegment(s.start, min(s.end, n)) for s in speech_segments(speaking, frame_size)
+    ]
+    return VadResult(probs, smoothed, speaking, segments)
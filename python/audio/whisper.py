@@ -1,14 +1,21 @@
 """Speech-to-text transcriber wrapping whisper.cpp."""
 
+import os
+import threading
+import time
+from collections.abc import Callable
 from concurrent.futures import Executor
+from dataclasses import dataclass, replace
 from enum import StrEnum
 from os import PathLike
-from typing import Self
+from typing import NamedTuple, Self
 
+import numpy as np
+from numpy.typing import NDArray
 from reactivex import Observable
 from streams import from_thread
 
-from audio._stt import Whisper
+from audio._stt import CancelToken, TranscriptionAbortedError, Whisper
 from audio.types import AudioChunk
 
 
@@ -32,22 +39,246 @@ class WhisperModel(StrEnum):
 SAMPLE_RATE = 16000
 WINDOW_SIZE = SAMPLE_RATE * 30  # 30s Whisper window
 CHUNK_SIZE = 512
+DEFAULT_MAX_CONCURRENCY = 2  # decoder states per model, created on demand
+WHISPER_THREADS = min(4, os.cpu_count() or 1)  # whisper.cpp default n_threads
+SAMPLES_PER_CENTISECOND = SAMPLE_RATE // 100  # whisper timestamps are in 10ms units
+
+
+class Segment(NamedTuple):
+    """Decoded text with start/end times in centiseconds from the start of the window."""
+
+    t0: int
+    t1: int
+    text: str
+
+
+class Transcription(NamedTuple):
+    """Structured result of one decode, as flat arrays (see Transcriber.transcribe_detailed).
+
+    Segment i spans tokens token_offsets[i]:token_offsets[i + 1]. Only text tokens are
+    kept. Times are centiseconds from the start of the window; token times are zero
+    unless token timestamps were requested.
+    """
+
+    segment_t0: NDArray[np.int64]
+    segment_t1: NDArray[np.int64]
+    segment_text: list[str]
+    no_speech_prob: NDArray[np.float32]
+    token_offsets: NDArray[np.uintp]
+    token_ids: NDArray[np.int32]
+    token_probs: NDArray[np.float32]
+    token_t0: NDArray[np.int64]
+    token_t1: NDArray[np.int64]
+
+    @property
+    def text(self) -> str:
+        """The text Transcriber.transcribe would have returned."""
+        return "".join(self.segment_text).strip()
+
+    def segments(self) -> list[Segment]:
+        return [
+            Segment(int(t0), int(t1), text)
+            for t0, t1, text in zip(
+                self.segment_t0, self.segment_t1, self.segment_text, strict=True
+            )
+        ]
+
+
+@dataclass(frozen=True)
+class TranscriberStats:
+    """Counters for decodes run by a Transcriber.
+
+    Attributes:
+        completed: Decodes that ran to the end
+        aborted: Decodes stopped early because their window was superseded
+        decode_seconds: Wall-clock time spent in completed decodes
+        cpu_seconds_saved: Estimated CPU time avoided by aborts. Each abort saves the
+            mean completed decode time minus the time already spent, on WHISPER_THREADS
+    """
+
+    completed: int = 0
+    aborted: int = 0
+    decode_seconds: float = 0.0
+    cpu_seconds_saved: float = 0.0
+
+    def with_completed(self, seconds: float) -> Self:
+        return replace(
+            self, completed=self.completed + 1, decode_seconds=self.decode_seconds + seconds
+        )
+
+    def with_aborted(self, seconds: float) -> Self:
+        mean = self.decode_seconds / self.completed if self.completed else 0.0
+        saved = max(0.0, mean - seconds) * WHISPER_THREADS
+        return replace(
+            self, aborted=self.aborted + 1, cpu_seconds_saved=self.cpu_seconds_saved + saved
+        )
 
 
 class Transcriber:
-    """Whisper transcriber with optional thread pool for blocking operations."""
+    """Whisper transcriber with optional thread pool for blocking operations.
 
-    def __init__(self, whisper: Whisper, executor: Executor | None = None):
+    The native model keeps a pool of reusable decoder states. Up to max_concurrency
+    windows decode at once (bounded also by the executor's workers); further calls wait
+    for a state to free up.
+
+    Disposing a transcription (e.g. when the pipeline switches models) aborts the native
+    decode instead of letting it run to the end.
+    """
+
+    def __init__(
+        self,
+        whisper: Whisper,
+        executor: Executor | None = None,
+        release: Callable[[Whisper], None] | None = None,
+        name: str = "",
+    ):
         self._whisper = whisper
         self._executor = executor
+        self._release = release
+        self._name = name
+        self._closed = False
+        self._in_flight = 0
+        self._stats = TranscriberStats()
+        self._stats_lock = threading.Lock()
+
+    @property
+    def stats(self) -> TranscriberStats:
+        return self._stats
+
+    @property
+    def name(self) -> str:
+        """Label of the loaded model, e.g. for metrics."""
+        return self._name
+
+    @property
+    def max_concurrency(self) -> int:
+        return self._whisper.max_concurrency
 
     def close(self) -> None:
-        self._whisper.close()
+        """Close the model, or hand it back to its owner (e.g. a ModelCache) via release.
+
+        Decodes still running, e.g. aborted ones that have not yet returned, keep the model:
+        it is closed or released when the last of them finishes.
+        """
+        with self._stats_lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._in_flight:
+                return
+        self._finish()
+
+    def _finish(self) -> None:
+        if self._release is None:
+            self._whisper.close()
+        else:
+            self._release(self._whisper)
 
     @classmethod
-    def from_path(cls, model_path: str | PathLike[str], executor: Executor | None = None) -> Self:
-        return cls(Whisper(str(model_path)), executor)
+    def from_path(
+        cls,
+        model_path: str | PathLike[str],
+        executor: Executor | None = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> Self:
+        whisper = Whisper(str(model_path), max_concurrency)
+        return cls(whisper, executor, name=os.path.basename(model_path))
+
+    def warm_up(self) -> None:
+        """Run one blocking decode of 1s of silence, not counted in stats.
+
+        The first decode on a fresh context pays for whisper.cpp's one-time setup. Warming up
+        before a model is put into service keeps that cost off the first real window.
+        """
+        self._whisper.transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32))
+
+    def transcribe(self, window: AudioChunk, audio_len: int | None = None) -> Observable[str]:
+        """Transcribe a single audio window (up to 30s of 16kHz audio).
+
+        The encoder context is sized to audio_len samples, len(window) by default. Pass the
+        real length when the window is zero-padded.
+        """
+        n = len(window) if audio_len is None else audio_len
+        return self._decode(lambda token: self._whisper.transcribe(window, token, n))
+
+    def transcribe_segments(
+        self, window: AudioChunk, prompt: str | None = None, word_timestamps: bool = False
+    ) -> Observable[list[Segment]]:
+        """Transcribe a window into timestamped segments, with optional preceding text."""
+
+        def run(token: CancelToken) -> list[Segment]:
+            segments = self._whisper.transcribe_segments(
+                window, prompt, token, word_timestamps, len(window)
+            )
+            return [Segment(*s) for s in segments]
+
+        return self._decode(run)
+
+    def transcribe_detailed(
+        self,
+        window: AudioChunk,
+        prompt: str | None = None,
+        token_timestamps: bool = False,
+        audio_len: int | None = None,
+    ) -> Observable[Transcription]:
+        """Transcribe a window into segments, tokens and their probabilities.
+
+        The same decode as transcribe(), keeping what it throws away: segment times and
+        no-speech probabilities, and the id, probability and (with token_timestamps)
+        times of every token, without a Python object per token.
+        """
+        n = len(window) if audio_len is None else audio_len
+
+        def run(token: CancelToken) -> Transcription:
+            arrays = self._whisper.transcribe_detailed(window, prompt, token, token_timestamps, n)
+            return Transcription(*arrays)
+
+        return self._decode(run)
+
+    def transcribe_long(
+        self,
+        samples: AudioChunk,
+        n_workers: int | None = None,
+        split_points: list[int] | None = None,
+    ) -> Observable[list[Segment]]:
+        """Transcribe audio of any length, decoding 30s pieces in parallel.
+
+        Pieces are cut at split_points where possible, e.g. pause_points() of the
+        detect_speech() segments, else at the quietest moment. Up to n_workers pieces,
+        max_concurrency by default and at most, decode at once. Segment times are in
+        centiseconds from the first sample.
+        """
+
+        def run(token: CancelToken) -> list[Segment]:
+            segments = self._whisper.transcribe_long(samples, n_workers, split_points, token)
+            return [Segment(*s) for s in segments]
+
+        return self._decode(run)
+
+    def _decode[T](self, fn: Callable[[CancelToken], T]) -> Observable[T]:
+        """Run fn in the executor with a token that is cancelled on dispose, and count it."""
+        token = CancelToken()
+
+        def run() -> T:
+            with self._stats_lock:
+                if self._closed:
+                    raise RuntimeError("Transcriber is closed")
+                self._in_flight += 1
+            start = time.perf_counter()
+            try:
+                result = fn(token)
+            except TranscriptionAbortedError:
+                with self._stats_lock:
+                    self._stats = self._stats.with_aborted(time.perf_counter() - start)
+                raise
+            finally:
+                with self._stats_lock:
+                    self._in_flight -= 1
+                    last = self._closed and not self._in_flight
+                if last:
+                    self._finish()
+            with self._stats_lock:
+                self._stats = self._stats.with_completed(time.perf_counter() - start)
+            return result
 
-    def transcribe(self, window: AudioChunk) -> Observable[str]:
-        """Transcribe a single audio window (up to 30s of 16kHz audio)."""
-        return from_thread(lambda: self._whisper.transcribe(window), self._executor)
+        return from_thread(run, self._executor, token.cancel)
@@ -1,13 +1,14 @@
 """Sliding window operator for audio chunks."""
 
-from collections import deque
+import sys
 
 import numpy as np
+import reactivex as rx
 from reactivex import Observable
-from reactivex import operators as ops
-from streams import buffer_with_count_or_complete
+from reactivex.abc import DisposableBase, ObserverBase, SchedulerBase
 from streams.utils import Operator
 
+from audio.latency import captured_at, stamp
 from audio.types import AudioChunk
 
 SAMPLE_RATE = 16000
@@ -15,6 +16,85 @@ WINDOW_SIZE = SAMPLE_RATE * 30  # 30s window
 CHUNK_SIZE = 512
 
 
+class WindowBuffer:
+    """Preallocated sliding window over the most recent window_size samples.
+
+    Samples are appended linearly into a buffer of 2 * window_size. When it runs out of
+    room, the live window is copied to the start of a spare buffer and writing continues
+    there. The window is therefore always contiguous, and the live samples are returned
+    as a read-only view with no copy.
+
+    Appends never write over samples a view has returned, and a buffer is only reused as
+    the spare once no view into it is left, so a returned view stays valid for as long as
+    it is held. Consumers that hold windows while more audio arrives (a queue, a decode
+    on another thread) make a third buffer be allocated at a switch instead; while they
+    let go in time, two buffers are used and nothing is allocated.
+    """
+
+    def __init__(self, window_size: int = WINDOW_SIZE) -> None:
+        self._window_size = window_size
+        self._bufs = [
+            np.zeros(2 * window_size, dtype=np.float32),
+            np.zeros(2 * window_size, dtype=np.float32),
+        ]
+        self._active = 0
+        self._end = 0
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def append(self, chunk: AudioChunk) -> None:
+        """Append samples, dropping the oldest once window_size is exceeded."""
+        samples = chunk.reshape(-1)[-self._window_size :]
+        n = len(samples)
+        buf = self._bufs[self._active]
+        if self._end + n > len(buf):
+            keep = min(self._len, self._window_size - n)
+            spare = self._spare()
+            self._bufs[spare][:keep] = buf[self._end - keep : self._end]
+            self._active = spare
+            buf = self._bufs[spare]
+            self._end = keep
+        buf[self._end : self._end + n] = samples
+        self._end += n
+        self._len = min(self._len + n, self._window_size)
+
+    def trim(self, n: int) -> None:
+        """Drop the oldest n samples from the window."""
+        self._len -= min(n, self._len)
+
+    def samples(self) -> AudioChunk:
+        """Return the live samples, without padding, as a read-only view."""
+        buf = self._bufs[self._active]
+        view = buf[self._end - self._len : self._end]
+        view.flags.writeable = False
+        return view
+
+    def _spare(self) -> int:
+        """Index of a buffer no returned view points into, allocating one if none is free.
+
+        Free buffers beyond the one returned are released, so memory shrinks back to two
+        buffers once held windows are let go.
+        """
+        # Views keep their base buffer alive: with none left, the list and the argument
+        # of getrefcount are its only references
+        free = [
+            i
+            for i in range(len(self._bufs))
+            if i != self._active and sys.getrefcount(self._bufs[i]) <= 2
+        ]
+        if not free:
+            self._bufs.append(np.zeros(2 * self._window_size, dtype=np.float32))
+            return len(self._bufs) - 1
+        for i in reversed(free[1:]):
+            if len(self._bufs) > 2:
+                del self._bufs[i]
+                if i < self._active:
+                    self._active -= 1
+        return free[0]
+
+
 def window_chunks(
     chunk_size: int = CHUNK_SIZE,
     window_size: int = WINDOW_SIZE,
@@ -22,29 +102,45 @@ def window_chunks(
 ) -> Operator[AudioChunk, AudioChunk]:
     """Accumulate chunks into sliding window, emit every emit_interval samples.
 
-    Collects fixed-size chunks into a rolling buffer (max window_size samples).
-    Emits a padded window every emit_interval samples. Old chunks are dropped
-    when the buffer exceeds capacity.
+    Collects fixed-size chunks into a rolling buffer of the latest window_size samples.
+    Emits the window every emit_interval samples, and any partial interval on completion.
+    Windows are not padded to window_size: short windows stay short, so the transcriber
+    can size the encoder to the real audio. Each subscription owns one preallocated
+    WindowBuffer, and windows are read-only views into it that stay valid while held,
+    e.g. queued in exhaust_map_latest, a RoundRobinPool or a BatchTranscriber. A window
+    carries the capture timestamp of its newest chunk (see audio.latency).
     """
-    max_chunks = window_size // chunk_size
     chunks_per_emit = -(-emit_interval // chunk_size)  # ceiling division
 
     def _operator(source: Observable[AudioChunk]) -> Observable[AudioChunk]:
-        def accumulate(buf: deque[AudioChunk], chunk: AudioChunk) -> deque[AudioChunk]:
-            buf.append(chunk)
-            return buf
-
-        def build_window(states: list[deque[AudioChunk]]) -> AudioChunk:
-            window = np.concatenate(list(states[-1]))
-            if len(window) < window_size:
-                window = np.pad(window, (0, window_size - len(window)))
-            return window
-
-        seed: deque[AudioChunk] = deque(maxlen=max_chunks)
-        scanned: Observable[deque[AudioChunk]] = source.pipe(ops.scan(accumulate, seed))
-        buffered: Observable[list[deque[AudioChunk]]] = scanned.pipe(
-            buffer_with_count_or_complete(chunks_per_emit)
-        )
-        return buffered.pipe(ops.map(build_window))
+        def subscribe(
+            observer: ObserverBase[AudioChunk], scheduler: SchedulerBase | None = None
+        ) -> DisposableBase:
+            window = WindowBuffer(window_size)
+            pending = 0
+            captured: float | None = None
+
+            def on_next(chunk: AudioChunk) -> None:
+                nonlocal pending, captured
+                window.append(chunk)
+                captured = captured_at(chunk)
+                pending += 1
+                if pending >= chunks_per_emit:
+                    pending = 0
+                    observer.on_next(stamp(window.samples(), captured))
+
+            def on_completed() -> None:
+                if pending:
+                    observer.on_next(stamp(window.samples(), captured))
+                observer.on_completed()
+
+            return source.subscribe(
+                on_next=on_next,
+                on_error=observer.on_error,
+                on_completed=on_completed,
+                scheduler=scheduler,
+            )
+
+        return rx.create(subscribe)
 
     return _operator
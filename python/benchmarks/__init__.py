@@ -0,0 +1 @@
+"""Performance benchmarks for the audio and streams packages."""
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Decode latency and word error rate of a fitted encoder context vs. 30s padding.
+
+For each model and window length, the same audio is decoded twice: zero-padded to 30s
+with the full encoder context (the old behaviour), and unpadded with audio_len set so
+the encoder context is fitted to the window. The padded transcript is the reference.
+
+Usage:
+    python -m benchmarks.audio_ctx --audio speech_16k.raw --models tiny.en base.en
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+from audio._stt import Whisper
+from audio.types import AudioChunk
+from audio.window import WINDOW_SIZE
+from scripts.download_whisper import get_model_path
+
+from benchmarks.utils import SAMPLE_RATE, word_error_rate
+
+MODELS = ("tiny.en", "base.en", "small.en")
+WINDOW_SECONDS = (1.0, 2.0, 5.0, 10.0, 20.0, 30.0)
+
+
+def timed(fn: Callable[[], str], repeats: int) -> tuple[float, str]:
+    """Median wall-clock seconds over repeats, and the last transcript."""
+    times: list[float] = []
+    text = ""
+    for _ in range(repeats):
+        start = time.perf_counter()
+        text = fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), text
+
+
+def bench_window(whisper: Whisper, audio: AudioChunk, repeats: int) -> str:
+    n = len(audio)
+    padded = np.zeros(WINDOW_SIZE, dtype=np.float32)
+    padded[:n] = audio
+    full, reference = timed(lambda: whisper.transcribe(padded), repeats)
+    fitted, text = timed(lambda: whisper.transcribe(audio, audio_len=n), repeats)
+    return (
+        f"{n / SAMPLE_RATE:6.1f}s {full * 1e3:9.1f} ms {fitted * 1e3:9.1f} ms "
+        f"{full / fitted:7.2f}x {word_error_rate(reference, text):7.1%}"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark fitted encoder context")
+    parser.add_argument("--audio", type=Path, required=True, help="16kHz mono f32le file")
+    parser.add_argument("--models", nargs="+", default=MODELS, help="Model names")
+    parser.add_argument("--windows", nargs="+", type=float, default=WINDOW_SECONDS)
+    parser.add_argument("--repeats", type=int, default=3, help="Decodes per measurement")
+    args = parser.parse_args()
+
+    audio = np.fromfile(args.audio, dtype=np.float32)
+    for model in args.models:
+        print(f"{model}\n{'window':>7} {'padded':>12} {'fitted':>12} {'speedup':>8} {'WER':>7}")
+        with Whisper(str(get_model_path(model))) as whisper:
+            whisper.transcribe(audio[:SAMPLE_RATE])  # warm up
+            for seconds in args.windows:
+                n = int(seconds * SAMPLE_RATE)
+                if n > min(len(audio), WINDOW_SIZE):
+                    continue
+                print(bench_window(whisper, audio[:n], args.repeats))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
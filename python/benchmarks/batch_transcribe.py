@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Aggregate real-time factor of many sessions, independent vs. batched decodes.
+
+Each session transcribes --windows windows of --window seconds one after another, as a
+recorder does with one decode in flight. All sessions share one model with --pool
+decoder states. Independent sessions each call Whisper.transcribe from their own
+thread; batched sessions submit to one BatchTranscriber.
+
+Reported per session count:
+    rtf: wall-clock seconds per second of audio transcribed, over all sessions
+    realtime: audio seconds transcribed per wall-clock second, i.e. 1 / rtf
+
+Usage:
+    python -m benchmarks.batch_transcribe --audio speech_16k.raw --pool 4
+"""
+
+import argparse
+import sys
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+from audio._stt import Whisper
+from audio.batch import DEADLINE, BatchTranscriber
+from audio.types import AudioChunk
+from scripts.download_whisper import get_model_path
+
+from benchmarks.utils import SAMPLE_RATE
+
+SESSIONS = (1, 8, 32)
+
+
+def run_sessions(
+    transcribe: Callable[[AudioChunk], str], windows: list[AudioChunk], n_sessions: int
+) -> float:
+    """Run n_sessions threads each transcribing every window, return wall-clock seconds."""
+
+    def session() -> None:
+        for window in windows:
+            transcribe(window)
+
+    threads = [threading.Thread(target=session) for _ in range(n_sessions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark batched multi-session decoding")
+    parser.add_argument("--audio", type=Path, required=True, help="16kHz mono f32le file")
+    parser.add_argument("--model", default="tiny.en", help="Model name")
+    parser.add_argument("--window", type=float, default=5.0, help="Seconds per window")
+    parser.add_argument("--windows", type=int, default=4, help="Windows per session")
+    parser.add_argument("--pool", type=int, default=4, help="Decoder states of the model")
+    parser.add_argument("--deadline", type=float, default=DEADLINE, help="Batch deadline")
+    parser.add_argument("--sessions", nargs="+", type=int, default=SESSIONS)
+    args = parser.parse_args()
+
+    audio = np.fromfile(args.audio, dtype=np.float32)
+    n = int(args.window * SAMPLE_RATE)
+    windows = [np.resize(np.roll(audio, -i * n), n) for i in range(args.windows)]
+    model_path = str(get_model_path(args.model))
+
+    whisper = Whisper(model_path, args.pool)
+    whisper.transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32))  # warm up
+    batcher = BatchTranscriber(Whisper(model_path, args.pool), args.deadline)
+
+    def batched(window: AudioChunk) -> str:
+        return batcher.transcribe(window).run()
+
+    modes: dict[str, Callable[[AudioChunk], str]] = {
+        "independent": whisper.transcribe,
+        "batched": batched,
+    }
+    print(f"{'sessions':>8} {'mode':12} {'rtf':>7} {'realtime':>9} {'mean batch':>11}")
+    for n_sessions in args.sessions:
+        audio_seconds = n_sessions * len(windows) * args.window
+        for name, transcribe in modes.items():
+            before = batcher.stats
+            seconds = run_sessions(transcribe, windows, n_sessions)
+            after = batcher.stats
+            batches = after.batches - before.batches
+            mean = (after.windows - before.windows) / batches if batches else 1.0
+            print(
+                f"{n_sessions:8} {name:12} {seconds / audio_seconds:7.3f} "
+                f"{audio_seconds / seconds:8.1f}x {mean:11.1f}"
+            )
+
+    whisper.close()
+    batcher.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Startup time and memory of processes loading the same model.
+
+Each case starts the given number of processes at once. Every process loads the model,
+decodes one second of silence, then reports its time to first transcription and memory
+while all of them are still alive. Pss splits shared pages between the processes that
+map them, so its total is what the processes cost together. whisper.cpp copies the
+weights into buffers of its own, so expect the total to grow by a full model per process.
+Linux only.
+
+Usage:
+    python -m benchmarks.model_startup --model medium.en --processes 1 4
+"""
+
+import argparse
+import multiprocessing as mp
+import sys
+import time
+from multiprocessing.synchronize import Barrier
+from pathlib import Path
+
+import numpy as np
+from audio._stt import Whisper
+from scripts.download_whisper import get_model_path
+
+from benchmarks.utils import SAMPLE_RATE
+
+PROCESSES = (1, 4)
+
+
+def _memory_kib() -> tuple[int, int]:
+    """Return (Rss, Pss) of the calling process in KiB."""
+    fields = {}
+    for line in Path("/proc/self/smaps_rollup").read_text().splitlines()[1:]:
+        key, value, *_ = line.split()
+        fields[key.rstrip(":")] = int(value)
+    return fields["Rss"], fields["Pss"]
+
+
+def _worker(model: str, start: Barrier, done: Barrier, results: mp.Queue) -> None:
+    start.wait()
+    began = time.perf_counter()
+    whisper = Whisper(model, 1)
+    loaded = time.perf_counter()
+    whisper.transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32))
+    first = time.perf_counter()
+    done.wait()  # measure while every process still holds the model
+    results.put((loaded - began, first - began, *_memory_kib()))
+    done.wait()
+    whisper.close()
+
+
+def run(model: str, n: int) -> list[tuple[float, float, int, int]]:
+    ctx = mp.get_context("spawn")
+    start, done = ctx.Barrier(n), ctx.Barrier(n)
+    results: mp.Queue = ctx.Queue()
+    procs = [ctx.Process(target=_worker, args=(model, start, done, results)) for _ in range(n)]
+    for p in procs:
+        p.start()
+    rows = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark model startup")
+    parser.add_argument("--model", default="medium.en", help="Model name")
+    parser.add_argument("--processes", nargs="+", type=int, default=PROCESSES)
+    args = parser.parse_args()
+
+    model = str(get_model_path(args.model))
+    print(
+        f"{'procs':>5} {'load s':>8} {'first s':>8} "
+        f"{'RSS MiB':>9} {'PSS MiB':>9} {'total PSS MiB':>14}"
+    )
+    for n in args.processes:
+        rows = run(model, n)
+        load, first, rss, pss = (max(col) for col in zip(*rows, strict=True))
+        total = sum(r[3] for r in rows)
+        print(
+            f"{n:5} {load:8.2f} {first:8.2f} "
+            f"{rss / 2**10:9.0f} {pss / 2**10:9.0f} {total / 2**10:14.0f}"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
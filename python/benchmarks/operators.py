@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""Microbenchmarks of the audio and streams operators, with saved baselines.
+
+Every case pushes synthetic items through a fresh subscription and reports throughput,
+per-item latency (time for on_next() to return) and bytes allocated per item. Audio
+cases feed 16 kHz noise in blocks of the given size. With --pace, blocks arrive at that
+multiple of real time instead of back to back, which shows latency at a live rate.
+
+Each case runs --repeats times and the fastest run is kept, to damp scheduling noise.
+Results can be saved as a JSON baseline, and a later run compared against it. Metrics
+worse than the baseline by more than --threshold are flagged, and the run exits with 1.
+
+Usage:
+    python -m benchmarks.operators --save baseline.json
+    python -m benchmarks.operators --compare baseline.json
+    python -m benchmarks.operators --only vad_gate --pace 1.0 --seconds 10
+"""
+
+import argparse
+import json
+import sys
+from collections.abc import Callable, Iterator, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import reactivex as rx
+from audio.config import VAD_SENTENCE
+from audio.rechunk import rechunk, rechunk_ring
+from audio.silero import SileroVADModel
+from audio.types import AudioChunk
+from audio.vad import FRAME_SIZE, VADModel, vad_gate
+from audio.window import window_chunks
+from reactivex import operators as ops
+from streams import (
+    buffer_with_count_or_complete,
+    exhaust_map_latest,
+    filter_instance_start_with,
+    take_while_inclusive,
+)
+from streams.switch_resource import switch_resource
+from streams.utils import Operator
+
+from benchmarks.utils import SAMPLE_RATE, Measurement, measure
+from benchmarks.vad import StubModel
+
+BLOCK_SIZE = 160  # 10 ms PortAudio callback
+THRESHOLD = 0.10
+
+# metric -> True if higher is better
+METRICS = {
+    "items_per_sec": True,
+    "item_p50_us": False,
+    "item_p99_us": False,
+    "alloc_bytes_per_item": False,
+}
+
+
+@dataclass(frozen=True)
+class Case:
+    """One benchmark: an operator factory and the items pushed through it."""
+
+    name: str
+    make_operator: Callable[[], Operator[Any, Any]]
+    items: Sequence[Any]
+    samples: int = 0  # audio samples in items, 0 for non-audio cases
+    block: int = 0  # samples per item, paces the case with --pace
+
+
+class _Resource:
+    def close(self) -> None:
+        pass
+
+
+def _noise(n: int, block: int) -> list[AudioChunk]:
+    rng = np.random.default_rng(0)
+    return list(rng.standard_normal((n // block, block), dtype=np.float32))
+
+
+def _gate(model: VADModel) -> Operator[AudioChunk, AudioChunk]:
+    """A vad_gate re-armed after every utterance, as in the recorder.
+
+    The source is held open past its completion so repeat() stops resubscribing.
+    """
+    return lambda source: source.pipe(
+        ops.concat(rx.never()), vad_gate(model, rx.of(VAD_SENTENCE)), ops.repeat()
+    )
+
+
+def _switch() -> Operator[_Resource, int]:
+    return switch_resource(lambda _: rx.of(1, 2, 3))
+
+
+def cases(seconds: float) -> Iterator[Case]:
+    n = int(seconds * SAMPLE_RATE)
+    blocks = _noise(n, BLOCK_SIZE)
+    frames = _noise(n, FRAME_SIZE)
+    count = len(frames)
+    yield Case("rechunk", lambda: rechunk(FRAME_SIZE), blocks, n, BLOCK_SIZE)
+    yield Case("rechunk_ring", lambda: rechunk_ring(FRAME_SIZE), blocks, n, BLOCK_SIZE)
+    yield Case("vad_gate stub", lambda: _gate(StubModel()), frames, n, FRAME_SIZE)
+    yield Case("vad_gate silero", lambda: _gate(SileroVADModel()), frames, n, FRAME_SIZE)
+    yield Case("window_chunks", lambda: window_chunks(), frames, n, FRAME_SIZE)
+    yield Case(
+        "buffer_with_count_or_complete", lambda: buffer_with_count_or_complete(16), range(count)
+    )
+    yield Case("take_while_inclusive", lambda: take_while_inclusive(lambda _: True), range(count))
+    mixed = [i if i % 2 else str(i) for i in range(count)]
+    yield Case("filter_instance_start_with", lambda: filter_instance_start_with(0), mixed)
+    yield Case("switch_resource", _switch, [_Resource() for _ in range(count)])
+    yield Case("exhaust_map_latest", lambda: exhaust_map_latest(rx.of), range(count))
+
+
+def summary(m: Measurement) -> dict[str, float]:
+    return {
+        "items_per_sec": m.items_per_sec,
+        "item_p50_us": m.item_p50 * 1e6,
+        "item_p99_us": m.item_p99 * 1e6,
+        "alloc_bytes_per_item": m.alloc_bytes_per_item,
+    }
+
+
+def compare(
+    results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]], threshold: float
+) -> list[str]:
+    """Print each metric against the baseline, return the regressions."""
+    regressions = []
+    for name, metrics in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            old, new = base.get(metric, 0.0), metrics[metric]
+            if not old:
+                continue
+            change = (new - old) / old
+            worse = -change if higher_is_better else change
+            flag = "REGRESSION" if worse > threshold else ""
+            print(f"  {name:32} {metric:22} {old:12.1f} -> {new:12.1f} {change:+8.1%} {flag}")
+            if flag:
+                regressions.append(f"{name} {metric}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark audio and streams operators")
+    parser.add_argument("--seconds", type=float, default=60.0, help="Audio per case")
+    parser.add_argument("--pace", type=float, default=0.0, help="Feed audio at N x realtime")
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per case, best is kept")
+    parser.add_argument("--only", nargs="+", default=[], help="Run cases containing a name")
+    parser.add_argument("--save", type=Path, help="Write results as a JSON baseline")
+    parser.add_argument("--compare", type=Path, help="Diff results against a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="Regression ratio")
+    args = parser.parse_args()
+
+    results: dict[str, dict[str, float]] = {}
+    print(f"{'case':32} {'items/s':>12} {'p50 us':>9} {'p99 us':>9} {'B/item':>9}")
+    for case in cases(args.seconds):
+        if args.only and not any(name in case.name for name in args.only):
+            continue
+        interval = case.block / SAMPLE_RATE / args.pace if args.pace and case.block else 0.0
+        runs = (
+            measure(case.name, case.make_operator, case.items, case.samples, interval)
+            for _ in range(max(1, args.repeats))
+        )
+        m = min(runs, key=lambda r: r.seconds)
+        results[case.name] = summary(m)
+        print(
+            f"{case.name:32} {m.items_per_sec:12.0f} {m.item_p50 * 1e6:9.1f} "
+            f"{m.item_p99 * 1e6:9.1f} {m.alloc_bytes_per_item:9.0f}"
+        )
+
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"saved baseline to {args.save}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        print(f"compared to {args.compare}:")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.threshold:.0%}")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Compare rechunk() against the ring buffer rechunk_ring().
+
+Usage:
+    python -m benchmarks.rechunk --seconds 60
+"""
+
+import argparse
+import sys
+from functools import partial
+
+import numpy as np
+from audio.rechunk import rechunk, rechunk_ring
+from audio.types import AudioStream
+
+from benchmarks.utils import measure
+
+CHUNK_SIZE = 512
+
+# Typical PortAudio callback sizes: 10 ms and 1024 frames at each device rate
+BLOCK_SIZES = {
+    "16kHz/10ms": 160,
+    "16kHz/1024": 1024,
+    "48kHz/10ms": 480,
+    "48kHz/1024": 1024 * 3,
+}
+
+
+def make_blocks(block_size: int, seconds: float) -> list[AudioStream]:
+    """Synthetic (frames, 1) float32 blocks covering seconds of 16 kHz audio."""
+    rng = np.random.default_rng(0)
+    count = max(1, int(seconds * 16000) // block_size)
+    return [rng.standard_normal((block_size, 1), dtype=np.float32) for _ in range(count)]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark rechunk operators")
+    parser.add_argument("--seconds", type=float, default=60.0, help="Audio per case")
+    args = parser.parse_args()
+
+    for label, block_size in BLOCK_SIZES.items():
+        blocks = make_blocks(block_size, args.seconds)
+        samples = block_size * len(blocks)
+        for name, factory in (("rechunk", rechunk), ("rechunk_ring", rechunk_ring)):
+            result = measure(f"{name} {label}", partial(factory, CHUNK_SIZE), blocks, samples)
+            print(result.row())
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
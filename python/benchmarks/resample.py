@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Throughput of the streaming polyphase resampler at common device rates.
+
+Each case feeds noise at the device rate in PortAudio-sized blocks through resample()
+and reports input samples per second, how many times faster than real time that is, and
+bytes allocated per second of audio.
+
+Usage:
+    python -m benchmarks.resample --seconds 60
+"""
+
+import argparse
+import sys
+from functools import partial
+
+import numpy as np
+from audio.resample import resample
+from audio.types import AudioStream
+
+from benchmarks.utils import measure
+
+RATES = (22050, 44100, 48000, 96000)
+BLOCK_MS = (10, 20)
+
+
+def make_blocks(rate: int, block_size: int, seconds: float) -> list[AudioStream]:
+    """Synthetic (frames, 1) float32 blocks covering seconds of audio at rate."""
+    rng = np.random.default_rng(0)
+    count = max(1, int(seconds * rate) // block_size)
+    return [rng.standard_normal((block_size, 1), dtype=np.float32) for _ in range(count)]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the polyphase resampler")
+    parser.add_argument("--seconds", type=float, default=60.0, help="Audio per case")
+    parser.add_argument("--rates", nargs="+", type=int, default=RATES, help="Device rates")
+    args = parser.parse_args()
+
+    print(f"{'case':24} {'Msamples/s':>11} {'realtime':>9} {'KiB/audio-s':>12}")
+    for rate in args.rates:
+        for ms in BLOCK_MS:
+            block_size = rate * ms // 1000
+            blocks = make_blocks(rate, block_size, args.seconds)
+            samples = block_size * len(blocks)
+            m = measure(f"{rate}Hz/{ms}ms", partial(resample, rate), blocks, samples)
+            per_audio_sec = m.alloc_bytes * rate / samples / 2**10
+            print(
+                f"{m.name:24} {m.samples_per_sec / 1e6:11.2f} "
+                f"{m.samples_per_sec / rate:8.0f}x {per_audio_sec:12.1f}"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Time to first text and to final text, speculative dual-model vs. single-model.
+
+The audio is cut into utterances of --utterance seconds, and each one is fed in 512
+sample chunks at real time, stamped with its capture time. The single-model recorder
+transcribes a sliding window every 0.5s with the heavy model, as recorder() does. The
+speculative recorder drafts every --draft seconds with the fast model and confirms every
+--confirm seconds with the heavy one.
+
+Reported per recorder, as medians over the utterances:
+    first: from the start of the utterance to the first text (a draft, if speculative)
+    confirmed: from the start of the utterance to the first heavy-model text
+    final: from the end of the utterance to its last heavy-model text
+
+Usage:
+    python -m benchmarks.speculative --audio speech_16k.raw --draft-model tiny.en
+"""
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from audio.latency import stamp
+from audio.speculative import TranscriptEvent, speculative_transcribe
+from audio.types import AudioChunk
+from audio.whisper import CHUNK_SIZE, Transcriber
+from audio.window import window_chunks
+from reactivex import Observable
+from reactivex import operators as ops
+from reactivex.subject import Subject
+from scripts.download_whisper import get_model_path
+from streams import exhaust_map_latest
+from streams.utils import Operator
+
+from benchmarks.utils import SAMPLE_RATE
+
+SINGLE_INTERVAL = int(0.5 * SAMPLE_RATE)
+
+
+def single(transcriber: Transcriber) -> Operator[AudioChunk, TranscriptEvent]:
+    """The single-model recorder's transcription, reported as confirmed events."""
+
+    def event(text: str) -> TranscriptEvent:
+        return TranscriptEvent(text, "confirmed", 0, (0,))
+
+    def run(window: AudioChunk) -> Observable[TranscriptEvent]:
+        return transcriber.transcribe(window).pipe(ops.map(event))
+
+    return lambda source: source.pipe(
+        window_chunks(CHUNK_SIZE, emit_interval=SINGLE_INTERVAL), exhaust_map_latest(run)
+    )
+
+
+def utterance(
+    make_operator: Callable[[], Operator[AudioChunk, TranscriptEvent]], audio: AudioChunk
+) -> tuple[float, float, float]:
+    """Feed one utterance at real time, return (first, confirmed, final) seconds."""
+    source: Subject[AudioChunk] = Subject()
+    times: list[tuple[float, TranscriptEvent]] = []
+    done = threading.Event()
+    source.pipe(make_operator()).subscribe(
+        on_next=lambda e: times.append((time.perf_counter(), e)),
+        on_error=lambda _: done.set(),
+        on_completed=done.set,
+    )
+
+    began = time.perf_counter()
+    for i, block in enumerate(audio.reshape(-1, CHUNK_SIZE), 1):
+        due = began + i * CHUNK_SIZE / SAMPLE_RATE
+        time.sleep(max(0.0, due - time.perf_counter()))
+        source.on_next(stamp(block, time.perf_counter()))
+    ended = time.perf_counter()
+    source.on_completed()
+    done.wait()
+
+    confirmed = [t for t, e in times if e.confidence == "confirmed"]
+    if not confirmed:
+        return float("nan"), float("nan"), float("nan")
+    return times[0][0] - began, confirmed[0] - began, confirmed[-1] - ended
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark speculative transcription")
+    parser.add_argument("--audio", type=Path, required=True, help="16kHz mono f32le file")
+    parser.add_argument("--model", default="small.en", help="Heavy model name")
+    parser.add_argument("--draft-model", default="tiny.en", help="Fast model name")
+    parser.add_argument("--utterance", type=float, default=5.0, help="Seconds per utterance")
+    parser.add_argument("--draft", type=float, default=0.25, help="Seconds between drafts")
+    parser.add_argument("--confirm", type=float, default=1.0, help="Seconds between confirms")
+    args = parser.parse_args()
+
+    audio = np.fromfile(args.audio, dtype=np.float32)
+    n = int(args.utterance * SAMPLE_RATE) // CHUNK_SIZE * CHUNK_SIZE
+    utterances = [audio[i : i + n] for i in range(0, len(audio) - n + 1, n)]
+    draft_interval = int(args.draft * SAMPLE_RATE)
+    confirm_interval = int(args.confirm * SAMPLE_RATE)
+
+    executor = ThreadPoolExecutor(max_workers=4)
+    heavy = Transcriber.from_path(get_model_path(args.model), executor)
+    draft = Transcriber.from_path(get_model_path(args.draft_model), executor)
+    heavy.warm_up()
+    draft.warm_up()
+
+    recorders: dict[str, Callable[[], Operator[AudioChunk, TranscriptEvent]]] = {
+        "single": lambda: single(heavy),
+        "speculative": lambda: speculative_transcribe(
+            draft, heavy, draft_interval, confirm_interval
+        ),
+    }
+    print(f"{len(utterances)} utterances of {args.utterance:.1f}s")
+    print(f"{'recorder':12} {'first s':>8} {'confirmed s':>12} {'final s':>8}")
+    for name, make_operator in recorders.items():
+        rows = [utterance(make_operator, u) for u in utterances]
+        first, confirmed, final = (statistics.median(col) for col in zip(*rows, strict=True))
+        print(f"{name:12} {first:8.2f} {confirmed:12.2f} {final:8.2f}")
+
+    heavy.close()
+    draft.close()
+    executor.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
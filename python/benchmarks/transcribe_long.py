@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Speedup of Whisper.transcribe_long with the number of workers.
+
+The input is tiled to the requested length, so a short recording is enough. The model is
+loaded with one decoder state per worker of the largest count measured.
+
+Usage:
+    python -m benchmarks.transcribe_long --audio speech_16k.raw --minutes 60
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from audio._stt import Whisper
+from scripts.download_whisper import get_model_path
+
+from benchmarks.utils import SAMPLE_RATE
+
+WORKERS = (1, 2, 4, 8)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark parallel long-form transcription")
+    parser.add_argument("--audio", type=Path, required=True, help="16kHz mono f32le file")
+    parser.add_argument("--model", default="tiny.en", help="Model name")
+    parser.add_argument("--minutes", type=float, default=60.0, help="Audio length")
+    parser.add_argument("--workers", nargs="+", type=int, default=WORKERS)
+    args = parser.parse_args()
+
+    audio = np.fromfile(args.audio, dtype=np.float32)
+    n = int(args.minutes * 60 * SAMPLE_RATE)
+    samples = np.resize(audio, n)
+
+    print(f"{'workers':>7} {'seconds':>9} {'realtime':>9} {'speedup':>8}")
+    # transcribe_long runs at most max_concurrency workers, one per pooled state
+    model_path = str(get_model_path(args.model))
+    with Whisper(model_path, max_concurrency=max(args.workers)) as whisper:
+        baseline = 0.0
+        for n_workers in args.workers:
+            start = time.perf_counter()
+            whisper.transcribe_long(samples, n_workers)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(
+                f"{n_workers:7} {elapsed:9.1f} {n / SAMPLE_RATE / elapsed:8.1f}x "
+                f"{baseline / elapsed:7.2f}x"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
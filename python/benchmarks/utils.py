@@ -0,0 +1,148 @@
+"""Shared measurement helpers for benchmarks."""
+
+import time
+import tracemalloc
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+from reactivex.subject import Subject
+from streams.utils import Operator
+
+SAMPLE_RATE = 16000
+
+
+@dataclass(frozen=True)
+class Measurement:
+    """Result of pushing a batch of items through an operator.
+
+    Attributes:
+        name: Label of the measured case
+        items: Number of input items pushed
+        samples: Number of input samples pushed
+        outputs: Number of items emitted by the operator
+        seconds: Wall-clock time spent pushing items with tracing disabled, excluding
+            operator construction and any pacing sleeps
+        alloc_bytes: Bytes allocated while processing, as a lower bound. Summed per item
+            from tracemalloc's peak above the level before that item was pushed.
+        item_p50: Median seconds for one on_next() to return, downstream work included
+        item_p99: 99th percentile of the same
+    """
+
+    name: str
+    items: int
+    samples: int
+    outputs: int
+    seconds: float
+    alloc_bytes: int
+    item_p50: float = 0.0
+    item_p99: float = 0.0
+
+    @property
+    def samples_per_sec(self) -> float:
+        return self.samples / self.seconds if self.seconds else 0.0
+
+    @property
+    def items_per_sec(self) -> float:
+        return self.items / self.seconds if self.seconds else 0.0
+
+    @property
+    def alloc_bytes_per_item(self) -> float:
+        return self.alloc_bytes / self.items if self.items else 0.0
+
+    @property
+    def alloc_bytes_per_audio_sec(self) -> float:
+        """Bytes allocated per second of 16 kHz audio, i.e. the cost of running live."""
+        return self.alloc_bytes * SAMPLE_RATE / self.samples if self.samples else 0.0
+
+    def row(self) -> str:
+        return (
+            f"{self.name:40} {self.samples_per_sec / 1e6:10.2f} Msamples/s "
+            f"{self.alloc_bytes_per_audio_sec / 2**10:12.1f} KiB allocated per audio-second"
+        )
+
+
+def _run[T](
+    operator: Operator[T, object], items: Sequence[T], traced: bool, interval: float = 0.0
+) -> tuple[int, int, list[float], float]:
+    """Push items through one subscription.
+
+    Returns (outputs, allocated bytes, latencies, seconds slept). With interval > 0, items
+    are pushed on a fixed schedule of one per interval seconds instead of back to back.
+    Latencies are only recorded when not traced.
+    """
+    subject: Subject[T] = Subject()
+    outputs = 0
+    alloc = 0
+    latencies: list[float] = []
+    slept = 0.0
+
+    def on_next(_: object) -> None:
+        nonlocal outputs
+        outputs += 1
+
+    subscription = subject.pipe(operator).subscribe(on_next=on_next)
+    due = time.perf_counter()
+    for item in items:
+        if interval:
+            due += interval
+            pause = time.perf_counter()
+            time.sleep(max(0.0, due - pause))
+            slept += time.perf_counter() - pause
+        if traced:
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            subject.on_next(item)
+            _, peak = tracemalloc.get_traced_memory()
+            alloc += peak - before
+        else:
+            start = time.perf_counter()
+            subject.on_next(item)
+            latencies.append(time.perf_counter() - start)
+    subject.on_completed()
+    subscription.dispose()
+    return outputs, alloc, latencies, slept
+
+
+def measure[T](
+    name: str,
+    make_operator: Callable[[], Operator[T, object]],
+    items: Sequence[T],
+    samples: int,
+    interval: float = 0.0,
+) -> Measurement:
+    """Time a fresh operator over items, then repeat under tracemalloc for allocations.
+
+    interval paces the timed run (see _run), e.g. a block's duration to feed audio live.
+    The traced run is never paced. Neither building the operator (e.g. loading a VAD
+    model) nor the pacing sleeps count towards seconds, so throughput stays comparable
+    between paced and unpaced runs.
+    """
+    operator = make_operator()
+    start = time.perf_counter()
+    outputs, _, latencies, slept = _run(operator, items, traced=False, interval=interval)
+    seconds = time.perf_counter() - start - slept
+
+    operator = make_operator()
+    tracemalloc.start()
+    try:
+        _, alloc, _, _ = _run(operator, items, traced=True)
+    finally:
+        tracemalloc.stop()
+
+    p50, p99 = np.percentile(latencies, [50, 99]) if latencies else (0.0, 0.0)
+    return Measurement(name, len(items), samples, outputs, seconds, alloc, float(p50), float(p99))
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word-level edit distance between two transcripts, divided by the reference length."""
+    ref = reference.lower().split()
+    hyp = hypothesis.lower().split()
+    if not ref:
+        return float(bool(hyp))
+    row = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        prev, row[0] = row[0], i
+        for j, h in enumerate(hyp, 1):
+            prev, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, prev + (r != h))
+    return row[-1] / len(ref)
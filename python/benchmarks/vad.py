@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Compare the Rx vad_gate against offline detect_speech over the same audio.
+
+The stub model is an energy detector that also scores frames in bulk, so it shows the
+overhead of the gate itself. Silero is stateful and scores one frame per call, so its
+ONNX call dominates both paths.
+
+Usage:
+    python -m benchmarks.vad --seconds 600
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+import reactivex as rx
+from audio.config import VAD_SENTENCE
+from audio.silero import SileroVADModel
+from audio.types import AudioChunk
+from audio.vad import FRAME_SIZE, VADModel, detect_speech, vad_gate
+from numpy.typing import NDArray
+from reactivex import operators as ops
+from reactivex.subject import Subject
+
+from benchmarks.utils import SAMPLE_RATE
+
+
+class StubModel:
+    """Cheap energy-based stand-in for a VAD model."""
+
+    def __call__(self, chunk: AudioChunk) -> float:
+        return min(1.0, float(np.abs(chunk).mean()) * 4)
+
+    def probabilities(self, frames: NDArray[np.float32]) -> NDArray[np.float32]:
+        return np.minimum(1.0, np.abs(frames).mean(axis=1) * 4).astype(np.float32)
+
+
+def make_audio(seconds: float) -> AudioChunk:
+    """Synthetic audio alternating ~2s of noise-level silence and ~2s of loud noise."""
+    rng = np.random.default_rng(0)
+    n = int(seconds * SAMPLE_RATE)
+    gain = np.where((np.arange(n) // (2 * SAMPLE_RATE)) % 2, 0.5, 0.01)
+    return (rng.standard_normal(n) * gain).astype(np.float32)
+
+
+def run_gate(model: VADModel, audio: AudioChunk) -> float:
+    """Push 512-sample chunks through a repeating vad_gate, return elapsed seconds."""
+    chunks = list(audio[: len(audio) // FRAME_SIZE * FRAME_SIZE].reshape(-1, FRAME_SIZE).copy())
+    subject: Subject[AudioChunk] = Subject()
+    subscription = subject.pipe(vad_gate(model, rx.of(VAD_SENTENCE)), ops.repeat()).subscribe()
+    start = time.perf_counter()
+    for chunk in chunks:
+        subject.on_next(chunk)
+    elapsed = time.perf_counter() - start
+    subscription.dispose()
+    return elapsed
+
+
+def run_offline(model: VADModel, audio: AudioChunk) -> float:
+    start = time.perf_counter()
+    detect_speech(model, audio, VAD_SENTENCE)
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark offline VAD")
+    parser.add_argument("--seconds", type=float, default=600.0, help="Audio per case")
+    args = parser.parse_args()
+
+    audio = make_audio(args.seconds)
+    for name, make_model in (("stub", StubModel), ("silero", SileroVADModel)):
+        gate = run_gate(make_model(), audio)
+        offline = run_offline(make_model(), audio)
+        print(
+            f"{name:8} vad_gate {args.seconds / gate:10.0f}x realtime  "
+            f"detect_speech {args.seconds / offline:10.0f}x realtime  "
+            f"speedup {gate / offline:6.1f}x"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,34 @@
 """Shared stream infrastructure for RxPy-based reactive patterns."""
 
 from streams.buffer_with_count_or_complete import buffer_with_count_or_complete
+from streams.exhaust_map_latest import exhaust_map_latest
 from streams.filter_instance import filter_instance
 from streams.filter_instance_start_with import filter_instance_start_with
 from streams.from_async import from_async
 from streams.from_async_threadsafe import from_async_threadsafe
+from streams.from_iterator import from_iterator
 from streams.from_thread import from_thread
+from streams.instrument import Metrics, StageStats, count_dropped, instrument, instrument_inner
+from streams.preload_resource import preload_resource
+from streams.round_robin_pool import PoolStats, RoundRobinPool
 from streams.take_while_inclusive import take_while_inclusive
 
 __all__ = [
+    "Metrics",
+    "PoolStats",
+    "RoundRobinPool",
+    "StageStats",
     "buffer_with_count_or_complete",
+    "count_dropped",
+    "exhaust_map_latest",
     "filter_instance",
     "filter_instance_start_with",
     "from_async",
     "from_async_threadsafe",
+    "from_iterator",
     "from_thread",
+    "instrument",
+    "instrument_inner",
+    "preload_resource",
     "take_while_inclusive",
 ]
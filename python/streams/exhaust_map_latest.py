@@ -0,0 +1,123 @@
+"""Latest-wins exhaust-map for RxPy pipelines."""
+
+import threading
+from collections.abc import Callable
+
+import reactivex as rx
+from reactivex import Observable
+from reactivex.abc import DisposableBase, ObserverBase, SchedulerBase
+from reactivex.disposable import CompositeDisposable, SingleAssignmentDisposable
+
+from streams.utils import Operator
+
+
+def exhaust_map_latest[T, U](
+    fn: Callable[[T], Observable[U]],
+    max_concurrent: int = 1,
+    on_superseded: Callable[[T], None] | None = None,
+) -> Operator[T, U]:
+    """Map items to inner observables, running at most max_concurrent at a time.
+
+    Unlike switch_map, a running inner is never disposed when a new item arrives. Items
+    arriving while every slot is busy wait in a single pending slot, where a newer item
+    replaces an older one. When an inner finishes, the pending item (the latest one) is
+    started. Work in progress always completes, so when inners are slower than items
+    arrive, output falls behind gracefully instead of stalling on restarts. Each item
+    replaced in the pending slot is passed to on_superseded, e.g. to count drops.
+
+    With max_concurrent > 1, inners may finish out of order. Emissions are serialized.
+    Completes once the source has completed and every inner, including the pending
+    one, has finished. An error from the source or any inner is forwarded.
+    """
+    if max_concurrent < 1:
+        raise ValueError("max_concurrent must be at least 1")
+
+    def _operator(source: Observable[T]) -> Observable[U]:
+        def subscribe(
+            observer: ObserverBase[U], scheduler: SchedulerBase | None = None
+        ) -> DisposableBase:
+            lock = threading.Lock()
+            emit_lock = threading.RLock()  # inners may finish on different threads
+            inners = CompositeDisposable()
+            running = 0
+            pending: list[T] = []  # at most one item, the latest
+            source_done = False
+
+            def on_next(value: U) -> None:
+                with emit_lock:
+                    observer.on_next(value)
+
+            def on_error(error: Exception) -> None:
+                with emit_lock:
+                    observer.on_error(error)
+
+            def on_completed() -> None:
+                with emit_lock:
+                    observer.on_completed()
+
+            def start(item: T) -> None:
+                inner = SingleAssignmentDisposable()
+                inners.add(inner)
+
+                def on_inner_completed() -> None:
+                    nonlocal running
+                    inners.remove(inner)
+                    with lock:
+                        if pending:
+                            start_next = pending.pop()
+                        else:
+                            running -= 1
+                            if source_done and running == 0:
+                                start_next = None
+                            else:
+                                return
+                    if start_next is None:
+                        on_completed()
+                    else:
+                        start(start_next)
+
+                try:
+                    observable = fn(item)
+                except Exception as e:
+                    on_error(e)
+                    return
+                inner.disposable = observable.subscribe(
+                    on_next=on_next,
+                    on_error=on_error,
+                    on_completed=on_inner_completed,
+                    scheduler=scheduler,
+                )
+
+            def on_source_next(item: T) -> None:
+                nonlocal running
+                with lock:
+                    if running >= max_concurrent:
+                        superseded = pending[:]
+                        pending[:] = [item]  # supersede the waiting item
+                    else:
+                        running += 1
+                        superseded = None
+                if superseded is None:
+                    start(item)
+                elif superseded and on_superseded is not None:
+                    on_superseded(superseded[0])
+
+            def on_source_completed() -> None:
+                nonlocal source_done
+                with lock:
+                    source_done = True
+                    complete = running == 0
+                if complete:
+                    on_completed()
+
+            subscription = source.subscribe(
+                on_next=on_source_next,
+                on_error=on_error,
+                on_completed=on_source_completed,
+                scheduler=scheduler,
+            )
+            return CompositeDisposable(subscription, inners)
+
+        return rx.create(subscribe)
+
+    return _operator
@@ -0,0 +1,82 @@
+"""Blocking-iterator-to-Observable bridge with bounded read-ahead."""
+
+import contextlib
+import queue
+import threading
+from collections.abc import Callable, Iterator
+
+import reactivex
+from reactivex import Observable
+from reactivex.abc import DisposableBase, ObserverBase, SchedulerBase
+from reactivex.disposable import Disposable
+
+_END = object()
+
+
+class _Error:
+    def __init__(self, error: Exception) -> None:
+        self.error = error
+
+
+def from_iterator[T](factory: Callable[[], Iterator[T]], prefetch: int = 2) -> Observable[T]:
+    """Pull items from a blocking iterator on a background thread and emit them in order.
+
+    The iterator is created per subscription. A reader thread keeps at most prefetch items
+    queued ahead of the observer and stops pulling while the queue is full, so memory is
+    bounded by prefetch however long the source is. Items are emitted from a second thread,
+    and a slow observer slows down reading.
+
+    On dispose, completion or error the iterator's close() (if any) is called from the
+    reader thread, i.e. never while it is inside next().
+    """
+
+    def subscribe(obs: ObserverBase[T], _scheduler: SchedulerBase | None = None) -> DisposableBase:
+        items: queue.Queue[object] = queue.Queue(maxsize=max(1, prefetch))
+        disposed = threading.Event()
+
+        def read() -> None:
+            iterator: Iterator[T] | None = None
+            try:
+                iterator = factory()
+                for item in iterator:
+                    if disposed.is_set():
+                        break
+                    items.put(item)
+                    if disposed.is_set():
+                        break
+                else:
+                    items.put(_END)
+            except Exception as e:
+                items.put(_Error(e))
+            finally:
+                close = getattr(iterator, "close", None)
+                if callable(close):
+                    close()
+                with contextlib.suppress(queue.Full):
+                    items.put_nowait(_END)  # wake the emitter if disposed while it waits
+
+        def emit() -> None:
+            while not disposed.is_set():
+                item = items.get()
+                if disposed.is_set():
+                    return
+                if item is _END:
+                    obs.on_completed()
+                    return
+                if isinstance(item, _Error):
+                    obs.on_error(item.error)
+                    return
+                obs.on_next(item)  # type: ignore[arg-type]
+
+        def dispose() -> None:
+            disposed.set()
+            # make room so a reader blocked on a full queue sees the flag
+            with contextlib.suppress(queue.Empty):
+                while True:
+                    items.get_nowait()
+
+        threading.Thread(target=read, daemon=True).start()
+        threading.Thread(target=emit, daemon=True).start()
+        return Disposable(dispose)
+
+    return reactivex.create(subscribe)
@@ -22,20 +22,29 @@ def _get_default_executor() -> ThreadPoolExecutor:
 def from_thread[T](
     fn: Callable[[], T],
     executor: Executor | None = None,
+    cancel: Callable[[], None] | None = None,
 ) -> Observable[T]:
     """Run blocking callable in thread pool, emit result as Observable.
 
     Sync equivalent of from_async(). Runs fn() in executor, emits result.
     If executor is None, uses a module-level default ThreadPoolExecutor.
+
+    Disposing cancels fn() if it has not started yet. A running fn() cannot be
+    interrupted by the pool, so cancel (if given) is also called on dispose to let fn()
+    stop itself early.
     """
 
     def subscribe(
         obs: ObserverBase[T],
         _scheduler: SchedulerBase | None = None,
     ) -> DisposableBase:
+        finished = False
+
         def task() -> None:
+            nonlocal finished
             try:
                 result = fn()
+                finished = True
                 obs.on_next(result)
                 obs.on_completed()
             except Exception as e:
@@ -45,7 +54,8 @@ def from_thread[T](
         future = pool.submit(task)
 
         def dispose() -> None:
-            future.cancel()
+            if not future.cancel() and cancel is not None and not finished:
+                cancel()
 
         return Disposable(dispose)
 
@@ -0,0 +1,310 @@
+"""Per-stage metrics for RxPy pipelines.
+
+Wrap each stage of a pipeline with instrument() under a name, and async stages (the
+function given to switch_map/flat_map) with instrument_inner(). Items an operator
+discards before they reach a stage are counted with count_dropped(). All stages report
+into one Metrics registry, which can be read as snapshots or dumped as Prometheus text.
+
+Without a registry, or with a disabled one, both return their argument unchanged, so an
+uninstrumented pipeline costs nothing extra.
+
+Example:
+    metrics = Metrics()
+    audio.pipe(
+        instrument("rechunk", rechunk_ring(512), metrics),
+        ops.switch_map(instrument_inner("transcribe", transcriber.transcribe, metrics)),
+    )
+    metrics.snapshots(5.0).subscribe(print)
+"""
+
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import reactivex as rx
+from reactivex import Observable
+from reactivex import operators as ops
+from reactivex.abc import DisposableBase, ObserverBase, SchedulerBase
+from reactivex.disposable import CompositeDisposable, Disposable
+
+from streams.utils import Operator
+
+
+@dataclass(frozen=True)
+class StageStats:
+    """Counters for one pipeline stage.
+
+    Attributes:
+        items: Items received
+        outputs: Items emitted
+        dropped: Items discarded before they were processed: inner jobs disposed before
+            finishing, e.g. windows superseded in switch_map, and items reported through
+            count_dropped, e.g. windows replaced while waiting in exhaust_map_latest
+        processing_seconds: Time spent processing items, excluding downstream stages. For
+            inner stages, the time from subscribe to completion.
+        max_processing_seconds: Longest single item
+        inter_arrival_seconds: Mean time between received items
+        queue_depth: Items inside the stage now (inner jobs still running, for inner stages)
+        max_queue_depth: Highest queue_depth seen
+    """
+
+    items: int = 0
+    outputs: int = 0
+    dropped: int = 0
+    processing_seconds: float = 0.0
+    max_processing_seconds: float = 0.0
+    inter_arrival_seconds: float = 0.0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+
+
+class _Stage:
+    def __init__(self, clock: Callable[[], float]) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._items = 0
+        self._outputs = 0
+        self._dropped = 0
+        self._processing = 0.0
+        self._max_processing = 0.0
+        self._first: float | None = None
+        self._last = 0.0
+        self._depth = 0
+        self._max_depth = 0
+
+    def enter(self) -> float:
+        """Count an arriving item, return its arrival time."""
+        now = self._clock()
+        with self._lock:
+            self._items += 1
+            if self._first is None:
+                self._first = now
+            self._last = now
+            self._depth += 1
+            self._max_depth = max(self._max_depth, self._depth)
+        return now
+
+    def leave(self, seconds: float, dropped: bool = False) -> None:
+        with self._lock:
+            self._depth -= 1
+            if dropped:
+                self._dropped += 1
+                return
+            self._processing += seconds
+            self._max_processing = max(self._max_processing, seconds)
+
+    def emitted(self) -> None:
+        with self._lock:
+            self._outputs += 1
+
+    def drop(self) -> None:
+        """Count an item discarded before it entered the stage."""
+        with self._lock:
+            self._dropped += 1
+
+    @property
+    def stats(self) -> StageStats:
+        with self._lock:
+            span = self._last - self._first if self._first is not None else 0.0
+            return StageStats(
+                items=self._items,
+                outputs=self._outputs,
+                dropped=self._dropped,
+                processing_seconds=self._processing,
+                max_processing_seconds=self._max_processing,
+                inter_arrival_seconds=span / (self._items - 1) if self._items > 1 else 0.0,
+                queue_depth=self._depth,
+                max_queue_depth=self._max_depth,
+            )
+
+
+# (name, help, type, StageStats attribute)
+_PROMETHEUS = (
+    ("items_total", "Items received by a stage.", "counter", "items"),
+    ("outputs_total", "Items emitted by a stage.", "counter", "outputs"),
+    ("dropped_total", "Items discarded before they were processed.", "counter", "dropped"),
+    ("processing_seconds_total", "Time spent processing items.", "counter", "processing_seconds"),
+    ("processing_seconds_max", "Longest single item.", "gauge", "max_processing_seconds"),
+    ("inter_arrival_seconds", "Mean time between items.", "gauge", "inter_arrival_seconds"),
+    ("queue_depth", "Items inside a stage.", "gauge", "queue_depth"),
+    ("queue_depth_max", "Highest queue depth seen.", "gauge", "max_queue_depth"),
+)
+
+
+class Metrics:
+    """Registry of named stage counters shared by instrument() and instrument_inner().
+
+    Stages are created on first use and keep counting across resubscriptions, e.g. when
+    a pipeline is repeated. A disabled registry instruments nothing; enabled is read when
+    a pipeline is built, not per item.
+    """
+
+    def __init__(self, enabled: bool = True, clock: Callable[[], float] = time.perf_counter):
+        self.enabled = enabled
+        self._clock = clock
+        self._stages: dict[str, _Stage] = {}
+        self._lock = threading.Lock()
+
+    def _stage(self, name: str) -> _Stage:
+        with self._lock:
+            stage = self._stages.get(name)
+            if stage is None:
+                stage = self._stages[name] = _Stage(self._clock)
+            return stage
+
+    def snapshot(self) -> dict[str, StageStats]:
+        with self._lock:
+            stages = list(self._stages.items())
+        return {name: stage.stats for name, stage in stages}
+
+    def snapshots(
+        self, interval: float, scheduler: SchedulerBase | None = None
+    ) -> Observable[dict[str, StageStats]]:
+        """Emit a snapshot every interval seconds."""
+        return rx.interval(interval, scheduler).pipe(ops.map(lambda _: self.snapshot()))
+
+    def prometheus(self, prefix: str = "stream_stage") -> str:
+        """Dump the latest counters in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = []
+        for metric, help_text, kind, attr in _PROMETHEUS:
+            name = f"{prefix}_{metric}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(
+                f'{name}{{stage="{stage}"}} {getattr(stats, attr)}'
+                for stage, stats in snapshot.items()
+            )
+        return "\n".join(lines) + "\n"
+
+
+def instrument[T, U](
+    name: str, operator: Operator[T, U], metrics: Metrics | None
+) -> Operator[T, U]:
+    """Record items in and out of operator under the stage name.
+
+    Processing time is the time operator spends on each received item, minus the time
+    spent downstream of it in the items it emits synchronously. Returns operator as-is
+    when metrics is None or disabled.
+    """
+    if metrics is None or not metrics.enabled:
+        return operator
+    stage = metrics._stage(name)
+    clock = metrics._clock
+
+    def _operator(source: Observable[T]) -> Observable[U]:
+        def subscribe(
+            observer: ObserverBase[U], scheduler: SchedulerBase | None = None
+        ) -> DisposableBase:
+            downstream = threading.local()  # seconds spent below the stage, per thread
+
+            def subscribe_input(
+                inner: ObserverBase[T], _scheduler: SchedulerBase | None = None
+            ) -> DisposableBase:
+                def on_next(item: T) -> None:
+                    start = stage.enter()
+                    before = getattr(downstream, "seconds", 0.0)
+                    try:
+                        inner.on_next(item)
+                    finally:
+                        below = getattr(downstream, "seconds", 0.0) - before
+                        stage.leave(clock() - start - below)
+
+                return source.subscribe(
+                    on_next=on_next,
+                    on_error=inner.on_error,
+                    on_completed=inner.on_completed,
+                    scheduler=scheduler,
+                )
+
+            def on_output(item: U) -> None:
+                start = clock()
+                stage.emitted()
+                try:
+                    observer.on_next(item)
+                finally:
+                    downstream.seconds = getattr(downstream, "seconds", 0.0) + clock() - start
+
+            return operator(rx.create(subscribe_input)).subscribe(
+                on_next=on_output,
+                on_error=observer.on_error,
+                on_completed=observer.on_completed,
+                scheduler=scheduler,
+            )
+
+        return rx.create(subscribe)
+
+    return _operator
+
+
+def instrument_inner[T, U](
+    name: str, fn: Callable[[T], Observable[U]], metrics: Metrics | None
+) -> Callable[[T], Observable[U]]:
+    """Record the inner observables of fn under the stage name, for switch_map/flat_map.
+
+    Each call counts as an item and is in the queue while its observable runs. Processing
+    time runs from subscribe to completion. An observable disposed before it completes or
+    fails, e.g. superseded by switch_map, counts as dropped. Returns fn as-is when metrics
+    is None or disabled.
+    """
+    if metrics is None or not metrics.enabled:
+        return fn
+    stage = metrics._stage(name)
+    clock = metrics._clock
+
+    def wrapped(item: T) -> Observable[U]:
+        inner = fn(item)
+
+        def subscribe(
+            observer: ObserverBase[U], scheduler: SchedulerBase | None = None
+        ) -> DisposableBase:
+            lock = threading.Lock()
+            start = stage.enter()
+            finished = False
+
+            def finish(dropped: bool) -> None:
+                nonlocal finished
+                with lock:
+                    if finished:
+                        return
+                    finished = True
+                stage.leave(clock() - start, dropped)
+
+            def on_next(value: U) -> None:
+                stage.emitted()
+                observer.on_next(value)
+
+            def on_error(error: Exception) -> None:
+                finish(dropped=False)
+                observer.on_error(error)
+
+            def on_completed() -> None:
+                finish(dropped=False)
+                observer.on_completed()
+
+            subscription = inner.subscribe(
+                on_next=on_next, on_error=on_error, on_completed=on_completed, scheduler=scheduler
+            )
+            return CompositeDisposable(subscription, Disposable(lambda: finish(dropped=True)))
+
+        return rx.create(subscribe)
+
+    return wrapped
+
+
+def count_dropped(name: str, metrics: Metrics | None) -> Callable[[object], None] | None:
+    """Callback counting each item it is given as dropped by the stage name.
+
+    For items an operator discards before they reach the stage, e.g. the on_superseded
+    of exhaust_map_latest in front of an instrument_inner stage. Returns None when
+    metrics is None or disabled.
+    """
+    if metrics is None or not metrics.enabled:
+        return None
+    stage = metrics._stage(name)
+
+    def drop(_item: object) -> None:
+        stage.drop()
+
+    return drop
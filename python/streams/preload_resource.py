@@ -0,0 +1,118 @@
+"""Background resource loading for make-before-break switches."""
+
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor
+
+import reactivex as rx
+from reactivex import Observable
+from reactivex.abc import DisposableBase, ObserverBase, SchedulerBase
+from reactivex.disposable import CompositeDisposable, Disposable
+
+from streams.from_thread import from_thread
+from streams.switch_resource import Closeable
+from streams.utils import Operator
+
+
+def preload_resource[S, R: Closeable](
+    load: Callable[[S], R],
+    executor: Executor | None = None,
+    on_ready: Callable[[float], None] | None = None,
+    on_failed: Callable[[Exception], None] | None = None,
+) -> Operator[S, R]:
+    """Load a resource for each spec in the background and emit it once ready.
+
+    Pipe into switch_resource() to swap resources make-before-break: the previous resource
+    keeps serving while the next one loads, and is only replaced when load() has returned.
+    load() runs in executor (see from_thread()), so any warm-up it does is also off the
+    caller's thread.
+
+    Only the latest spec matters. A load superseded by a newer spec, or still running on
+    dispose, has its resource closed instead of emitted, and its errors are ignored.
+    on_ready is called with the seconds from a spec's arrival to its resource being emitted.
+
+    A failed load of the latest spec errors the stream only while no resource has been
+    emitted yet. After that the previous resource keeps serving, and the error is passed to
+    on_failed instead. Completes once the source has completed and no load is pending.
+    """
+
+    def _operator(source: Observable[S]) -> Observable[R]:
+        def subscribe(
+            observer: ObserverBase[R], scheduler: SchedulerBase | None = None
+        ) -> DisposableBase:
+            lock = threading.Lock()
+            latest = 0  # sequence number of the newest spec
+            loading = 0  # loads still running
+            source_done = False
+            disposed = False
+            serving = False  # a resource has been emitted
+
+            def start(spec: S) -> None:
+                nonlocal latest, loading
+                with lock:
+                    latest += 1
+                    loading += 1
+                    seq = latest
+                began = time.perf_counter()
+
+                def finish() -> tuple[bool, bool]:
+                    """Count the load as done, return (is current, should complete)."""
+                    nonlocal loading
+                    with lock:
+                        loading -= 1
+                        live = not disposed
+                        return seq == latest and live, live and source_done and loading == 0
+
+                def on_loaded(resource: R) -> None:
+                    nonlocal serving
+                    current, complete = finish()
+                    if current:
+                        serving = True
+                        if on_ready is not None:
+                            on_ready(time.perf_counter() - began)
+                        observer.on_next(resource)
+                    else:
+                        resource.close()
+                    if complete:
+                        observer.on_completed()
+
+                def on_load_error(error: Exception) -> None:
+                    current, complete = finish()
+                    if current and not serving:
+                        observer.on_error(error)  # nothing to fall back on
+                        return
+                    if current and on_failed is not None:
+                        on_failed(error)
+                    if complete:
+                        observer.on_completed()
+
+                # Never disposed: a superseded load still has to finish to be closed
+                from_thread(lambda: load(spec), executor).subscribe(
+                    on_next=on_loaded, on_error=on_load_error
+                )
+
+            def on_completed() -> None:
+                nonlocal source_done
+                with lock:
+                    source_done = True
+                    complete = loading == 0
+                if complete:
+                    observer.on_completed()
+
+            def dispose() -> None:
+                nonlocal disposed
+                with lock:
+                    disposed = True
+
+            subscription = source.subscribe(
+                on_next=start,
+                on_error=observer.on_error,
+                on_completed=on_completed,
+                scheduler=scheduler,
+            )
+            return CompositeDisposable(subscription, Disposable(dispose))
+
+        return rx.create(subscribe)
+
+    return _operator
@@ -0,0 +1,169 @@
+"""Bounded pool running observables fairly across keys."""
+
+import threading
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from typing import Literal
+
+import reactivex as rx
+from reactivex import Observable
+from reactivex.abc import DisposableBase, ObserverBase, SchedulerBase
+from reactivex.disposable import Disposable, SingleAssignmentDisposable
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    """Counters of a RoundRobinPool.
+
+    Attributes:
+        running: Jobs holding a slot now
+        queued: Jobs waiting for a slot now
+        started: Jobs started so far
+        cancelled: Jobs disposed while still waiting
+        max_queued: Highest queued seen
+    """
+
+    running: int = 0
+    queued: int = 0
+    started: int = 0
+    cancelled: int = 0
+    max_queued: int = 0
+
+
+class _Job:
+    def __init__(self, start: Callable[[], None]) -> None:
+        self.start = start
+        self.state: Literal["waiting", "running", "cancelled"] = "waiting"
+
+
+class RoundRobinPool:
+    """Run at most size observables at once, taking turns between keys.
+
+    Every key (e.g. a device) has its own FIFO of waiting jobs. When a slot frees up, the
+    next key in turn that has a waiting job gets it, so a busy key can't starve the
+    others: with k keys waiting, each gets every k-th slot.
+
+    Example:
+        pool = RoundRobinPool(2)
+        windows.pipe(
+            ops.flat_map(lambda w: pool.submit("mic-1", lambda: transcriber.transcribe(w)))
+        )
+    """
+
+    def __init__(self, size: int) -> None:
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self.size = size
+        self._lock = threading.Lock()
+        self._queues: dict[str, deque[_Job]] = {}
+        self._turns: deque[str] = deque()  # keys with waiting jobs, next in turn first
+        self._stats = PoolStats()
+
+    @property
+    def stats(self) -> PoolStats:
+        with self._lock:
+            return self._stats
+
+    def submit[T](self, key: str, job: Callable[[], Observable[T]]) -> Observable[T]:
+        """Observable that waits for a slot on subscribe, then mirrors job().
+
+        The slot is held until the job completes, fails or is disposed. Disposing while
+        waiting gives up the turn without running job.
+        """
+
+        def subscribe(
+            observer: ObserverBase[T], scheduler: SchedulerBase | None = None
+        ) -> DisposableBase:
+            inner = SingleAssignmentDisposable()
+            released = False
+
+            def release() -> None:
+                nonlocal released
+                with self._lock:
+                    if released:
+                        return
+                    released = True
+                    self._stats = replace(self._stats, running=self._stats.running - 1)
+                self._dispatch()
+
+            def on_error(error: Exception) -> None:
+                release()
+                observer.on_error(error)
+
+            def on_completed() -> None:
+                release()
+                observer.on_completed()
+
+            def start() -> None:
+                try:
+                    observable = job()
+                except Exception as e:
+                    on_error(e)
+                    return
+                inner.disposable = observable.subscribe(
+                    on_next=observer.on_next,
+                    on_error=on_error,
+                    on_completed=on_completed,
+                    scheduler=scheduler,
+                )
+
+            pending = _Job(start)
+            self._enqueue(key, pending)
+
+            def dispose() -> None:
+                with self._lock:
+                    waiting = pending.state == "waiting"
+                    if waiting:
+                        pending.state = "cancelled"
+                        self._stats = replace(
+                            self._stats,
+                            queued=self._stats.queued - 1,
+                            cancelled=self._stats.cancelled + 1,
+                        )
+                if not waiting:
+                    inner.dispose()
+                    release()
+
+            return Disposable(dispose)
+
+        return rx.create(subscribe)
+
+    def _enqueue(self, key: str, job: _Job) -> None:
+        with self._lock:
+            queue = self._queues.setdefault(key, deque())
+            if not queue:
+                self._turns.append(key)
+            queue.append(job)
+            queued = self._stats.queued + 1
+            self._stats = replace(
+                self._stats, queued=queued, max_queued=max(self._stats.max_queued, queued)
+            )
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while True:
+            with self._lock:
+                job = self._next() if self._stats.running < self.size else None
+                if job is None:
+                    return
+                job.state = "running"
+                s = self._stats
+                self._stats = replace(
+                    s, running=s.running + 1, queued=s.queued - 1, started=s.started + 1
+                )
+            job.start()
+
+    def _next(self) -> _Job | None:
+        """Pop the next live job in turn, under the lock."""
+        while self._turns:
+            key = self._turns.popleft()
+            queue = self._queues[key]
+            job = queue.popleft()
+            if queue:
+                self._turns.append(key)  # back of the line
+            else:
+                del self._queues[key]
+            if job.state == "waiting":
+                return job
+        return None
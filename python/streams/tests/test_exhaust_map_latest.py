@@ -0,0 +1,70 @@
+"""Tests for exhaust_map_latest operator."""
+
+from typing import Any
+
+import pytest
+from reactivex.testing.marbles import marbles_testing
+
+from streams.exhaust_map_latest import exhaust_map_latest
+
+type Lookup = dict[str | float, Any]
+
+
+def test_exhaust_map_latest_runs_latest_pending_item() -> None:
+    """Items arriving while busy are dropped, except the latest one."""
+    with marbles_testing() as (start, cold, _hot, exp):
+        lookup: Lookup = {"a": "a", "b": "b", "c": "c", "A": "A", "C": "C"}
+        source = cold("-a-b-c|", lookup)  # type: ignore[call-arg]
+        expected = exp("-----A----C|", lookup)  # type: ignore[call-arg]
+
+        def job(item: str) -> Any:
+            return cold("----x|", {"x": item.upper()})  # type: ignore[call-arg]
+
+        result = start(source.pipe(exhaust_map_latest(job)))
+        assert result == expected
+
+
+def test_exhaust_map_latest_runs_up_to_max_concurrent() -> None:
+    """A second slot lets the next item start without waiting."""
+    with marbles_testing() as (start, cold, _hot, exp):
+        lookup: Lookup = {"a": "a", "b": "b", "c": "c", "A": "A", "B": "B", "C": "C"}
+        source = cold("-a-b-c|", lookup)  # type: ignore[call-arg]
+        expected = exp("-----A-B--C|", lookup)  # type: ignore[call-arg]
+
+        def job(item: str) -> Any:
+            return cold("----x|", {"x": item.upper()})  # type: ignore[call-arg]
+
+        result = start(source.pipe(exhaust_map_latest(job, max_concurrent=2)))
+        assert result == expected
+
+
+def test_exhaust_map_latest_forwards_inner_error() -> None:
+    """An error from a running inner is forwarded."""
+    with marbles_testing() as (start, cold, _hot, exp):
+        lookup: Lookup = {"a": "a"}
+        source = cold("-a---|", lookup)  # type: ignore[call-arg]
+        expected = exp("---#", lookup)  # type: ignore[call-arg]
+
+        result = start(source.pipe(exhaust_map_latest(lambda _: cold("--#"))))  # type: ignore[call-arg]
+        assert result == expected
+
+
+def test_exhaust_map_latest_rejects_zero_concurrency() -> None:
+    with pytest.raises(ValueError, match="at least 1"):
+        exhaust_map_latest(lambda x: x, max_concurrent=0)
+
+
+def test_exhaust_map_latest_reports_superseded_items() -> None:
+    """Each pending item replaced by a newer one is passed to on_superseded."""
+    with marbles_testing() as (start, cold, _hot, exp):
+        lookup: Lookup = {"a": "a", "b": "b", "c": "c", "d": "d", "A": "A", "D": "D"}
+        source = cold("-a-b-c-d|", lookup)  # type: ignore[call-arg]
+        expected = exp("-------A------D|", lookup)  # type: ignore[call-arg]
+        superseded: list[str] = []
+
+        def job(item: str) -> Any:
+            return cold("------x|", {"x": item.upper()})  # type: ignore[call-arg]
+
+        result = start(source.pipe(exhaust_map_latest(job, on_superseded=superseded.append)))
+        assert result == expected
+        assert superseded == ["b", "c"]
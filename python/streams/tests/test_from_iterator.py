@@ -0,0 +1,101 @@
+"""Tests for from_iterator operator."""
+
+import threading
+from collections.abc import Iterator
+
+from streams.from_iterator import from_iterator
+
+
+class CountingIterator:
+    """Iterator over range(n) that records how far it was pulled and whether it closed."""
+
+    def __init__(self, n: int) -> None:
+        self.n = n
+        self.pulled = 0
+        self.closed = threading.Event()
+
+    def __iter__(self) -> Iterator[int]:
+        return self
+
+    def __next__(self) -> int:
+        if self.pulled >= self.n:
+            raise StopIteration
+        self.pulled += 1
+        return self.pulled - 1
+
+    def close(self) -> None:
+        self.closed.set()
+
+
+def test_from_iterator_emits_items_in_order() -> None:
+    """Emits every item, then completes and closes the iterator."""
+    source = CountingIterator(100)
+    results: list[int] = []
+    done = threading.Event()
+
+    from_iterator(lambda: source).subscribe(on_next=results.append, on_completed=done.set)
+
+    assert done.wait(timeout=1.0)
+    assert results == list(range(100))
+    assert source.closed.wait(timeout=1.0)
+
+
+def test_from_iterator_emits_error() -> None:
+    """Propagates exceptions raised by the iterator."""
+    errors: list[Exception] = []
+    done = threading.Event()
+
+    def fail() -> Iterator[int]:
+        yield 1
+        raise ValueError("boom")
+
+    def on_error(e: Exception) -> None:
+        errors.append(e)
+        done.set()
+
+    from_iterator(fail).subscribe(on_error=on_error)
+
+    assert done.wait(timeout=1.0)
+    assert "boom" in str(errors[0])
+
+
+def test_from_iterator_reads_at_most_prefetch_ahead() -> None:
+    """A blocked observer stops the reader after prefetch queued items."""
+    source = CountingIterator(1000)
+    first = threading.Event()
+    release = threading.Event()
+
+    def on_next(_: int) -> None:
+        first.set()
+        release.wait(timeout=1.0)
+
+    subscription = from_iterator(lambda: source, prefetch=2).subscribe(on_next=on_next)
+    assert first.wait(timeout=1.0)
+    threading.Event().wait(0.05)  # let the reader run ahead as far as it can
+
+    # one item in on_next, two queued, one pulled and waiting for room
+    assert source.pulled <= 4
+    subscription.dispose()
+    release.set()
+    assert source.closed.wait(timeout=1.0)
+
+
+def test_from_iterator_dispose_closes_iterator() -> None:
+    """Disposing stops emission and closes the iterator from the reader thread."""
+    source = CountingIterator(1_000_000)
+    results: list[int] = []
+    got_one = threading.Event()
+
+    def on_next(item: int) -> None:
+        results.append(item)
+        got_one.set()
+
+    subscription = from_iterator(lambda: source).subscribe(on_next=on_next)
+    assert got_one.wait(timeout=1.0)
+    subscription.dispose()
+
+    assert source.closed.wait(timeout=1.0)
+    count = len(results)
+    threading.Event().wait(0.05)
+    assert len(results) == count
+    assert source.pulled < source.n
@@ -36,3 +36,34 @@ def test_from_thread_emits_error() -> None:
     done.wait(timeout=1.0)
     assert len(errors) == 1
     assert "boom" in str(errors[0])
+
+
+def test_from_thread_dispose_calls_cancel_while_running() -> None:
+    """Disposing a running task calls cancel so fn can stop itself."""
+    started = threading.Event()
+    stop = threading.Event()
+    results: list[str] = []
+
+    def work() -> str:
+        started.set()
+        stop.wait(timeout=1.0)
+        return "stopped"
+
+    subscription = from_thread(work, cancel=stop.set).subscribe(on_next=results.append)
+    started.wait(timeout=1.0)
+    subscription.dispose()
+    assert stop.is_set()
+    assert results == []
+
+
+def test_from_thread_dispose_after_complete_skips_cancel() -> None:
+    """Cancel is not called once fn has finished."""
+    cancelled: list[bool] = []
+    done = threading.Event()
+
+    subscription = from_thread(lambda: "hello", cancel=lambda: cancelled.append(True)).subscribe(
+        on_completed=done.set,
+    )
+    done.wait(timeout=1.0)
+    subscription.dispose()
+    assert cancelled == []
@@ -0,0 +1,108 @@
+"""Tests for instrument and instrument_inner operators."""
+
+import reactivex as rx
+from reactivex import operators as ops
+from reactivex.subject import Subject
+
+from streams.instrument import (
+    Metrics,
+    StageStats,
+    count_dropped,
+    instrument,
+    instrument_inner,
+)
+
+
+class FakeClock:
+    """Clock that only moves when advanced."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def test_instrument_disabled_returns_operator_unchanged() -> None:
+    """Without an enabled registry the stage is not wrapped at all."""
+    operator = ops.map(lambda x: x)
+    fn = rx.just
+
+    assert instrument("a", operator, None) is operator
+    assert instrument("a", operator, Metrics(enabled=False)) is operator
+    assert instrument_inner("b", fn, Metrics(enabled=False)) is fn
+
+
+def test_instrument_counts_items_and_excludes_downstream_time() -> None:
+    """Processing time covers the stage itself, not the stages after it."""
+    clock = FakeClock()
+    metrics = Metrics(clock=clock)
+    results: list[list[int]] = []
+
+    rx.of(1, 2, 3, 4).pipe(
+        instrument("buffer", ops.buffer_with_count(2), metrics),
+        instrument("sink", ops.do_action(lambda _: clock.advance(10.0)), metrics),
+    ).subscribe(on_next=results.append)
+
+    stats = metrics.snapshot()
+    assert results == [[1, 2], [3, 4]]
+    assert stats["buffer"].items == 4
+    assert stats["buffer"].outputs == 2
+    assert stats["sink"].items == 2
+    assert stats["buffer"].queue_depth == 0
+    assert stats["buffer"].max_queue_depth == 1
+    assert stats["buffer"].processing_seconds == 0.0
+    assert stats["sink"].processing_seconds == 20.0
+    assert stats["sink"].inter_arrival_seconds == 10.0
+
+
+def test_instrument_inner_counts_switched_out_jobs_as_dropped() -> None:
+    """Inner observables disposed by switch_map before completing are dropped."""
+    metrics = Metrics()
+    windows: Subject[Subject[str]] = Subject()
+    first: Subject[str] = Subject()
+    second: Subject[str] = Subject()
+    results: list[str] = []
+
+    windows.pipe(ops.switch_map(instrument_inner("transcribe", lambda s: s, metrics))).subscribe(
+        on_next=results.append
+    )
+    windows.on_next(first)
+    assert metrics.snapshot()["transcribe"].queue_depth == 1
+    windows.on_next(second)
+    second.on_next("hello")
+    second.on_completed()
+
+    stats = metrics.snapshot()["transcribe"]
+    assert results == ["hello"]
+    assert (stats.items, stats.outputs, stats.dropped) == (2, 1, 1)
+    assert stats.queue_depth == 0
+
+
+def test_count_dropped_counts_items_discarded_before_a_stage() -> None:
+    """Items dropped in front of a stage add to its dropped count."""
+    metrics = Metrics()
+    drop = count_dropped("transcribe", metrics)
+
+    assert drop is not None
+    drop("window")
+    drop("window")
+
+    assert metrics.snapshot()["transcribe"] == StageStats(dropped=2)
+    assert count_dropped("transcribe", None) is None
+    assert count_dropped("transcribe", Metrics(enabled=False)) is None
+
+
+def test_metrics_prometheus_dump() -> None:
+    """Every stage appears under every metric with its current value."""
+    metrics = Metrics(clock=FakeClock())
+    rx.of(1, 2).pipe(instrument("source", lambda s: s, metrics)).subscribe()
+
+    text = metrics.prometheus()
+    assert "# TYPE stream_stage_items_total counter" in text
+    assert 'stream_stage_items_total{stage="source"} 2' in text
+    assert 'stream_stage_queue_depth{stage="source"} 0' in text
+    assert metrics.snapshot()["source"] == StageStats(items=2, outputs=2, max_queue_depth=1)
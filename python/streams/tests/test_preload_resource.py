@@ -0,0 +1,142 @@
+"""Tests for preload_resource operator."""
+
+import threading
+from unittest.mock import Mock
+
+import reactivex as rx
+from reactivex.subject import Subject
+
+from streams.preload_resource import preload_resource
+from streams.switch_resource import switch_resource
+
+
+def test_preload_resource_emits_loaded_resource() -> None:
+    """Each spec is loaded in the background, then emitted, then completes."""
+    resources: list[Mock] = []
+    latencies: list[float] = []
+    done = threading.Event()
+
+    def load(spec: str) -> Mock:
+        return Mock(name=spec)
+
+    rx.of("a").pipe(preload_resource(load, on_ready=latencies.append)).subscribe(
+        on_next=resources.append, on_completed=done.set
+    )
+
+    assert done.wait(timeout=1.0)
+    assert [r._mock_name for r in resources] == ["a"]
+    assert len(latencies) == 1
+    resources[0].close.assert_not_called()
+
+
+def test_preload_resource_keeps_old_resource_until_new_is_ready() -> None:
+    """The current inner keeps running while the next resource loads (make-before-break)."""
+    specs: Subject[str] = Subject()
+    release = threading.Event()
+    old, new = Mock(), Mock()
+    loaded = {"old": old, "new": new}
+    results: list[str] = []
+    serving, swapped = threading.Event(), threading.Event()
+
+    def load(spec: str) -> Mock:
+        if spec == "new":
+            release.wait(timeout=1.0)
+        return loaded[spec]
+
+    def inner(resource: Mock) -> rx.Observable[str]:
+        (swapped if resource is new else serving).set()
+        return rx.never()
+
+    specs.pipe(preload_resource(load), switch_resource(inner)).subscribe(on_next=results.append)
+    specs.on_next("old")
+    assert serving.wait(timeout=1.0)
+    specs.on_next("new")
+
+    assert not swapped.wait(timeout=0.1)
+    old.close.assert_not_called()  # still serving while "new" loads
+    release.set()
+    assert swapped.wait(timeout=1.0)
+    old.close.assert_called_once()
+
+
+def test_preload_resource_closes_superseded_load() -> None:
+    """A load overtaken by a newer spec is closed instead of emitted."""
+    specs: Subject[str] = Subject()
+    release = threading.Event()
+    slow, fast = Mock(), Mock()
+    emitted: list[Mock] = []
+    done = threading.Event()
+
+    def load(spec: str) -> Mock:
+        if spec == "slow":
+            release.wait(timeout=1.0)
+            return slow
+        return fast
+
+    specs.pipe(preload_resource(load)).subscribe(on_next=emitted.append, on_completed=done.set)
+    specs.on_next("slow")
+    specs.on_next("fast")
+    specs.on_completed()
+    release.set()
+
+    assert done.wait(timeout=1.0)
+    assert emitted == [fast]
+    slow.close.assert_called_once()
+    fast.close.assert_not_called()
+
+
+def test_preload_resource_failed_load_keeps_old_resource_serving() -> None:
+    """A load failing while a resource serves is reported, and the old resource stays."""
+    specs: Subject[str] = Subject()
+    old = Mock()
+    failures: list[Exception] = []
+    errors: list[Exception] = []
+    served: list[Mock] = []
+    serving, failed = threading.Event(), threading.Event()
+
+    def load(spec: str) -> Mock:
+        if spec == "broken":
+            raise RuntimeError("load failed")
+        return old
+
+    def inner(resource: Mock) -> rx.Observable[str]:
+        served.append(resource)
+        serving.set()
+        return rx.never()
+
+    def on_failed(error: Exception) -> None:
+        failures.append(error)
+        failed.set()
+
+    specs.pipe(preload_resource(load, on_failed=on_failed), switch_resource(inner)).subscribe(
+        on_error=errors.append
+    )
+    specs.on_next("old")
+    assert serving.wait(timeout=1.0)
+    specs.on_next("broken")
+
+    assert failed.wait(timeout=1.0)
+    assert [str(e) for e in failures] == ["load failed"]
+    assert errors == []
+    assert served == [old]
+    old.close.assert_not_called()
+
+
+def test_preload_resource_first_load_error_errors() -> None:
+    """With no resource to fall back on, a failed load errors the stream."""
+    errors: list[Exception] = []
+    failures: list[Exception] = []
+    done = threading.Event()
+
+    def load(spec: str) -> Mock:
+        raise RuntimeError("load failed")
+
+    def on_error(error: Exception) -> None:
+        errors.append(error)
+        done.set()
+
+    rx.of("a").pipe(preload_resource(load, on_failed=failures.append)).subscribe(on_error=on_error)
+
+    assert done.wait(timeout=1.0)
+    assert [str(e) for e in errors] == ["load failed"]
+    assert failures == []
@@ -0,0 +1,68 @@
+"""Tests for RoundRobinPool."""
+
+import pytest
+import reactivex as rx
+from reactivex.subject import Subject
+
+from streams.round_robin_pool import RoundRobinPool
+
+
+def test_round_robin_pool_takes_turns_between_keys() -> None:
+    """With one slot, waiting keys alternate, whatever order jobs were submitted in."""
+    pool = RoundRobinPool(1)
+    started: list[str] = []
+    jobs: dict[str, Subject[str]] = {}
+
+    def submit(key: str, name: str) -> None:
+        def job() -> rx.Observable[str]:
+            started.append(name)
+            jobs[name] = Subject()
+            return jobs[name]
+
+        pool.submit(key, job).subscribe()
+
+    for name in ("a1", "a2", "a3"):
+        submit("a", name)
+    for name in ("b1", "b2"):
+        submit("b", name)
+    assert pool.stats.running == 1
+    assert pool.stats.queued == 4
+
+    for name in ("a1", "a2", "b1", "a3", "b2"):
+        jobs[name].on_completed()
+
+    assert started == ["a1", "a2", "b1", "a3", "b2"]
+    assert pool.stats.started == 5
+    assert pool.stats.running == pool.stats.queued == 0
+
+
+def test_round_robin_pool_forwards_job_output() -> None:
+    results: list[str] = []
+    RoundRobinPool(2).submit("a", lambda: rx.of("x", "y")).subscribe(results.append)
+    assert results == ["x", "y"]
+
+
+def test_round_robin_pool_cancels_waiting_and_frees_disposed() -> None:
+    """Disposing a waiting job skips it, disposing a running one frees its slot."""
+    pool = RoundRobinPool(1)
+    started: list[str] = []
+
+    def job(name: str) -> rx.Observable[str]:
+        started.append(name)
+        return rx.never()
+
+    running = pool.submit("a", lambda: job("first")).subscribe()
+    waiting = pool.submit("b", lambda: job("skipped")).subscribe()
+    pool.submit("c", lambda: job("next")).subscribe()
+
+    waiting.dispose()
+    running.dispose()
+
+    assert started == ["first", "next"]
+    assert pool.stats.cancelled == 1
+    assert pool.stats.running == 1
+
+
+def test_round_robin_pool_rejects_empty_pool() -> None:
+    with pytest.raises(ValueError, match="at least 1"):
+        RoundRobinPool(0)
@@ -1,7 +1,10 @@
 """Integration test for Whisper transcription pipeline."""
 
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import cast
 
 import numpy as np
 import pytest
@@ -9,6 +12,7 @@ import reactivex as rx
 import reactivex.operators as ops
 from reactivex import Observable
 
+from audio._stt import CancelToken, Whisper
 from audio.rechunk import rechunk
 from audio.whisper import CHUNK_SIZE, SAMPLE_RATE, Transcriber
 from audio.window import window_chunks
@@ -101,3 +105,81 @@ def test_whisper_transcribes_with_rechunk() -> None:
     full_text = " ".join(results).lower()
     print(f"Transcribed: {full_text}")
     assert len(full_text) > 0, "Transcription was empty"
+
+
+class TimedWhisper:
+    """Records wall-clock (start, end) of every native transcribe call."""
+
+    def __init__(self, whisper: Whisper) -> None:
+        self._whisper = whisper
+        self.intervals: list[tuple[float, float]] = []
+
+    def transcribe(
+        self,
+        samples: np.ndarray,
+        cancel: CancelToken | None = None,
+        audio_len: int | None = None,
+    ) -> str:
+        start = time.perf_counter()
+        text = self._whisper.transcribe(samples, cancel, audio_len)
+        self.intervals.append((start, time.perf_counter()))
+        return text
+
+    def close(self) -> None:
+        self._whisper.close()
+
+
+@pytest.mark.slow
+def test_whisper_transcribe_releases_gil() -> None:
+    """Two transcriptions on separate threads overlap, and Python keeps running meanwhile."""
+    model_path = str(get_model_path("base.en"))
+    audio = load_raw_audio(FIXTURES / "rick_5s_16k.raw")
+    whisper = TimedWhisper(Whisper(model_path))
+    transcriber = Transcriber(cast("Whisper", whisper), ThreadPoolExecutor(max_workers=2))
+
+    ticks: list[float] = []
+    stop = threading.Event()
+
+    def tick() -> None:
+        while not stop.is_set():
+            ticks.append(time.perf_counter())
+            time.sleep(0.001)
+
+    ticker = threading.Thread(target=tick)
+    ticker.start()
+
+    results: list[str] = []
+    done = threading.Event()
+
+    def on_completed() -> None:
+        if len(results) == 2:
+            done.set()
+
+    for _ in range(2):
+        transcriber.transcribe(audio).subscribe(on_next=results.append, on_completed=on_completed)
+    done.wait(timeout=30.0)
+    stop.set()
+    ticker.join()
+    transcriber.close()
+
+    assert len(results) == 2
+    (start_a, end_a), (start_b, end_b) = whisper.intervals
+    overlap = (max(start_a, start_b), min(end_a, end_b))
+    assert overlap[0] < overlap[1], "native decodes did not overlap"
+    # With the GIL held, the ticker would be frozen while both decodes run
+    assert any(overlap[0] < t < overlap[1] for t in ticks)
+
+
+@pytest.mark.slow
+def test_whisper_transcribe_long_orders_segments() -> None:
+    """Audio longer than 30s is split, decoded in parallel and returned in order."""
+    model_path = str(get_model_path("base.en"))
+    audio = np.tile(load_raw_audio(FIXTURES / "rick_5s_16k.raw"), 14)  # ~70s
+
+    with Whisper(model_path, max_concurrency=3) as whisper:
+        segments = whisper.transcribe_long(audio, n_workers=3)
+
+    assert segments, "Transcription was empty"
+    starts = [t0 for t0, _t1, _text in segments]
+    assert starts == sorted(starts)
+    assert starts[-1] * SAMPLE_RATE // 100 > 480_000, "no segments after the first window"